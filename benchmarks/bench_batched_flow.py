@@ -0,0 +1,104 @@
+"""Benchmark batched (per-cluster) optical flow against the per-ROI path.
+
+Runs `FrameModel.process_frame` over a video with the same ROI layout twice:
+once computing Farneback flow separately for every ROI, and once computing it
+once per cluster of nearby ROIs (`FrameModel.batched_flow`). Reports the mean
+frame time of each path and how closely the per-ROI mean flows agree.
+
+Usage:
+------
+```
+poetry run python benchmarks/bench_batched_flow.py [video] [--frames N]
+```
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import cv2
+import numpy as np
+
+from froth_monitor.fm_model import FrameModel
+
+# ROI layouts as (x, y, width, height) for a 640 x 480 frame
+LAYOUTS = {
+    "lip row (touching)": [(40 + 95 * i, 200, 95, 80) for i in range(6)],
+    "lip row (overlapping)": [(40 + 70 * i, 200, 100, 80) for i in range(6)],
+    "scattered": [
+        (20, 20, 90, 90),
+        (500, 30, 90, 90),
+        (30, 360, 90, 90),
+        (520, 370, 90, 90),
+    ],
+}
+
+
+def read_frames(path: str, count: int) -> list[np.ndarray]:
+    """Decode up to `count` frames from the video into memory."""
+    capture = cv2.VideoCapture(path)
+    frames: list[np.ndarray] = []
+    while len(frames) < count:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def run(
+    frames: list[np.ndarray], rois: list, batched: bool, cluster_gap: int | None
+) -> tuple[float, np.ndarray]:
+    """Process the frames and return the mean frame time and all ROI deltas."""
+    model = FrameModel()
+    model.batched_flow = batched
+    model.cluster_gap = cluster_gap
+    for roi in rois:
+        model.add_roi(roi)
+
+    times = []
+    deltas = []
+    # FrameModel prints its frame time; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in frames:
+            start = time.perf_counter()
+            model.process_frame(frame)
+            times.append(time.perf_counter() - start)
+            deltas.append([roi.delta_pixels for roi in model.roi_list])
+
+    # The per-ROI path has no estimate on the first frame; compare from frame 2
+    return float(np.mean(times[1:])), np.array(deltas[1:], dtype=float)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", nargs="?", default="data/test.avi")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    print(
+        f"{args.video}: {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}"
+    )
+    print(
+        f"{'layout':<24}{'mode':<18}{'ms/frame':>10}{'speed-up':>10}{'mean |diff| px':>16}{'max |diff| px':>15}"
+    )
+
+    for name, rois in LAYOUTS.items():
+        base_time, base_deltas = run(frames, rois, batched=False, cluster_gap=None)
+        print(
+            f"{name:<24}{'per-ROI':<18}{base_time * 1000:>10.2f}{1.0:>10.2f}{'-':>16}{'-':>15}"
+        )
+        for label, gap in (("clusters (16 px)", 16), ("union box", None)):
+            batch_time, batch_deltas = run(frames, rois, batched=True, cluster_gap=gap)
+            diff = np.abs(batch_deltas - base_deltas)
+            print(
+                f"{'':<24}{label:<18}{batch_time * 1000:>10.2f}"
+                f"{base_time / batch_time:>10.2f}{np.nanmean(diff):>16.3f}{np.nanmax(diff):>15.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark Farneback warm start and flow buffer reuse.
+
+Runs Farneback on the ROI crops of a video with the default settings, with
+a reused output buffer, and with warm start (OPTFLOW_USE_INITIAL_FLOW) at
+reduced pyramid levels and iterations. Reports the per-ROI latency and the
+deviation of the mean flow from the cold-start default.
+
+Usage:
+------
+```
+poetry run python benchmarks/bench_farneback_warm_start.py [video] [--frames N]
+```
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bench_flow_algorithms import ROIS, read_gray_frames
+from froth_monitor.image_analysis import VideoAnalysis
+
+DEFAULT_PARAMS = dict(
+    pyr_scale=0.5, levels=3, winsize=15, iterations=3, poly_n=7, poly_sigma=1.5
+)
+
+# (label, warm start, reuse buffer, parameter overrides)
+CONFIGS = [
+    ("cold, new array", False, False, {}),
+    ("cold, reused buffer", False, True, {}),
+    ("warm, levels 3 it 3", True, True, {}),
+    ("warm, levels 2 it 2", True, True, dict(levels=2, iterations=2)),
+    ("warm, levels 1 it 2", True, True, dict(levels=1, iterations=2)),
+    ("warm, levels 1 it 1", True, True, dict(levels=1, iterations=1)),
+]
+
+
+def run(
+    frames: list[np.ndarray], warm_start: bool, reuse: bool, overrides: dict
+) -> tuple[float, np.ndarray]:
+    """Analyse every ROI of every frame and return the mean latency and deltas."""
+    analyses = []
+    for _ in ROIS:
+        analysis = VideoAnalysis(0, 0)
+        analysis.set_algorithm(
+            "Farneback",
+            {
+                **DEFAULT_PARAMS,
+                **overrides,
+                "warm_start": warm_start,
+                "reuse_flow_buffer": reuse,
+            },
+        )
+        analyses.append(analysis)
+
+    times = []
+    deltas = []
+    for frame in frames:
+        row = []
+        for (x, y, w, h), analysis in zip(ROIS, analyses):
+            start = time.perf_counter()
+            row.append(analysis.analyze(frame[y : y + h, x : x + w]))
+            times.append(time.perf_counter() - start)
+        deltas.append(row)
+
+    return float(np.mean(times[len(ROIS) :])), np.array(deltas[1:], dtype=float)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", nargs="?", default="data/test.avi")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = read_gray_frames(args.video, args.frames)
+    print(f"{args.video}: {len(frames)} frames, {len(ROIS)} ROIs")
+    print(
+        f"{'configuration':<24}{'ms/ROI':>10}{'speed-up':>10}{'mean |diff| px':>16}{'max |diff| px':>15}"
+    )
+
+    base_time, base = run(frames, False, False, {})
+    for label, warm_start, reuse, overrides in CONFIGS:
+        run_time, deltas = run(frames, warm_start, reuse, overrides)
+        diff = np.abs(deltas - base)
+        print(
+            f"{label:<24}{run_time * 1000:>10.3f}{base_time / run_time:>10.2f}"
+            f"{diff.mean():>16.3f}{diff.max():>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark the VideoAnalysis algorithms against Farneback.
+
+Runs `VideoAnalysis.analyze` with Farneback, the plain and grid-sampled
+Lucas-Kanade, each DIS preset and phase correlation on the same ROI crops
+of a video. Reports the mean per-ROI
+latency of every algorithm and how well its mean (dx, dy) agrees with
+Farneback. A second table measures accuracy against a known subpixel
+translation applied to the same crops.
+
+Usage:
+------
+```
+poetry run python benchmarks/bench_flow_algorithms.py [video] [--frames N]
+```
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from froth_monitor.estimators.dis import DIS_PRESETS
+from froth_monitor.image_analysis import VideoAnalysis, to_gray
+
+# ROI rectangles as (x, y, width, height) for a 640 x 480 frame
+ROIS = [
+    (40, 200, 120, 100),
+    (260, 200, 120, 100),
+    (480, 200, 120, 100),
+    (200, 40, 240, 120),
+]
+
+# (label, algorithm, params)
+ALGORITHMS = (
+    [("Farneback", "Farneback", None)]
+    + [("Lucas-Kanade", "Lucas-Kanade", None)]
+    + [
+        (f"LK Grid {detector}", "Lucas-Kanade Grid", dict(detector=detector))
+        for detector in ("Grid", "FAST")
+    ]
+    + [(f"DIS {preset}", "DIS", dict(preset=preset)) for preset in DIS_PRESETS]
+    + [("PhaseCorrelation", "PhaseCorrelation", dict(window="Hanning"))]
+)
+
+# Known translation used for the accuracy table, in pixels
+SHIFT = (1.7, -2.3)
+
+
+def read_gray_frames(path: str, count: int) -> list[np.ndarray]:
+    """Decode up to `count` frames from the video and convert them to gray."""
+    capture = cv2.VideoCapture(path)
+    frames: list[np.ndarray] = []
+    while len(frames) < count:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(to_gray(frame))
+    capture.release()
+    return frames
+
+
+def make_analysis(algorithm: str, params: dict | None) -> VideoAnalysis:
+    """Create a VideoAnalysis configured for one algorithm."""
+    analysis = VideoAnalysis(0, 0)
+    analysis.set_algorithm(algorithm, params)
+    return analysis
+
+
+def run(
+    frames: list[np.ndarray], algorithm: str, params: dict | None
+) -> tuple[float, np.ndarray]:
+    """Analyse every ROI of every frame and return the mean latency and deltas."""
+    analyses = [make_analysis(algorithm, params) for _ in ROIS]
+
+    times = []
+    deltas = []
+    for frame in frames:
+        row = []
+        for (x, y, w, h), analysis in zip(ROIS, analyses):
+            start = time.perf_counter()
+            row.append(analysis.analyze(frame[y : y + h, x : x + w]))
+            times.append(time.perf_counter() - start)
+        deltas.append(row)
+
+    # The first frame only primes the cache; measure from the second one
+    return float(np.mean(times[len(ROIS) :])), np.array(deltas[1:], dtype=float)
+
+
+def shift_error(frames: list[np.ndarray], algorithm: str, params: dict | None) -> float:
+    """Return the mean error against a known translation of each ROI crop."""
+    matrix = np.array([[1, 0, SHIFT[0]], [0, 1, SHIFT[1]]], dtype=np.float32)
+    errors = []
+    for frame in frames[:: max(1, len(frames) // 20)]:
+        moved = cv2.warpAffine(
+            frame, matrix, (frame.shape[1], frame.shape[0]), flags=cv2.INTER_CUBIC
+        )
+        for x, y, w, h in ROIS:
+            analysis = make_analysis(algorithm, params)
+            analysis.analyze(frame[y : y + h, x : x + w])
+            dx, dy = analysis.analyze(moved[y : y + h, x : x + w])
+            errors.append(np.hypot(dx - SHIFT[0], dy - SHIFT[1]))
+    return float(np.mean(errors))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", nargs="?", default="data/test.avi")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = read_gray_frames(args.video, args.frames)
+    print(f"{args.video}: {len(frames)} frames, {len(ROIS)} ROIs")
+    print(
+        f"{'algorithm':<18}{'ms/ROI':>10}{'speed-up':>10}{'mean |diff| px':>16}"
+        f"{'corr dx':>10}{'corr dy':>10}{'shift err px':>14}"
+    )
+
+    base_time, base = run(frames, "Farneback", None)
+    for label, algorithm, params in ALGORITHMS:
+        run_time, deltas = run(frames, algorithm, params)
+        diff = np.mean(np.abs(deltas - base))
+        corr = [
+            np.corrcoef(base[..., k].ravel(), deltas[..., k].ravel())[0, 1]
+            for k in (0, 1)
+        ]
+        print(
+            f"{label:<18}{run_time * 1000:>10.3f}{base_time / run_time:>10.2f}{diff:>16.3f}"
+            f"{corr[0]:>10.3f}{corr[1]:>10.3f}{shift_error(frames, algorithm, params):>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark concurrent per-ROI analysis on the FrameModel thread pool.
+
+Runs `FrameModel.process_frame` on the frames of a video for a growing
+number of ROIs and pool workers, and reports the mean frame latency and the
+speed-up over one worker. OpenCV's thread count follows the pool size via
+`opencv_thread_count`, as in the application. The single-ROI latency is the
+lower bound a fully parallel run can approach.
+
+Usage:
+------
+```
+poetry run python benchmarks/bench_roi_thread_pool.py [video] [--frames N]
+```
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import cv2
+import numpy as np
+
+from froth_monitor.fm_model import FrameModel
+
+ROI_COUNTS = [1, 2, 4, 8]
+WORKER_COUNTS = [1, 2, 4, 8]
+
+# ROI size as (width, height); ROIs are tiled across the frame
+ROI_SIZE = (120, 100)
+
+
+def read_frames(path: str, count: int) -> list[np.ndarray]:
+    """Decode up to `count` BGR frames from the video."""
+    capture = cv2.VideoCapture(path)
+    frames: list[np.ndarray] = []
+    while len(frames) < count:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def tile_rois(
+    count: int, frame_shape: tuple[int, ...]
+) -> list[tuple[int, int, int, int]]:
+    """Return `count` non-overlapping ROIs laid out row by row."""
+    width, height = ROI_SIZE
+    columns = frame_shape[1] // width
+    return [
+        ((i % columns) * width, (i // columns) * height, width, height)
+        for i in range(count)
+    ]
+
+
+def run(frames: list[np.ndarray], roi_count: int, workers: int) -> float:
+    """Return the mean latency of `process_frame` in seconds."""
+    model = FrameModel()
+    model.set_roi_workers(workers)
+    for rect in tile_rois(roi_count, frames[0].shape):
+        model.add_roi(rect)
+
+    times = []
+    # process_frame prints its own timing; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in frames:
+            start = time.perf_counter()
+            model.process_frame(frame)
+            times.append(time.perf_counter() - start)
+
+    model.close()
+    return float(np.mean(times[1:]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", nargs="?", default="data/test.avi")
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    print(f"{args.video}: {len(frames)} frames, {os.cpu_count()} cores")
+    print(f"{'ROIs':>5}{'workers':>9}{'ms/frame':>10}{'speed-up':>10}{'vs 1 ROI':>10}")
+
+    single = run(frames, 1, 1)
+    for roi_count in ROI_COUNTS:
+        serial = run(frames, roi_count, 1)
+        for workers in WORKER_COUNTS:
+            if workers > roi_count:
+                continue
+            latency = serial if workers == 1 else run(frames, roi_count, workers)
+            print(
+                f"{roi_count:>5}{workers:>9}{latency * 1000:>10.2f}"
+                f"{serial / latency:>10.2f}{latency / single:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,23 @@
-"""The entry point for the Bubble Analyser program."""
+"""The entry point for the Bubble Analyser program.
 
-from froth_monitor.event_handler import EventHandler
-from froth_monitor.gui_window import MainGUIWindow
+Without arguments the GUI is started. `python -m froth_monitor analyze ...` runs
+the headless offline analysis instead; see `froth_monitor.offline`.
+"""
 
-# from .gui import MainGUI
+import multiprocessing
 import sys
-from PySide6.QtWidgets import QApplication, QStyleFactory
-from PySide6.QtGui import QFont
 
 
-if __name__ == "__main__":
+def run_gui() -> int:
+    """Start the GUI application and return its exit code."""
+    # Imported here so the headless commands do not load the Qt widgets
+    from froth_monitor.event_handler import EventHandler
+    from froth_monitor.gui_window import MainGUIWindow
+
+    # from .gui import MainGUI
+    from PySide6.QtWidgets import QApplication, QStyleFactory
+    from PySide6.QtGui import QFont
+
     app = QApplication(sys.argv)
     font = QFont("SF Pro", 11)  # You can adjust size as needed
     app.setFont(font)
@@ -29,5 +37,22 @@ if __name__ == "__main__":
     window = MainGUIWindow()
     print("starting event handler")
     handler = EventHandler(window)
+    app.aboutToQuit.connect(handler.close_sources)
     window.show()
-    sys.exit(app.exec())
+    return app.exec()
+
+
+def main() -> None:
+    """Dispatch to the offline analysis or start the GUI."""
+    # Camera processes and offline workers start this module again when frozen
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        from froth_monitor import offline
+
+        sys.exit(offline.main(sys.argv[2:]))
+
+    sys.exit(run_gui())
+
+
+if __name__ == "__main__":
+    main()
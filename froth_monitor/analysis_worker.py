@@ -0,0 +1,213 @@
+"""Analysis Worker Module for Froth Tracker Application.
+
+This module defines the `AnalysisWorker` class, which runs `FrameModel.process_frame`
+in a separate thread so the optical flow never blocks the Qt GUI thread. The GUI
+submits frames and receives lightweight per-frame results through a signal; it only
+renders them.
+
+Example Usage:
+--------------
+```python
+worker = AnalysisWorker(frame_model)
+worker.results_ready.connect(handle_results)
+worker.start()
+
+# For every captured frame (GUI thread)
+worker.submit(frame, timestamp)
+```
+"""
+
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from froth_monitor.fm_model import FrameModel
+from froth_monitor.frame_pool import FramePool
+from froth_monitor.frame_queue import FrameQueue
+
+
+class AnalysisWorker(QObject):
+    """
+    A thread-based worker that analyses frames with a `FrameModel`.
+
+    Frames are handed over through a latest-wins `FrameQueue`: if a new frame
+    is submitted while the worker is still busy, it replaces the pending one,
+    so the analysis always works on the most recent frame and never builds up
+    a backlog. Replaced frames are counted in `frames_dropped`.
+
+    With a `frame_pool`, the worker holds a reference to each submitted frame
+    until it has been analysed or replaced, so its buffer is not refilled
+    while the analysis reads it.
+
+    Attributes:
+        results_ready (Signal): Emitted with a result dict after each analysed frame.
+        frame_model (FrameModel): The model that analyses the frames.
+        running (bool): Flag indicating if the worker thread is running.
+        frame_queue (FrameQueue): The hand-over queue from `submit` to the thread.
+        frame_pool (FramePool | None): The pool the submitted frames come from.
+        frames_failed (int): Number of frames whose analysis raised an error.
+        last_error (str | None): The error of the last frame, or None if it
+            was analysed.
+    """
+
+    # Signal to emit when a frame has been analysed
+    results_ready = Signal(object)
+
+    def __init__(self, frame_model: FrameModel, frame_pool: FramePool | None = None):
+        """
+        Initialize the AnalysisWorker.
+
+        Args:
+            frame_model: The FrameModel used to analyse the frames.
+            frame_pool: The pool the submitted frames come from, if any.
+        """
+        super().__init__()
+        self.frame_model = frame_model
+        self.running = False
+        self.thread_: threading.Thread | None = None
+        self.frames_failed = 0
+        self.last_error: str | None = None
+
+        # Latest-wins hand-over from the GUI thread to the worker thread
+        self.frame_pool = frame_pool
+        self.frame_queue = FrameQueue(maxsize=1, policy="latest", on_drop=self._release)
+
+    @property
+    def frames_submitted(self) -> int:
+        """Number of frames handed to `submit`."""
+        return self.frame_queue.captured
+
+    @property
+    def frames_dropped(self) -> int:
+        """Number of frames replaced before they were analysed."""
+        return self.frame_queue.dropped
+
+    def start(self) -> None:
+        """
+        Start the worker thread if it is not already running.
+        """
+        if self.running:
+            return
+
+        self.frame_queue.reopen()
+        self.running = True
+        self.thread_ = threading.Thread(target=self._run_loop)
+        self.thread_.daemon = True  # Thread will exit when main program exits
+        self.thread_.start()
+
+    def stop(self) -> None:
+        """
+        Stop the worker thread and discard any pending frame.
+        """
+        self.running = False
+        self.frame_queue.close()
+
+        if self.thread_ and self.thread_.is_alive():
+            self.thread_.join(timeout=1.0)  # Wait up to 1 second
+        self.thread_ = None
+
+    def submit(self, frame: np.ndarray, timestamp: float | None = None) -> None:
+        """
+        Hand a frame to the worker, replacing any frame still waiting.
+
+        Args:
+            frame: The source frame to analyse.
+            timestamp: The capture time of the frame in seconds, or None to
+                use the time it is analysed.
+        """
+        if self.frame_pool is not None:
+            self.frame_pool.retain(frame)
+        if not self.frame_queue.put(frame, timestamp):
+            self._release(frame)
+
+    def _release(self, frame: np.ndarray) -> None:
+        """
+        Give back the reference `submit` took to a frame.
+        """
+        if self.frame_pool is not None:
+            self.frame_pool.release(frame)
+
+    def clear(self) -> None:
+        """
+        Discard the pending frame and reset the counters.
+        """
+        self.frame_queue.clear(reset_counts=True)
+        self.frames_failed = 0
+        self.last_error = None
+
+    def take_pending(self) -> np.ndarray | None:
+        """
+        Remove and return the pending frame, or None if there is none.
+        The caller takes over the worker's pool reference to the frame.
+
+        Returns:
+            The pending frame, or None.
+        """
+        item = self.frame_queue.get_nowait()
+        return item[0] if item is not None else None
+
+    def process(
+        self, frame: np.ndarray, timestamp: float | None = None
+    ) -> dict[str, Any]:
+        """
+        Analyse one frame and emit the result.
+
+        The frame model's lock is held while the frame is processed, so GUI
+        actions such as adding an ROI never interleave with an analysis step.
+
+        Args:
+            frame: The source frame to analyse.
+            timestamp: The capture time of the frame in seconds.
+
+        Returns:
+            dict: The frame number, the timestamp, the analysed ROIs and their
+            deltas, the plot and table update flags and the processing time in
+            seconds.
+        """
+        start = time.perf_counter()
+        with self.frame_model.lock:
+            frame_number, roi_list, update_velo_plot, update_average_velo = (
+                self.frame_model.process_frame(frame, timestamp)
+            )
+            deltas = [roi.delta_pixels for roi in roi_list]
+            timestamp = self.frame_model.last_processed_time
+
+        result = {
+            "frame_number": frame_number,
+            "timestamp": timestamp,
+            "roi_list": roi_list,
+            "deltas": deltas,
+            "update_velo_plot": update_velo_plot,
+            "update_average_velo": update_average_velo,
+            "process_time": time.perf_counter() - start,
+        }
+        self.results_ready.emit(result)
+        return result
+
+    def _run_loop(self) -> None:
+        """
+        Main loop that runs in the worker thread.
+        Waits for a pending frame, analyses it and emits the result.
+        """
+        while self.running:
+            item = self.frame_queue.get()
+            if item is None:
+                break  # The queue was closed by `stop`
+            frame, timestamp = item
+
+            try:
+                self.process(frame, timestamp)
+                self.last_error = None
+            except Exception as error:
+                # Keep the worker alive; one bad frame should not stop the analysis.
+                # Every failure is counted, but a repeated error is printed once
+                self.frames_failed += 1
+                message = f"{type(error).__name__}: {error}"
+                if message != self.last_error:
+                    print("Error while analysing a frame:", message)
+                self.last_error = message
+            finally:
+                self._release(frame)
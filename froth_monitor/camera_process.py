@@ -0,0 +1,849 @@
+"""Camera Process Module for Froth Tracker Application.
+
+This module runs the capture and analysis of a video source in a process of its own.
+In one process, the Python around the OpenCV calls of every source (cropping, the
+flow bookkeeping) shares one interpreter lock, which limits how many sources can be
+analysed at once. With a process per source, each source has its own interpreter.
+
+The camera process writes every frame it captures into a `SharedFrameRing` and sends
+the per-ROI displacements of every analysed frame back over a queue. The GUI process
+maps only the newest frame of the ring for display, so frames are never pickled.
+
+The GUI keeps a mirror of the source's `FrameModel`: ROI, analysis scale, algorithm,
+batched flow and ROI worker changes are forwarded to the camera process as commands, and the
+displacements it sends back are replayed through `ROI.record_delta`, as in
+`offline.analyze_video_segmented`. The calibration, velocities, statistics and export
+data therefore stay in the GUI process, and `ProcessPipeline` has the interface of
+`CameraPipeline`, so the GUI handles both kinds of sources alike.
+
+Messages from the camera process are (kind, payload) tuples:
+- ("started", info): the source opened, with its frame size, FPS and time origin.
+- ("failed", None): the source could not be opened.
+- ("ring", (name, shape, dtype)): the frames are now written to a new ring.
+- ("result", result): the displacements of an analysed frame, by ROI key.
+- ("status", status): the capture state, frame counters and errors.
+- ("stopped", None): the process is about to exit.
+
+Commands to it are (name, args) tuples, see `CameraProcess.apply`.
+
+Example Usage:
+--------------
+```python
+pipeline = ProcessPipeline("Camera 0")
+pipeline.view = event_handler  # Shows the frames and results of this pipeline
+pipeline.start(0)
+...
+pipeline.close()
+```
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing.context import SpawnProcess
+from typing import Any, Callable
+
+import numpy as np
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+from froth_monitor.analysis_worker import AnalysisWorker
+from froth_monitor.camera_thread import MIN_SPEED, CameraThread
+from froth_monitor.fm_model import ROI, FrameModel
+from froth_monitor.frame_pool import FramePool
+from froth_monitor.frame_ring import DEFAULT_SLOTS, SharedFrameRing
+from froth_monitor.pipeline import CameraPipeline
+
+# Milliseconds between two looks of the GUI at the ring and the result queue
+POLL_INTERVAL = 10
+
+# Seconds between two status messages of an idle camera process
+STATUS_INTERVAL = 0.25
+
+# Seconds to wait for a camera process to start and open its source
+START_TIMEOUT = 30.0
+
+
+class CameraProcess:
+    """
+    The capture and analysis of one source, inside the camera process.
+
+    Attributes:
+        messages: The queue the messages to the GUI process are put on.
+        slots (int): The number of slots of the frame ring.
+        camera_thread (CameraThread): Captures the frames of the source.
+        frame_model (FrameModel): Analyses the ROIs; it keeps a single history
+            row, as the GUI keeps the histories.
+        analysis_worker (AnalysisWorker): Analyses the frames in its own thread.
+        ring (SharedFrameRing | None): The ring the frames are written to.
+        roi_keys (dict[ROI, int]): The key the GUI gave each ROI.
+        commands_failed (int): Number of commands that raised an error.
+        command_error (str | None): The error of the last failed command.
+    """
+
+    def __init__(self, messages: Any, slots: int = DEFAULT_SLOTS):
+        """
+        Create an idle source and start its analysis worker.
+
+        Args:
+            messages: The queue the messages to the GUI process are put on.
+            slots: The number of slots of the frame ring.
+        """
+        self.messages = messages
+        self.slots = slots
+        self.ring: SharedFrameRing | None = None
+        self.roi_keys: dict[ROI, int] = {}
+        self.commands_failed = 0
+        self.command_error: str | None = None
+
+        self.camera_thread = CameraThread()
+        self.frame_model = FrameModel()
+        self.frame_model.verbose = False
+        self.frame_model.set_history_limit(1)
+        self.analysis_worker = AnalysisWorker(
+            self.frame_model, self.camera_thread.frame_pool
+        )
+
+        # No event loop runs in this process, so the slots run in the
+        # threads that emit the signals
+        self.camera_thread.frame_available.connect(
+            self.handle_frame, Qt.ConnectionType.DirectConnection
+        )
+        self.analysis_worker.results_ready.connect(
+            self.handle_results, Qt.ConnectionType.DirectConnection
+        )
+        self.analysis_worker.start()
+
+    def handle_frame(self, frame: np.ndarray, timestamp: float) -> None:
+        """
+        Publish a captured frame in the ring and hand it to the analysis worker.
+
+        Args:
+            frame: The new frame.
+            timestamp: The capture time of the frame in seconds.
+        """
+        try:
+            ring = self.ring
+            if ring is None or ring.shape != frame.shape or ring.dtype != frame.dtype:
+                ring = self._create_ring(frame)
+            ring.write(frame, timestamp)
+            self.analysis_worker.submit(frame, timestamp)
+        finally:
+            self.camera_thread.release_buffer(frame)
+
+    def _create_ring(self, frame: np.ndarray) -> SharedFrameRing:
+        """
+        Replace the ring with one for frames like `frame`, announce it and return it.
+        """
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = SharedFrameRing.create(frame.shape, frame.dtype, self.slots)
+        self.messages.put(("ring", (self.ring.name, frame.shape, frame.dtype.str)))
+        return self.ring
+
+    def handle_results(self, result: dict) -> None:
+        """
+        Send the displacements of an analysed frame to the GUI process.
+
+        Args:
+            result: The result dict from `AnalysisWorker.process`.
+        """
+        deltas = [
+            (self.roi_keys[roi], delta)
+            for roi, delta in zip(result["roi_list"], result["deltas"])
+            if roi in self.roi_keys
+        ]
+        self.messages.put(
+            (
+                "result",
+                {
+                    "frame_number": result["frame_number"],
+                    "timestamp": result["timestamp"],
+                    "deltas": deltas,
+                    "process_time": result["process_time"],
+                },
+            )
+        )
+
+    def apply(self, command: str, args: Any = None) -> None:
+        """
+        Carry out a command from the GUI process.
+
+        Args:
+            command: "start" (args: the camera index or video path),
+                "stop_capture", "pause", "resume", "step", "speed" (the
+                playback speed), "add_roi" (the ROI key and rectangle),
+                "delete_last_roi", "analysis_scale" (the scale), "algorithm"
+                (the algorithm and its parameters), "batched_flow" (whether
+                it is enabled and the cluster gap), "roi_workers" (the number
+                of ROI threads) or "reset".
+            args: The arguments of the command.
+
+        Raises:
+            ValueError: If the command is unknown.
+        """
+        camera_thread = self.camera_thread
+        frame_model = self.frame_model
+        if command == "start":
+            if camera_thread.start_capture(args):
+                width, height = camera_thread.get_frame_dimensions()
+                info = {
+                    "width": width,
+                    "height": height,
+                    "fps": camera_thread.get_fps(),
+                    "is_video_file": camera_thread.is_video_file,
+                    "time_origin": camera_thread.time_origin,
+                }
+                self.messages.put(("started", info))
+            else:
+                self.messages.put(("failed", None))
+        elif command == "stop_capture":
+            camera_thread.stop_capture()
+        elif command == "pause":
+            camera_thread.pause()
+        elif command == "resume":
+            camera_thread.resume()
+        elif command == "step":
+            camera_thread.step()
+        elif command == "speed":
+            camera_thread.set_speed(args)
+        elif command == "add_roi":
+            key, rectangle = args
+            with frame_model.lock:
+                frame_model.add_roi(rectangle)
+                self.roi_keys[frame_model.roi_list[-1]] = key
+        elif command == "delete_last_roi":
+            with frame_model.lock:
+                if frame_model.roi_list:
+                    self.roi_keys.pop(frame_model.roi_list[-1], None)
+                    frame_model.delete_last_roi()
+        elif command == "analysis_scale":
+            frame_model.set_analysis_scale(args)
+        elif command == "algorithm":
+            algorithm, params = args
+            with frame_model.lock:
+                frame_model.current_algorithm = algorithm
+                frame_model.algorithm_params[algorithm] = params
+        elif command == "batched_flow":
+            frame_model.set_batched_flow(*args)
+        elif command == "roi_workers":
+            frame_model.set_roi_workers(args)
+        elif command == "reset":
+            self.analysis_worker.clear()
+            with frame_model.lock:
+                frame_model.reset()
+                self.roi_keys = {}
+        else:
+            raise ValueError(f"Unknown camera process command: {command}")
+
+    def status(self) -> dict[str, Any]:
+        """
+        Return the capture state, the frame counters and the errors.
+        """
+        return {
+            "running": self.camera_thread.is_running(),
+            "counts": self.camera_thread.frame_counts(),
+            "frames_submitted": self.analysis_worker.frames_submitted,
+            "frames_dropped": self.analysis_worker.frames_dropped,
+            "frames_failed": self.analysis_worker.frames_failed,
+            "analysis_error": self.analysis_worker.last_error,
+            "commands_failed": self.commands_failed,
+            "command_error": self.command_error,
+        }
+
+    def run(self, commands: Any) -> None:
+        """
+        Carry out commands until "shutdown" or until the GUI process is gone,
+        reporting the status in between.
+
+        Args:
+            commands: The queue the GUI process puts its commands on.
+        """
+        parent = multiprocessing.parent_process()
+        while True:
+            try:
+                command, args = commands.get(timeout=STATUS_INTERVAL)
+            except queue.Empty:
+                command, args = None, None
+            if command == "shutdown" or (parent is not None and not parent.is_alive()):
+                break
+
+            if command is not None:
+                try:
+                    self.apply(command, args)
+                except Exception as error:
+                    # Keep the source running; one bad command should not stop it.
+                    # The error reaches the GUI process with the status
+                    self.commands_failed += 1
+                    self.command_error = f"{command}: {type(error).__name__}: {error}"
+            self.messages.put(("status", self.status()))
+
+    def close(self) -> None:
+        """
+        Stop the capture and analysis and free the ring.
+        """
+        self.camera_thread.stop_capture()
+        self.analysis_worker.stop()
+        self.frame_model.close()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.messages.put(("stopped", None))
+
+
+def run_camera_process(
+    commands: Any, messages: Any, slots: int = DEFAULT_SLOTS
+) -> None:
+    """
+    The entry point of a camera process.
+
+    Args:
+        commands: The queue of commands from the GUI process.
+        messages: The queue of messages to the GUI process.
+        slots: The number of slots of the frame ring.
+    """
+    camera_process = CameraProcess(messages, slots)
+    try:
+        camera_process.run(commands)
+    finally:
+        camera_process.close()
+
+
+class RemoteCamera(QObject):
+    """
+    The capture of a source in a camera process, in place of a `CameraThread`.
+
+    Commands are sent to the process at once; the state it reports back is
+    read by `read_messages`.
+
+    Attributes:
+        frame_available (Signal): Emitted with each new frame shown from the ring.
+        slots (int): The number of slots of the frame ring.
+        process (multiprocessing.Process | None): The camera process.
+        ring (SharedFrameRing | None): The ring the process writes the frames to.
+        running (bool): Whether the source is being captured.
+        paused (bool): Whether the capture is paused.
+        speed (float): The playback speed of video files.
+        is_video_file (bool): Whether the source is a video file.
+        time_origin (float | None): The Unix time of timestamp 0 for cameras.
+        frame_pool (FramePool): Always empty; the frames from the ring are not
+            pooled, so `retain` and `release` ignore them.
+        last_status (dict): The last status reported by the process.
+        frames_torn (int): Number of frames overwritten while they were shown.
+    """
+
+    frame_available = Signal(np.ndarray, float)
+
+    def __init__(self, slots: int = DEFAULT_SLOTS):
+        """
+        Initialize the camera without starting its process.
+
+        Args:
+            slots: The number of slots of the frame ring.
+        """
+        super().__init__()
+        self.slots = slots
+        self.context = multiprocessing.get_context("spawn")
+        self.process: SpawnProcess | None = None
+        self.commands: Any = None
+        self.messages: Any = None
+        self.ring: SharedFrameRing | None = None
+        self.shown_seq = 0
+        self.pending: list[dict] = []
+
+        self.running = False
+        self.paused = False
+        self.speed = 1.0
+        self.is_video_file = False
+        self.time_origin: float | None = None
+        self.frame_size = (0, 0)
+        self.fps = 0.0
+        self.frame_pool = FramePool()
+        self.last_status: dict[str, Any] = {}
+        self.frames_torn = 0
+
+    def ensure_process(self) -> bool:
+        """
+        Start the camera process unless it is running.
+
+        Returns:
+            bool: True if a new process was started.
+        """
+        if self.process is not None and self.process.is_alive():
+            return False
+        self.commands = self.context.Queue()
+        self.messages = self.context.Queue()
+        self.process = self.context.Process(
+            target=run_camera_process,
+            args=(self.commands, self.messages, self.slots),
+            daemon=True,
+        )
+        self.process.start()
+        return True
+
+    def send(self, command: str, args: Any = None) -> None:
+        """
+        Send a command to the camera process, if it is running.
+        """
+        if self.process is not None and self.process.is_alive():
+            self.commands.put((command, args))
+
+    def start_capture(self, video_source: int | str) -> bool:
+        """
+        Start capturing from a camera or video file in the camera process.
+
+        Args:
+            video_source: Either a camera index (int) or a video file path (str).
+
+        Returns:
+            bool: True if capture started successfully, False otherwise.
+        """
+        self.ensure_process()
+        self.send("start", video_source)
+
+        process = self.process
+        deadline = time.monotonic() + START_TIMEOUT
+        while (
+            process is not None and process.is_alive() and time.monotonic() < deadline
+        ):
+            try:
+                kind, payload = self.messages.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if kind == "failed":
+                return False
+            if kind == "started":
+                self.frame_size = (payload["width"], payload["height"])
+                self.fps = payload["fps"]
+                self.is_video_file = payload["is_video_file"]
+                self.time_origin = payload["time_origin"]
+                self.running = True
+                self.paused = False
+                self.last_status = {}
+                self.frames_torn = 0
+                return True
+            self._handle_message(kind, payload)
+        return False
+
+    def read_messages(self) -> list[dict]:
+        """
+        Read every waiting message of the camera process.
+
+        Returns:
+            list[dict]: The results of the analysed frames, in order.
+        """
+        while self.messages is not None:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_message(kind, payload)
+        results, self.pending = self.pending, []
+        return results
+
+    def _handle_message(self, kind: str, payload: Any) -> None:
+        """
+        Apply a message of the camera process; results are kept for `read_messages`.
+        """
+        if kind == "result":
+            self.pending.append(payload)
+        elif kind == "status":
+            self.last_status = payload
+            self.running = payload["running"]
+        elif kind == "ring":
+            self._attach_ring(*payload)
+
+    def _attach_ring(self, name: str, shape: tuple[int, ...], dtype: str) -> None:
+        """
+        Map the ring the camera process now writes its frames to.
+        """
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.shown_seq = 0
+        try:
+            self.ring = SharedFrameRing.attach(name, shape, dtype, self.slots)
+        except FileNotFoundError:
+            pass  # Already replaced by the next ring, which is announced next
+
+    def next_frame(self) -> tuple[int, float, np.ndarray] | None:
+        """
+        Return the newest frame of the ring if it was not returned before.
+
+        Returns:
+            tuple | None: The (sequence number, timestamp, frame), where the
+            frame is a view of the shared memory, or None.
+        """
+        if self.ring is None:
+            return None
+        item = self.ring.latest()
+        if item is None or item[0] == self.shown_seq:
+            return None
+        self.shown_seq = item[0]
+        return item
+
+    def check_frame(self, seq: int) -> bool:
+        """
+        Return whether a frame from `next_frame` was still intact after use,
+        counting it in `frames_torn` if not.
+        """
+        if self.ring is not None and self.ring.is_current(seq):
+            return True
+        self.frames_torn += 1
+        return False
+
+    def stop_capture(self) -> None:
+        """
+        Stop capturing; the camera process keeps running.
+        """
+        self.send("stop_capture")
+        self.running = False
+        self.paused = False
+
+    def shutdown(self) -> None:
+        """
+        Stop the camera process and unmap the ring.
+        """
+        if self.process is not None:
+            self.send("shutdown")
+            # Read the queue while waiting, or the process would wait for it
+            deadline = time.monotonic() + 2.0
+            while self.process.is_alive() and time.monotonic() < deadline:
+                try:
+                    kind, _ = self.messages.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if kind == "stopped":
+                    break
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.running = False
+        self.paused = False
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def is_paused(self) -> bool:
+        return self.paused
+
+    def pause(self) -> None:
+        self.paused = True
+        self.send("pause")
+
+    def resume(self) -> None:
+        self.paused = False
+        self.send("resume")
+
+    def step(self) -> bool:
+        """
+        Ask the camera process for a single frame while paused.
+
+        Returns:
+            bool: True if a step was requested, False if the capture is not paused.
+        """
+        if not (self.running and self.paused):
+            return False
+        self.send("step")
+        return True
+
+    def set_speed(self, speed: float) -> None:
+        """
+        Set the playback speed of video files, see `CameraThread.set_speed`.
+
+        Raises:
+            ValueError: If the speed is below `MIN_SPEED`.
+        """
+        if not speed >= MIN_SPEED:
+            raise ValueError(f"speed must be at least {MIN_SPEED}")
+        self.speed = speed
+        self.send("speed", speed)
+
+    def get_frame_dimensions(self) -> tuple[int, int]:
+        return self.frame_size
+
+    def get_fps(self) -> float:
+        return self.fps
+
+    def release_buffer(self, frame=None) -> None:
+        """
+        Do nothing; the camera process does not wait for the GUI.
+        """
+
+    def frame_counts(self) -> dict[str, int]:
+        """
+        Get the frame counts last reported by the camera process.
+
+        Returns:
+            dict[str, int]: See `CameraThread.frame_counts`.
+        """
+        return dict(
+            self.last_status.get(
+                "counts", {"captured": 0, "delivered": 0, "dropped": 0, "skipped": 0}
+            )
+        )
+
+    def reset(self) -> None:
+        """
+        Stop capturing; the camera process keeps running.
+        """
+        self.stop_capture()
+
+
+class RemoteAnalysisWorker:
+    """
+    The analysis counters of a camera process, in place of an `AnalysisWorker`.
+
+    Attributes:
+        frames_submitted (int): Number of frames handed to the analysis.
+        frames_dropped (int): Number of frames replaced before they were analysed.
+        frames_failed (int): Number of frames whose analysis raised an error.
+        last_error (str | None): The error of the last analysed frame, if any.
+    """
+
+    def __init__(self) -> None:
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_failed = 0
+        self.last_error: str | None = None
+
+    def submit(self, frame: np.ndarray, timestamp: float | None = None) -> None:
+        """
+        Do nothing; the camera process analyses its own frames.
+        """
+
+    def update(self, status: dict[str, Any]) -> None:
+        """
+        Take the counters from a status of the camera process.
+        """
+        self.frames_submitted = status.get("frames_submitted", self.frames_submitted)
+        self.frames_dropped = status.get("frames_dropped", self.frames_dropped)
+        self.frames_failed = status.get("frames_failed", self.frames_failed)
+        self.last_error = status.get("analysis_error", self.last_error)
+
+    def clear(self) -> None:
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_failed = 0
+        self.last_error = None
+
+    def stop(self) -> None:
+        pass
+
+
+class RemoteFrameModel(FrameModel):
+    """
+    The GUI's mirror of the frame model of a camera process.
+
+    Changes to the ROIs, the analysis scale, the algorithm, the batched flow
+    and the ROI workers are applied here
+    and sent to the camera process. The displacements it sends back are
+    recorded through `ROI.record_delta`, so the calibration, histories and
+    statistics are kept here as for a `FrameModel`.
+
+    Attributes:
+        send (Callable): Sends a command, and its arguments if any, to the camera process.
+        roi_keys (dict[ROI, int]): The key of each ROI in the camera process.
+    """
+
+    def __init__(self, send: Callable[..., None]):
+        """
+        Initialize an empty model.
+
+        Args:
+            send: Sends a command, and its arguments if any, to the camera process.
+        """
+        super().__init__()
+        self.send = send
+        self.verbose = False
+        self.roi_keys: dict[ROI, int] = {}
+        self.next_key = 0
+
+    def _send_roi(self, roi: ROI) -> None:
+        """
+        Give an ROI a new key and add it in the camera process.
+        """
+        self.roi_keys[roi] = self.next_key
+        self.send("add_roi", (self.next_key, tuple(roi.coordinate[:4])))
+        self.next_key += 1
+
+    def add_roi(self, roi):
+        with self.lock:
+            super().add_roi(roi)
+            self._send_roi(self.roi_list[-1])
+
+    def delete_last_roi(self):
+        with self.lock:
+            if not self.roi_list:
+                return False
+            self.roi_keys.pop(self.roi_list[-1], None)
+            super().delete_last_roi()
+            self.send("delete_last_roi")
+            return True
+
+    def set_analysis_scale(self, analysis_scale: float) -> None:
+        super().set_analysis_scale(analysis_scale)
+        self.send("analysis_scale", analysis_scale)
+
+    def confirm_algorithm_n_params(self, algorithm: str, params: dict) -> None:
+        super().confirm_algorithm_n_params(algorithm, params)
+        self.send("algorithm", (algorithm, dict(params)))
+
+    def set_batched_flow(self, enabled: bool, cluster_gap: int | None = 16) -> None:
+        super().set_batched_flow(enabled, cluster_gap)
+        self.send("batched_flow", (enabled, cluster_gap))
+
+    def set_roi_workers(self, workers: int, opencv_threads: int | None = None) -> None:
+        """
+        Set the ROI threads of the camera process; this process does not analyse.
+        """
+        self.roi_workers = max(1, int(workers))
+        self.send("roi_workers", self.roi_workers)
+
+    def reset(self):
+        with self.lock:
+            super().reset()
+            self.roi_keys = {}
+            self.send("reset")
+
+    def sync(self) -> None:
+        """
+        Send the whole model to a newly started camera process.
+        """
+        with self.lock:
+            self.send("reset")
+            self.send("analysis_scale", self.analysis_scale)
+            self.send(
+                "algorithm", (self.current_algorithm, dict(self.get_current_params()))
+            )
+            self.send("batched_flow", (self.batched_flow, self.cluster_gap))
+            self.send("roi_workers", self.roi_workers)
+            self.roi_keys = {}
+            for roi in self.roi_list:
+                self._send_roi(roi)
+
+    def apply_result(self, result: dict) -> dict[str, Any]:
+        """
+        Record the displacements of a frame analysed by the camera process.
+
+        Args:
+            result: A "result" message of the camera process.
+
+        Returns:
+            dict: The result in the form of `AnalysisWorker.process`.
+        """
+        with self.lock:
+            timestamp = result["timestamp"]
+            self.frame_count = result["frame_number"]
+            self.last_processed_time = timestamp
+            self.frame_history.append(self.frame_count, timestamp)
+
+            rois = {key: roi for roi, key in self.roi_keys.items()}
+            update_velo_plot = update_average_velo = False
+            for key, delta in result["deltas"]:
+                roi = rois.get(key)
+                if roi is not None:
+                    new_velo, new_average = roi.record_delta(delta, timestamp)
+                    update_velo_plot |= new_velo
+                    update_average_velo |= new_average
+            roi_list = self.roi_list
+
+        return {
+            "frame_number": self.frame_count,
+            "timestamp": timestamp,
+            "roi_list": roi_list,
+            "deltas": [roi.delta_pixels for roi in roi_list],
+            "update_velo_plot": update_velo_plot,
+            "update_average_velo": update_average_velo,
+            "process_time": result["process_time"],
+        }
+
+
+class ProcessPipeline(CameraPipeline):
+    """
+    A video source captured and analysed in a camera process of its own.
+
+    A timer reads the results of the camera process and shows the newest frame
+    of its ring; the frame goes through `handle_frame` as for a `CameraPipeline`.
+
+    The `camera_thread`, `frame_model` and `analysis_worker` of the pipeline
+    are the proxies `remote`, `mirror` and `remote_analysis`; the calls that
+    only the proxies have go through these.
+
+    Attributes:
+        slots (int): The number of slots of the frame ring.
+        remote (RemoteCamera): The capture in the camera process.
+        mirror (RemoteFrameModel): The GUI's mirror of its frame model.
+        remote_analysis (RemoteAnalysisWorker): Its analysis counters.
+        timer (QTimer): Reads the camera process every `POLL_INTERVAL` ms.
+    """
+
+    def __init__(self, name: str, slots: int = DEFAULT_SLOTS):
+        """
+        Initialize an idle pipeline; its camera process starts with the source.
+
+        Args:
+            name: The name the GUI shows for the source.
+            slots: The number of slots of the frame ring.
+        """
+        self.slots = slots
+        super().__init__(name)
+
+    def _init_workers(self) -> None:
+        """
+        Create the proxies of the camera process and the timer that reads it.
+        """
+        self.remote = RemoteCamera(self.slots)
+        self.mirror = RemoteFrameModel(self.remote.send)
+        self.remote_analysis = RemoteAnalysisWorker()
+        self.camera_thread = self.remote
+        self.frame_model = self.mirror
+        self.analysis_worker = self.remote_analysis
+
+        self.remote.frame_available.connect(self.handle_frame)
+        self.timer = QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self, source: int | str) -> bool:
+        """
+        Start the camera process if needed, and capture from a camera or video file.
+
+        Args:
+            source: A camera index or a video file path.
+
+        Returns:
+            bool: True if the source was opened.
+        """
+        if self.remote.ensure_process():
+            self.mirror.sync()
+        if not super().start(source):
+            return False
+        self.timer.start()
+        return True
+
+    def poll(self) -> None:
+        """
+        Record the results of the camera process and show its newest frame.
+        """
+        for result in self.remote.read_messages():
+            self.handle_results(self.mirror.apply_result(result))
+        self.remote_analysis.update(self.remote.last_status)
+
+        item = self.remote.next_frame()
+        if item is not None:
+            seq, timestamp, frame = item
+            self.remote.frame_available.emit(frame, timestamp)
+            # A torn frame was only shown; the analysis has its own copy
+            self.remote.check_frame(seq)
+
+    def close(self) -> None:
+        """
+        Stop the timer and the camera process for good.
+        """
+        self.timer.stop()
+        self.view = None
+        self.remote.shutdown()
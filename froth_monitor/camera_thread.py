@@ -3,14 +3,52 @@
 This module defines the `CameraThread` class, which runs in a separate thread to capture
 frames from a camera or video source and emits signals when new frames are available.
 This enables an event-driven approach to frame processing instead of timer-based polling.
+Every frame is emitted with its capture timestamp in seconds: the media time for video
+files and the monotonic clock for cameras.
+
+Captured frames go through a bounded `FrameQueue` to a dispatcher thread, which emits
+them only while the consumer keeps up, so a slow GUI never builds up a backlog of
+frames in the Qt event queue. Frames that are not delivered are counted.
+
+Frames are read into the reusable buffers of a `FramePool` instead of a new array per
+frame. Consumers hold a delivered frame until they call `release_buffer`.
+
+Every frame is grabbed to keep the stream current, but only the frames that will be
+delivered are decoded (`retrieve`), chosen by the decode policy: when the consumer is
+ready for one ("consumer-ready"), at most `target_fps` per second ("target-rate"),
+or all of them ("all"). Frames grabbed but not decoded are counted as dropped.
+
+Video files are paced against the monotonic clock: each frame is due at the time its
+media timestamp says, divided by the playback `speed`, so playback does not drift.
+Waits for the next deadline and while paused sleep on a condition, which `pause`,
+`resume`, `step` and `stop_capture` wake at once. A frame whose deadline a pause
+cuts short is held back until the next `step` or `resume`.
 """
 
 import cv2
+import math
 import threading
 import time
 import numpy as np
 from PySide6.QtCore import QObject, Signal
 
+from froth_monitor.frame_pool import FramePool
+from froth_monitor.frame_queue import FrameQueue
+
+# Which grabbed frames are decoded
+DECODE_POLICIES = ("all", "consumer-ready", "target-rate")
+
+# The slowest playback speed of video files
+MIN_SPEED = 0.25
+
+# The Unix time of monotonic-clock time 0, shared by every camera so that the
+# timestamps of different cameras line up
+CLOCK_ORIGIN = time.time() - time.perf_counter_ns() / 1e9
+
+# How far playback may fall behind its deadlines, in seconds, before the
+# schedule is reset instead of rushing through frames to catch up
+MAX_LAG = 1.0
+
 
 class CameraThread(QObject):
     """
@@ -21,14 +59,31 @@ class CameraThread(QObject):
     event-driven approach to frame processing instead of timer-based polling.
 
     Attributes:
-        frame_available (Signal): Signal emitted when a new frame is available.
+        frame_available (Signal): Signal emitted with a new frame and its timestamp.
         video_capture: OpenCV VideoCapture object for video input.
         running (bool): Flag indicating if the capture thread is running.
         thread: Thread object for the capture loop.
+        frame_queue (FrameQueue): The bounded hand-off from the capture loop to
+            the dispatcher, with its policy and frame counters.
+        max_buffer (int): Number of emitted frames the consumer may hold before
+            it calls `release_buffer`.
+        frame_pool (FramePool): The buffers frames are read into; holders of a
+            frame beyond its slot must `retain` and `release` it.
+        decode_policy (str): Which grabbed frames are decoded, one of `DECODE_POLICIES`.
+        target_fps (float | None): The most frames decoded per second of frame
+            time under the "target-rate" policy.
+        frames_skipped (int): Number of frames grabbed but never decoded.
+        speed (float): The playback speed of video files; `math.inf` reads
+            them as fast as possible.
+        state_condition (threading.Condition): Guards the pause state and wakes
+            the capture loop when it changes.
+        frames_read (int): Number of frames read since the capture started.
+        time_origin (float | None): The Unix time of timestamp 0 for cameras,
+            or None for video files, whose timestamps are media time.
     """
 
-    # Signal to emit when a new frame is available
-    frame_available = Signal(np.ndarray)
+    # Signal to emit when a new frame is available, with its timestamp in seconds
+    frame_available = Signal(np.ndarray, float)
 
     def __init__(self):
         """
@@ -44,11 +99,32 @@ class CameraThread(QObject):
         self.video_source = (
             None  # Store the video source for pause/resume functionality
         )
+        # Frames wait in the queue until fewer than max_buffer emitted frames
+        # are still held by the consumer
+        self.frame_pool = FramePool()
+        self.frame_queue = FrameQueue(
+            maxsize=1, policy="latest", on_drop=self.frame_pool.release
+        )
+        self.dispatch_thread = None
         self.buffer_size = 0
-        self.max_buffer = 5  # Allow 5 frames in buffer
-        self.buffer_lock = threading.Lock()
+        self.max_buffer = 1
+        self.buffer_condition = threading.Condition()
+        self.release_timeout = 1.0  # Stop waiting for a release that never comes
+
+        self.decode_policy = "consumer-ready"
+        self.target_fps: float | None = None
+        self.next_decode_time: float | None = None
+        self.frames_skipped = 0
+
+        # Pacing of video files: (monotonic clock, media time) of the frame the
+        # schedule started from, or None to start from the next frame
+        self.speed = 1.0
+        self.pace_origin: tuple[float, float] | None = None
+        self.state_condition = threading.Condition()
+        self.step_requests = 0
 
-        self.if_release = True
+        self.frames_read = 0
+        self.time_origin: float | None = None
 
     def start_capture(self, video_source):
         """
@@ -67,15 +143,21 @@ class CameraThread(QObject):
         if self.running:
             self.stop_capture()
 
+        self.frames_read = 0
+
         # Initialize video capture
         if isinstance(video_source, int):
             # For camera, use DirectShow backend on Windows
             self.video_capture = cv2.VideoCapture(video_source, cv2.CAP_DSHOW)
             self.is_video_file = False
+            # Camera frames are stamped with the monotonic clock; keep its offset
+            # to Unix time so exports can show the time of day
+            self.time_origin = CLOCK_ORIGIN
         else:
             # For video files
             self.video_capture = cv2.VideoCapture(video_source)
             self.is_video_file = True
+            self.time_origin = None
 
             # Calculate frame delay for video files based on FPS
             fps = self.get_fps()
@@ -89,24 +171,49 @@ class CameraThread(QObject):
         if not self.video_capture.isOpened():
             return False
 
+        # Start with an empty queue and fresh counters for the new source
+        self.frame_queue.clear(reset_counts=True)
+        self.frame_queue.reopen()
+        self.frame_pool.clear()
+        self.frames_skipped = 0
+        self.next_decode_time = None
+        self.pace_origin = None
+        self.step_requests = 0
+        with self.buffer_condition:
+            self.buffer_size = 0
+
         # Start capture thread
         self.running = True
         self.thread_ = threading.Thread(target=self._capture_loop)
         self.thread_.daemon = True  # Thread will exit when main program exits
         self.thread_.start()
 
+        # Start dispatch thread
+        self.dispatch_thread = threading.Thread(target=self._dispatch_loop)
+        self.dispatch_thread.daemon = True
+        self.dispatch_thread.start()
+
         return True
 
     def stop_capture(self):
         """
         Stop capturing frames and release resources.
         """
-        self.running = False
-        self.paused = False
-
-        # Wait for thread to finish if it exists
-        if self.thread_ and self.thread_.is_alive():
-            self.thread_.join(timeout=1.0)  # Wait up to 1 second
+        with self.state_condition:
+            self.running = False
+            self.paused = False
+            self.step_requests = 0
+            self.state_condition.notify_all()
+
+        # Wake a capture loop blocked on a full queue and the dispatcher
+        self.frame_queue.close()
+        with self.buffer_condition:
+            self.buffer_condition.notify_all()
+
+        # Wait for the threads to finish if they exist
+        for thread in (self.thread_, self.dispatch_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=1.0)  # Wait up to 1 second
 
         # Release video capture resources
         if self.video_capture:
@@ -117,50 +224,197 @@ class CameraThread(QObject):
         """
         Main capture loop that runs in a separate thread.
         Continuously captures frames and emits signals when new frames are available.
-        For video files, paces the frame emission according to the video's native frame rate.
-        Supports pausing without releasing the video source.
+        For video files, paces the frame emission according to the video's timestamps
+        and the playback speed. Cameras are read as their frames arrive.
+        Supports pausing without releasing the video source; a frame whose wait
+        is ended by a pause is held back and delivered by the next step or resume.
         """
-        last_frame_time = time.time()
-
+        held = None  # The timestamp of a grabbed frame held back by a pause
         while self.running and self.video_capture and self.video_capture.isOpened():
-            # If paused, just sleep a bit and continue the loop without capturing
-            if self.paused:
-                time.sleep(0.1)  # Sleep to avoid busy waiting
+            # While paused, sleep until resumed, stepped or stopped
+            with self.state_condition:
+                self.state_condition.wait_for(
+                    lambda: not self.paused or self.step_requests or not self.running
+                )
+                if not self.running:
+                    break
+                stepping = self.paused
+                if stepping:
+                    self.step_requests -= 1
+
+            if held is not None:
+                timestamp, held = held, None
+            else:
+                # Advance the stream; the frame is only decoded if it will be delivered
+                if not self.video_capture.grab():
+                    # End of video or error reading frame
+                    self.running = False
+                    break
+
+                timestamp = self._frame_timestamp()
+
+            # For video files, wait until the frame is due; a camera's grab
+            # already waits for its next frame
+            if self.is_video_file and not stepping:
+                self._wait_for_deadline(timestamp)
+                with self.state_condition:
+                    if self.paused:
+                        held = timestamp
+                        continue
+
+            if stepping or self._should_decode(timestamp):
+                frame = self._retrieve()
+                # Hand the frame to the dispatcher; the queue policy decides what
+                # happens if the consumer has not caught up
+                if frame is not None and not self.frame_queue.put(frame, timestamp):
+                    self.frame_pool.release(frame)
+            else:
+                self.frames_skipped += 1
+
+    def _wait_for_deadline(self, timestamp: float) -> None:
+        """
+        Wait until a video frame is due at the playback speed.
+
+        Deadlines are measured from the frame the schedule started from, not
+        from the previous frame, so the time spent reading and handing over
+        frames does not add up. The wait ends early on pause, stop or a change
+        of speed.
+
+        Args:
+            timestamp (float): The media time of the frame in seconds.
+        """
+        if math.isinf(self.speed):
+            return
+
+        now = time.perf_counter()
+        if self.pace_origin is None:
+            self.pace_origin = (now, timestamp)
+            return
+
+        clock_origin, media_origin = self.pace_origin
+        delay = clock_origin + (timestamp - media_origin) / self.speed - now
+        if delay < -MAX_LAG or timestamp < media_origin:
+            # Too far behind (or the video went back); start a new schedule
+            self.pace_origin = (now, timestamp)
+        elif delay > 0:
+            with self.state_condition:
+                self.state_condition.wait_for(
+                    lambda: self.paused or not self.running or self.pace_origin is None,
+                    delay,
+                )
+
+    def _should_decode(self, timestamp: float) -> bool:
+        """
+        Decide whether the frame just grabbed will be delivered, and so decoded.
+
+        Args:
+            timestamp (float): The timestamp of the grabbed frame.
+
+        Returns:
+            bool: True to decode the frame, False to skip it.
+        """
+        if self.decode_policy == "all" or self.frame_queue.policy == "block":
+            # A blocking queue promises every frame
+            return True
+
+        if self.decode_policy == "target-rate":
+            if not self.target_fps:
+                return True
+            interval = 1.0 / self.target_fps
+            if self.next_decode_time is not None and timestamp < self.next_decode_time:
+                return False
+            # Keep to the rate on average, but do not catch up after a gap
+            if (
+                self.next_decode_time is None
+                or timestamp - self.next_decode_time > interval
+            ):
+                self.next_decode_time = timestamp
+            self.next_decode_time += interval
+            return True
+
+        # "consumer-ready": decode only if the frame would not be dropped from
+        # the queue before the consumer takes it
+        if len(self.frame_queue) >= self.frame_queue.maxsize:
+            return False
+        if self.frame_queue.policy == "latest":
+            # The waiting frame would be replaced anyway; wait for the consumer,
+            # so the frame it gets next is the most recent one
+            with self.buffer_condition:
+                return self.buffer_size < self.max_buffer
+        return True
+
+    def _retrieve(self) -> np.ndarray | None:
+        """
+        Decode the frame just grabbed into a free pool buffer.
+
+        Without a free buffer, retrieve allocates a new frame, which joins the
+        pool if there is room.
+
+        Returns:
+            np.ndarray | None: The frame, or None if it could not be decoded.
+        """
+        buffer = self.frame_pool.acquire()
+        if buffer is not None:
+            ret, frame = self.video_capture.retrieve(image=buffer)
+        else:
+            ret, frame = self.video_capture.retrieve()
+
+        if not ret:
+            self.frame_pool.release(buffer)
+            return None
+        self.frame_pool.replace(buffer, frame)
+        return frame
+
+    def _dispatch_loop(self):
+        """
+        Emit queued frames, at most `max_buffer` of them unreleased at a time.
+
+        Runs in its own thread so the capture loop never waits for the consumer.
+        A frame is only taken from the queue once the consumer is ready for it,
+        so under the "latest" policy the consumer always gets the newest frame.
+        """
+        while not self.frame_queue.closed:
+            with self.buffer_condition:
+                ready = self.buffer_condition.wait_for(
+                    lambda: self.buffer_size < self.max_buffer
+                    or self.frame_queue.closed,
+                    self.release_timeout,
+                )
+                if not ready:
+                    # A release was lost (e.g. no consumer is connected); go on
+                    self.buffer_size = 0
+
+            item = self.frame_queue.get(timeout=0.1)
+            if item is None:
+                if not self.running:
+                    break  # The capture ended and every queued frame was sent
                 continue
 
-            # Capture frame
-            ret, frame = self.video_capture.read()
-
-            if not ret:
-                # End of video or error reading frame
-                self.running = False
-                break
-
-            # Skip frame if buffer is full
-            # with self.buffer_lock:
-            #     if self.buffer_size >= self.max_buffer:
-            #         continue
-            #     self.buffer_size += 1
-
-            current_time = time.time()
-
-            # For video files, control the frame rate
-            if self.is_video_file:
-                # Calculate time elapsed since last frame
-                elapsed = current_time - last_frame_time
-                # If we need to wait to maintain the correct frame rate
-                if elapsed < self.frame_delay:
-                    time.sleep(self.frame_delay - elapsed)
-            else:
-                # For live camera, just a small sleep to prevent maxing out CPU
-                time.sleep(0.001)
+            with self.buffer_condition:
+                self.buffer_size += 1
+            frame, timestamp = item
+            self.frame_available.emit(frame, timestamp)
+
+    def _frame_timestamp(self) -> float:
+        """
+        Return the capture timestamp of the frame just read, in seconds.
 
-            # Emit signal with the captured frame
-            if self.if_release:
-                self.frame_available.emit(frame)
+        Video files use the frame's media time, so velocities do not depend on
+        how fast the frames are played or analysed. Cameras use the monotonic
+        clock at the moment the frame was returned.
 
-            # Update last frame time
-            last_frame_time = time.time()
+        Returns:
+            float: The timestamp of the frame.
+        """
+        self.frames_read += 1
+        if not self.is_video_file:
+            return time.perf_counter_ns() / 1e9
+
+        timestamp = self.video_capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if timestamp <= 0 and self.frames_read > 1:
+            # Some backends do not report the position; count frames instead
+            timestamp = (self.frames_read - 1) * self.frame_delay
+        return timestamp
 
     def is_running(self):
         """
@@ -175,13 +429,53 @@ class CameraThread(QObject):
         """
         Pause frame capture without stopping the thread or releasing resources.
         """
-        self.paused = True
+        with self.state_condition:
+            self.paused = True
+            self.state_condition.notify_all()
 
     def resume(self):
         """
         Resume frame capture after pausing.
         """
-        self.paused = False
+        with self.state_condition:
+            self.paused = False
+            self.step_requests = 0
+            # Playback continues from the next frame, without catching up
+            self.pace_origin = None
+            self.state_condition.notify_all()
+
+    def step(self) -> bool:
+        """
+        Capture and deliver a single frame while paused.
+
+        Returns:
+            bool: True if a step was requested, False if the capture is not paused.
+        """
+        with self.state_condition:
+            if not (self.running and self.paused):
+                return False
+            self.step_requests += 1
+            self.state_condition.notify_all()
+            return True
+
+    def set_speed(self, speed: float) -> None:
+        """
+        Set the playback speed of video files.
+
+        Args:
+            speed (float): The speed multiplier, at least `MIN_SPEED`;
+                `math.inf` reads frames as fast as possible.
+
+        Raises:
+            ValueError: If the speed is below `MIN_SPEED`.
+        """
+        if not speed >= MIN_SPEED:
+            raise ValueError(f"speed must be at least {MIN_SPEED}")
+        with self.state_condition:
+            self.speed = speed
+            # Start a new schedule at the new speed from the next frame
+            self.pace_origin = None
+            self.state_condition.notify_all()
 
     def is_paused(self):
         """
@@ -216,11 +510,70 @@ class CameraThread(QObject):
             return self.video_capture.get(cv2.CAP_PROP_FPS)
         return 0.0
 
-    def release_buffer(self):
-        """Decrement buffer counter when frame processing completes"""
-        with self.buffer_lock:
+    def release_buffer(self, frame=None):
+        """
+        Decrement buffer counter when frame processing completes.
+
+        The pool buffer of `frame` is given back at once; consumers that keep
+        the frame longer must `retain` it in `frame_pool` first.
+
+        Args:
+            frame: The delivered frame that was processed.
+        """
+        with self.buffer_condition:
             if self.buffer_size > 0:
                 self.buffer_size -= 1
+            self.buffer_condition.notify_all()
+        self.frame_pool.release(frame)
+
+    def set_queue_policy(self, policy: str, maxsize: int = 1) -> None:
+        """
+        Set what happens to captured frames while the consumer is busy.
+
+        Args:
+            policy (str): "latest", "drop-oldest" or "block"; see `FrameQueue`.
+            maxsize (int): The number of frames that can wait.
+        """
+        self.frame_queue.configure(maxsize, policy)
+
+    def set_decode_policy(self, policy: str, target_fps: float | None = None) -> None:
+        """
+        Set which grabbed frames are decoded.
+
+        Args:
+            policy (str): "consumer-ready" to decode a frame only when the
+                consumer can take it, "target-rate" to decode at most
+                `target_fps` frames per second, or "all".
+            target_fps (float | None): The decode rate for "target-rate".
+
+        Raises:
+            ValueError: If the policy is unknown or the target rate is missing.
+        """
+        if policy not in DECODE_POLICIES:
+            raise ValueError(
+                f"Unknown decode policy: {policy}; expected one of {DECODE_POLICIES}"
+            )
+        if policy == "target-rate" and not (target_fps and target_fps > 0):
+            raise ValueError("The target-rate policy needs a positive target_fps")
+        self.decode_policy = policy
+        self.target_fps = target_fps
+        self.next_decode_time = None
+
+    def frame_counts(self) -> dict[str, int]:
+        """
+        Get the captured, delivered and dropped frame counts of the current source.
+
+        Frames grabbed but not decoded count as captured and dropped, and are
+        also reported as "skipped".
+
+        Returns:
+            dict[str, int]: The counters of `frame_queue` plus "skipped".
+        """
+        counts = self.frame_queue.counts()
+        counts["captured"] += self.frames_skipped
+        counts["dropped"] += self.frames_skipped
+        counts["skipped"] = self.frames_skipped
+        return counts
 
     def reset(self) -> None:
         """
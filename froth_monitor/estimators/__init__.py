@@ -0,0 +1,145 @@
+"""Registry of the optical-flow estimators available to `VideoAnalysis`.
+
+Estimators are registered by name, either as a class or as an
+"module:attribute" import path that is only imported when the estimator is
+first used. The built-in estimators are registered this way, and so are
+third-party estimators published through the `froth_monitor.estimators`
+entry-point group, e.g. in the plugin's pyproject.toml:
+
+```toml
+[tool.poetry.plugins."froth_monitor.estimators"]
+"MyFlow" = "my_package.flow:MyFlowEstimator"
+```
+
+Example Usage:
+--------------
+```python
+from froth_monitor.estimators import available_estimators, create_estimator
+
+print(available_estimators())
+estimator = create_estimator("DIS", {"preset": "ULTRAFAST"})
+dx, dy = estimator.estimate(gray_previous, gray_current)
+```
+"""
+
+from importlib import import_module
+from importlib.metadata import entry_points
+
+from .base import FlowEstimator
+
+ENTRY_POINT_GROUP = "froth_monitor.estimators"
+
+# Built-in estimators, imported lazily on first use
+_registry: dict[str, str | type[FlowEstimator]] = {
+    "Farneback": "froth_monitor.estimators.farneback:FarnebackEstimator",
+    "Lucas-Kanade": "froth_monitor.estimators.lucas_kanade:LucasKanadeEstimator",
+    "Lucas-Kanade Grid": "froth_monitor.estimators.lucas_kanade:GridLucasKanadeEstimator",
+    "DIS": "froth_monitor.estimators.dis:DISEstimator",
+    "PhaseCorrelation": "froth_monitor.estimators.phase_correlation:PhaseCorrelationEstimator",
+}
+_entry_points_loaded = False
+
+
+def register_estimator(name: str, estimator: str | type[FlowEstimator]) -> None:
+    """
+    Register an estimator under the given name, replacing any existing one.
+
+    Parameters
+    ----------
+    name : str
+        The name shown in the algorithm list.
+    estimator : str | type[FlowEstimator]
+        The estimator class, or its "module:attribute" import path.
+    """
+    _registry[name] = estimator
+
+
+def _load_entry_points() -> None:
+    """
+    Add the estimators published by installed packages to the registry.
+
+    Only the entry-point metadata is read here; the plugin modules themselves
+    are imported when the estimator is first used.
+    """
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        _registry.setdefault(entry_point.name, entry_point.value)
+
+
+def available_estimators() -> list[str]:
+    """
+    Return the names of all registered estimators, built-in ones first.
+
+    Returns
+    -------
+    list[str]
+        The estimator names.
+    """
+    _load_entry_points()
+    return list(_registry)
+
+
+def get_estimator_class(name: str) -> type[FlowEstimator]:
+    """
+    Return the estimator class registered under the given name, importing it
+    if needed.
+
+    Parameters
+    ----------
+    name : str
+        The estimator name.
+
+    Returns
+    -------
+    type[FlowEstimator]
+        The estimator class.
+
+    Raises
+    ------
+    ValueError
+        If no estimator is registered under the name.
+    """
+    _load_entry_points()
+    if name not in _registry:
+        raise ValueError(f"Unknown algorithm: {name}")
+
+    estimator = _registry[name]
+    if isinstance(estimator, str):
+        module_name, _, attribute = estimator.partition(":")
+        estimator = getattr(import_module(module_name), attribute)
+        _registry[name] = estimator
+
+    return estimator  # type: ignore[return-value]
+
+
+def create_estimator(name: str, params: dict | None = None) -> FlowEstimator:
+    """
+    Create an estimator instance.
+
+    Parameters
+    ----------
+    name : str
+        The estimator name.
+    params : dict | None
+        Parameters that override the estimator's defaults.
+
+    Returns
+    -------
+    FlowEstimator
+        The new estimator.
+    """
+    return get_estimator_class(name)(params)
+
+
+__all__ = [
+    "ENTRY_POINT_GROUP",
+    "FlowEstimator",
+    "available_estimators",
+    "create_estimator",
+    "get_estimator_class",
+    "register_estimator",
+]
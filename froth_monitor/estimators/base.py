@@ -0,0 +1,131 @@
+"""Base class for the optical-flow estimators used by `VideoAnalysis`.
+
+An estimator turns two consecutive gray frames of a region into its mean
+displacement. Dense estimators can also return the full per-pixel flow
+field, which `FrameModel` uses to share one flow computation between
+several nearby ROIs.
+
+Estimators describe their own parameters (`default_params`) and the values
+the algorithm configuration dialog may offer for them (`param_choices`), so
+new estimators appear in the dialog without changes to the GUI code.
+"""
+
+from typing import Any
+
+import numpy as np
+
+
+class FlowEstimator:
+    """
+    Interface for estimating the motion between two gray frames.
+
+    Subclasses set the class attributes below and implement `estimate`, or
+    implement `compute_flow` and set `dense = True` to get the mean-flow
+    `estimate` for free.
+
+    Attributes:
+    ----------
+    name : str
+        The name the estimator is registered and displayed under.
+    dense : bool
+        Whether `compute_flow` returns a dense per-pixel flow field.
+    stateless : bool
+        Whether each estimate depends only on the two frames passed in, and
+        not on earlier frames. Only stateless estimators give identical
+        results when a video is split into segments analysed separately.
+    default_params : dict[str, Any]
+        The default value of every parameter.
+    param_choices : dict[str, list[tuple[str, Any]]]
+        For each parameter shown in the configuration dialog, the (label, value)
+        pairs the user can choose from.
+    params : dict[str, Any]
+        The parameters of this instance.
+    confidence : float | None
+        A quality measure of the last estimate, if the estimator provides one.
+    """
+
+    name = ""
+    dense = False
+    stateless = True
+    default_params: dict[str, Any] = {}
+    param_choices: dict[str, list[tuple[str, Any]]] = {}
+
+    def __init__(self, params: dict | None = None) -> None:
+        """
+        Initialize the estimator with its default parameters.
+
+        Parameters
+        ----------
+        params : dict | None
+            Parameters that override the defaults.
+        """
+        self.params: dict[str, Any] = dict(self.default_params)
+        self.confidence: float | None = None
+        if params:
+            self.set_params(params)
+
+    def set_params(self, params: dict) -> None:
+        """
+        Replace the parameters, falling back to the defaults for missing keys.
+
+        Parameters
+        ----------
+        params : dict
+            The new parameters.
+        """
+        self.params = {**self.default_params, **params}
+
+    def is_stateless(self) -> bool:
+        """
+        Return whether this instance, with its current parameters, is stateless.
+
+        Estimators whose state depends on a parameter override this.
+        """
+        return self.stateless
+
+    def reset(self) -> None:
+        """
+        Forget any state carried between frames, e.g. tracked points.
+        """
+        self.confidence = None
+
+    def estimate(
+        self, gray_previous: np.ndarray, gray_current: np.ndarray
+    ) -> tuple[float, float]:
+        """
+        Estimate the mean displacement between two gray frames.
+
+        Parameters
+        ----------
+        gray_previous : np.ndarray
+            The earlier gray frame.
+        gray_current : np.ndarray
+            The later gray frame, with the same shape as `gray_previous`.
+
+        Returns
+        -------
+        tuple[float, float]
+            The mean (dx, dy) displacement in pixels.
+        """
+        flow = self.compute_flow(gray_previous, gray_current)
+        return float(np.mean(flow[..., 0])), float(np.mean(flow[..., 1]))
+
+    def compute_flow(
+        self, gray_previous: np.ndarray, gray_current: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the dense flow field between two gray frames.
+
+        Parameters
+        ----------
+        gray_previous : np.ndarray
+            The earlier gray frame.
+        gray_current : np.ndarray
+            The later gray frame, with the same shape as `gray_previous`.
+
+        Returns
+        -------
+        np.ndarray
+            An H x W x 2 float32 array holding the (dx, dy) flow of every pixel.
+        """
+        raise NotImplementedError(f"{self.name} does not produce a dense flow field")
@@ -0,0 +1,66 @@
+"""DIS (Dense Inverse Search) optical flow estimator."""
+
+from typing import cast
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .base import FlowEstimator
+
+# Presets offered for the DIS optical flow, from fastest to most accurate
+DIS_PRESETS = {
+    "ULTRAFAST": cv2.DISOpticalFlow_PRESET_ULTRAFAST,
+    "FAST": cv2.DISOpticalFlow_PRESET_FAST,
+    "MEDIUM": cv2.DISOpticalFlow_PRESET_MEDIUM,
+}
+
+
+class DISEstimator(FlowEstimator):
+    """
+    Dense optical flow with `cv2.DISOpticalFlow`.
+
+    Each estimator creates its DIS instance once and reuses it, recreating it
+    only when the preset changes.
+    """
+
+    name = "DIS"
+    dense = True
+    default_params = dict(preset="FAST")
+    param_choices = {"preset": [(preset, preset) for preset in DIS_PRESETS]}
+
+    def __init__(self, params: dict | None = None) -> None:
+        # DIS instance, created on first use and reused afterwards
+        self.dis: cv2.DISOpticalFlow | None = None
+        self.dis_preset = None
+        super().__init__(params)
+
+    def get_dis(self) -> cv2.DISOpticalFlow:
+        """
+        Return the DIS instance, creating it on first use and recreating it only
+        when the configured preset changes.
+
+        Returns
+        -------
+        cv2.DISOpticalFlow
+            The DIS instance for the current preset.
+        """
+        preset = self.params["preset"]
+        if self.dis is None or self.dis_preset != preset:
+            dis: cv2.DISOpticalFlow = cv2.DISOpticalFlow_create(DIS_PRESETS[preset])  # type: ignore[attr-defined]
+            self.dis, self.dis_preset = dis, preset
+            return dis
+        return self.dis
+
+    def compute_flow(
+        self, gray_previous: np.ndarray, gray_current: np.ndarray
+    ) -> np.ndarray:
+        # DIS needs continuous buffers, so crops (views) are compacted first
+        return cast(
+            np.ndarray,
+            self.get_dis().calc(
+                np.ascontiguousarray(gray_previous),
+                np.ascontiguousarray(gray_current),
+                cast(MatLike, None),
+            ),
+        )
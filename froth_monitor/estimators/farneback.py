@@ -0,0 +1,120 @@
+"""Farneback dense optical flow estimator."""
+
+from typing import cast
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .base import FlowEstimator
+
+# Parameters passed straight to cv2.calcOpticalFlowFarneback
+OPENCV_KEYS = ("pyr_scale", "levels", "winsize", "iterations", "poly_n", "poly_sigma")
+
+ON_OFF = [("Off", False), ("On", True)]
+
+
+class FarnebackEstimator(FlowEstimator):
+    """
+    Dense optical flow with `cv2.calcOpticalFlowFarneback`.
+
+    With `reuse_flow_buffer`, the flow is written into one preallocated buffer
+    instead of a new array every frame. With `warm_start`, that buffer also
+    seeds the next frame (OPTFLOW_USE_INITIAL_FLOW), which allows fewer pyramid
+    levels and iterations for smooth froth motion.
+    """
+
+    name = "Farneback"
+    dense = True
+    default_params = dict(
+        pyr_scale=0.5,
+        levels=int(3),
+        winsize=int(15),
+        iterations=int(3),
+        poly_n=int(7),
+        poly_sigma=1.5,
+        warm_start=False,
+        reuse_flow_buffer=True,
+    )
+    param_choices = {
+        "pyr_scale": [
+            (str(v), v) for v in (0.3, 0.5, 0.7, 0.9)
+        ],  # Between 0 and 1 (exclusive)
+        "levels": [(str(v), v) for v in range(1, 6)],  # Positive integers
+        "winsize": [(str(v), v) for v in range(5, 22, 2)],  # Positive odd integers
+        "iterations": [(str(v), v) for v in range(1, 11)],  # Positive integers
+        "poly_n": [(str(v), v) for v in (5, 7)],  # Only 5 or 7
+        "warm_start": ON_OFF,
+        "reuse_flow_buffer": ON_OFF,
+    }
+
+    def __init__(self, params: dict | None = None) -> None:
+        self.flow_buffer = cast(np.ndarray, None)
+        self.flow_frame = cast(np.ndarray, None)  # The `next` frame of flow_buffer
+        super().__init__(params)
+
+    def is_stateless(self) -> bool:
+        # A warm-started flow depends on every earlier frame
+        return not self.params["warm_start"]
+
+    def reset(self) -> None:
+        super().reset()
+        self.flow_frame = cast(np.ndarray, None)
+
+    def compute_flow(
+        self, gray_previous: np.ndarray, gray_current: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the dense Farneback flow field between two gray frames.
+
+        With `reuse_flow_buffer` or `warm_start` the result is `flow_buffer`,
+        which is overwritten by the next call.
+        """
+        flow = cast(np.ndarray, None)
+        flags = 0
+        if self.params["reuse_flow_buffer"] or self.params["warm_start"]:
+            flow, warm = self._get_flow_buffer(gray_previous)
+            if self.params["warm_start"] and warm:
+                flags = cv2.OPTFLOW_USE_INITIAL_FLOW
+
+        flow = cv2.calcOpticalFlowFarneback(
+            prev=gray_previous,
+            next=gray_current,
+            flow=cast(MatLike, flow),
+            **{key: self.params[key] for key in OPENCV_KEYS},
+            flags=flags,
+        )
+        self.flow_frame = gray_current
+        return cast(np.ndarray, flow)
+
+    def _get_flow_buffer(self, gray_previous: np.ndarray) -> tuple[np.ndarray, bool]:
+        """
+        Return the preallocated flow buffer, (re)allocating it if the region size
+        changed.
+
+        Parameters
+        ----------
+        gray_previous : np.ndarray
+            The earlier frame of the upcoming flow computation.
+
+        Returns
+        -------
+        tuple[np.ndarray, bool]
+            The buffer, and whether it holds the flow that ended at
+            `gray_previous` and can therefore seed the next computation.
+        """
+        height, width = gray_previous.shape[:2]
+        if self.flow_buffer is None or self.flow_buffer.shape[:2] != (height, width):
+            self.flow_buffer = np.zeros((height, width, 2), dtype=np.float32)
+            self.flow_frame = cast(np.ndarray, None)
+            return self.flow_buffer, False
+
+        # Crops are new view objects on every frame, so compare the memory they
+        # point to. flow_frame keeps that memory alive, so a match is genuine.
+        previous = np.asarray(gray_previous)
+        warm = self.flow_frame is not None and (
+            previous.__array_interface__["data"][0]
+            == self.flow_frame.__array_interface__["data"][0]
+            and previous.strides == self.flow_frame.strides
+        )
+        return self.flow_buffer, warm
@@ -6,8 +6,11 @@ data processing and analysis.
 """
 
 import cv2
+import numpy as np
+import pyqtgraph as pg  # type: ignore[import-untyped]
 import sys
 import os
+import re
 import time
 from typing import cast
 from PySide6.QtWidgets import (
@@ -17,13 +20,12 @@ from PySide6.QtWidgets import (
     QComboBox,
     QHBoxLayout,
     QLabel,
-    QDoubleSpinBox,
     QMessageBox,
     QTableWidget,
     QPushButton,
     QVBoxLayout,
 )
-from PySide6.QtCore import QTimer, Qt, QRect
+from PySide6.QtCore import QTimer, QRect
 from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtGui import QIcon
 
@@ -31,78 +33,108 @@ from PySide6.QtGui import QIcon
 from froth_monitor.gui_window import MainGUIWindow
 
 # Import FrameModel from fm_model module
-from froth_monitor.fm_model import FrameModel
+from froth_monitor.fm_model import ROI, FrameModel
+
+from froth_monitor.estimators import get_estimator_class
+
+# Import the single-pass resize of the display path
+from froth_monitor.image_analysis import fit_frame
 
 # Import the custom overlay widget
 from froth_monitor.overlay_widget import OverlayWidget
 
-# Import the camera thread
-from froth_monitor.camera_thread import CameraThread
+# Import the per-source pipelines
+from froth_monitor.pipeline import (
+    CameraPipeline,
+    DisplayScheduler,
+    FrameAnalyser,
+    FrameSource,
+)
+from froth_monitor.camera_process import ProcessPipeline
+
+from froth_monitor.export import Export, format_timestamp
 
-from froth_monitor.export import Export
+# Import the rolling statistics shown in the velocity table
+from froth_monitor.rolling_stats import format_duration
 
 # Import the video recorder module
 from froth_monitor.video_recorder import VideoRecorder
 
 
+# Columns of the velocity statistics table
+STATS_COLUMNS = ["mean", "std", "min", "max"]
+
+
+def frame_to_qimage(frame: np.ndarray) -> QImage:
+    """
+    Wrap an OpenCV frame (BGR or gray) in a QImage without converting or copying it.
+
+    The image reads the frame's own buffer, so the frame must stay alive, and
+    unchanged, until the image has been turned into a QPixmap.
+
+    Args:
+        frame: A BGR or gray frame whose rows are packed pixels
+
+    Returns:
+        QImage: The image on the frame's buffer
+    """
+    height, width = frame.shape[:2]
+    image_format = (
+        QImage.Format.Format_Grayscale8
+        if frame.ndim == 2
+        else QImage.Format.Format_BGR888
+    )
+    return QImage(frame.data, width, height, frame.strides[0], image_format)
+
+
+def keep_frame(pipeline: CameraPipeline, frame: np.ndarray) -> np.ndarray:
+    """
+    Return a frame of the pipeline that stays intact until it is released.
+
+    Frames from a camera thread are retained in its frame pool. Frames of a
+    `ProcessPipeline` are views of its shared ring, which the camera process
+    overwrites whatever the GUI holds, so they are copied.
+
+    Args:
+        pipeline: The pipeline that delivered the frame
+        frame: The delivered frame
+
+    Returns:
+        np.ndarray: The frame to keep; release it to the pipeline's frame pool
+    """
+    if isinstance(pipeline, ProcessPipeline):
+        return frame.copy()
+    pipeline.camera_thread.frame_pool.retain(frame)
+    return frame
+
+
 class AlgorithmConfigurationHandler:
     """
     A class to handle the configuration of the velocity calculation algorithm.
 
     This class provides a dialog window for configuring thevelocity calculation
-    algorithm. It allows the user to select an algorithm (Farneback or Lucas-Kanade) and
+    algorithm. It allows the user to select any registered estimator and
     adjust the parameters for the selected algorithm. The class also provides a
     method to retrieve the selected algorithm and its parameters.
+
+    The frames of the pipeline are shown while the dialog is open; the newest
+    one is kept with `keep_frame` until `stop` is called.
     """
 
-    def __init__(self, gui: MainGUIWindow, 
-                        camera_thread: CameraThread,
-                        frame_model: FrameModel):
-        self.camera_thread = camera_thread
+    def __init__(
+        self, gui: MainGUIWindow, pipeline: CameraPipeline, frame_model: FrameModel
+    ):
+        self.pipeline = pipeline
+        self.frame_pool = pipeline.camera_thread.frame_pool
+        self.current_frame = None
         self.overlay_widget = cast(OverlayWidget, None)
 
         self.frame_model = frame_model
         self.frame_model.initialize_algo_config()
 
-        self.lk_params = dict(
-            winSize=(15, 15),
-            maxLevel=2,
-            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
-        )
-        self.lk_valid_values = {
-            "winSize": [
-                (5, 5),
-                (7, 7),
-                (9, 9),
-                (11, 11),
-                (13, 13),
-                (15, 15),
-                (17, 17),
-                (19, 19),
-                (21, 21),
-            ],  # Must be between 0 and 1 (exclusive)
-            "maxLevel": [0, 1, 2, 3, 4, 5],  # Positive integers
-            "criteria": [
-                (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, "EPS|COUNT"),
-                (cv2.TERM_CRITERIA_EPS, "EPS"),
-                (cv2.TERM_CRITERIA_COUNT, "COUNT"),
-            ],
-        }
-        self.of_params = dict(
-            pyr_scale=0.5,
-            levels=int(3),
-            winsize=int(15),
-            iterations=int(3),
-            poly_n=int(7),
-            poly_sigma=1.5,
-        )
-        self.of_valid_values = {
-            "pyr_scale": [0.3, 0.5, 0.7, 0.9],  # Must be between 0 and 1 (exclusive)
-            "levels": [1, 2, 3, 4, 5],  # Positive integers
-            "winsize": [5, 7, 9, 11, 13, 15, 17, 19, 21],  # Positive odd integers
-            "iterations": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],  # Positive integers
-            "poly_n": [5, 7],  # Only 5 or 7
-        }
+        # Parameters being edited in the dialog, keyed by algorithm name.
+        # Filled lazily so an estimator module is only imported when selected.
+        self.algo_params: dict[str, dict] = {}
 
         self.gui = gui
 
@@ -113,7 +145,7 @@ class AlgorithmConfigurationHandler:
 
         self.initUI()
         self.initialize_tool_window()
-        self.camera_thread.frame_available.connect(self.process_new_frame)
+        self.pipeline.frame_delivered.connect(self.process_new_frame)
 
     def initUI(self):
         self.dialog = QDialog(self.gui)
@@ -152,7 +184,7 @@ class AlgorithmConfigurationHandler:
             """
         )
         self.confirm_algo_button.clicked.connect(self._confirm_algo)
-        
+
         self.exit_button = QPushButton("Confirm and Exit")
         self.exit_button.setStyleSheet(
             """
@@ -184,7 +216,7 @@ class AlgorithmConfigurationHandler:
             "border: 1px solid #ccc; background-color: #f0f0f0;"
         )  # Example style
         right_layout.addWidget(self.video_canvas)
-        
+
         # Info bar
         self.info_bar = QLabel("Frame time: -- ms | Avg (15): -- ms")
         right_layout.addWidget(self.info_bar)
@@ -194,7 +226,7 @@ class AlgorithmConfigurationHandler:
         self.dialog.setLayout(main_layout)
 
     def _add_algorithm_combo(self):
-        self.algorithm_selector.addItems(["Farneback", "Lucas-Kanade"])
+        self.algorithm_selector.addItems(self.frame_model.algorithm_list)
         self.algorithm_selector.setStyleSheet(
             "background-color: #4285f4; color: white; font-size: 12px; padding: 8px; \
             border-radius: 4px;"
@@ -204,92 +236,55 @@ class AlgorithmConfigurationHandler:
             self._update_parameter_table
         )
 
-    def _update_parameter_table(self):
-        selected_algorithm = self.algorithm_selector.currentText()
+    def _get_algo_params(self, algorithm: str) -> dict:
+        """
+        Return the parameters being edited for ``algorithm``.
 
-        if selected_algorithm == "Farneback":
-            self.param_table.setRowCount(5)
-            self.param_table.setColumnCount(1)
-            self.param_table.setHorizontalHeaderLabels(["Value"])
-            self.param_table.setVerticalHeaderLabels(
-                ["pyr_scale", "levels", "winsize", "iterations", "poly_n"]
-            )
-            param_keys = list(self.of_params.keys())
-
-            for row in range(5):
-                key = param_keys[row]
-                value = self.of_params[key]
-                if key in self.of_valid_values:
-                    combo = QComboBox()
-                    for v in self.of_valid_values[key]:
-                        combo.addItem(str(v))
-                    combo.setCurrentText(str(value))
-                    self.param_table.setCellWidget(row, 0, combo)
-                else:
-                    # For poly_sigma, which is not in the table but is in of_params, use QDoubleSpinBox
-                    spinbox = QDoubleSpinBox()
-                    spinbox.setDecimals(2)
-                    spinbox.setRange(0.1, 10.0)
-                    spinbox.setValue(value)
-                    self.param_table.setCellWidget(row, 0, spinbox)
-
-        if selected_algorithm == "Lucas-Kanade":
-            self.param_table.setRowCount(3)
-            self.param_table.setColumnCount(1)
-            self.param_table.setHorizontalHeaderLabels(["Value"])
-            self.param_table.setVerticalHeaderLabels(
-                ["winSize", "maxLevel", "criteria"]
-            )
+        The first call copies the frame model's current parameters, so the
+        dialog opens on whatever the ROIs are already using.
+        """
+        if algorithm not in self.algo_params:
+            self.algo_params[algorithm] = dict(self.frame_model.get_params(algorithm))
+        return self.algo_params[algorithm]
 
-            # winSize
-            combo_win = QComboBox()
-            for ws in self.lk_valid_values["winSize"]:
-                combo_win.addItem(str(ws))
-            combo_win.setCurrentText(str(self.lk_params["winSize"]))
-            self.param_table.setCellWidget(0, 0, combo_win)
-
-            # maxLevel
-            combo_level = QComboBox()
-            for lvl in self.lk_valid_values["maxLevel"]:
-                combo_level.addItem(str(lvl))
-            combo_level.setCurrentText(str(self.lk_params["maxLevel"]))
-            self.param_table.setCellWidget(1, 0, combo_level)
-
-            # criteria
-            combo_criteria = QComboBox()
-            for val, label in self.lk_valid_values["criteria"]:
-                combo_criteria.addItem(label, val)
-            combo_criteria.setCurrentIndex(0)  # Default to EPS|COUNT
-            self.param_table.setCellWidget(2, 0, combo_criteria)
+    def _update_parameter_table(self):
+        """
+        Rebuild the parameter table from the selected estimator's ``param_choices``.
+        """
+        selected_algorithm = self.algorithm_selector.currentText()
+        param_choices = get_estimator_class(selected_algorithm).param_choices
+        params = self._get_algo_params(selected_algorithm)
+
+        self.param_table.setRowCount(len(param_choices))
+        self.param_table.setColumnCount(1)
+        self.param_table.setHorizontalHeaderLabels(["Value"])
+        self.param_table.setVerticalHeaderLabels(list(param_choices))
+
+        for row, (key, choices) in enumerate(param_choices.items()):
+            combo = QComboBox()
+            for label, value in choices:
+                combo.addItem(label)
+                if value == params.get(key):
+                    combo.setCurrentIndex(combo.count() - 1)
+            self.param_table.setCellWidget(row, 0, combo)
 
     def _confirm_algo(self):
         """
         Confirm the selected algorithm and update the GUI accordingly.
         """
         selected_algorithm = self.algorithm_selector.currentText()
-        if selected_algorithm == "Farneback":
-            self.of_params["pyr_scale"] = float(
-                cast(QComboBox, self.param_table.cellWidget(0, 0)).currentText()
-            )
-            self.of_params["levels"] = int(cast(QComboBox, self.param_table.cellWidget(1, 0)).currentText())
-            self.of_params["winsize"] = int(cast(QComboBox, self.param_table.cellWidget(2, 0)).currentText())
-            self.of_params["iterations"] = int(cast(QComboBox, self.param_table.cellWidget(3, 0)).currentText())
-            self.of_params["poly_n"] = int(cast(QComboBox, self.param_table.cellWidget(4, 0)).currentText())
-
-            self.frame_model.confirm_algorithm_n_params(selected_algorithm, 
-            self.of_params)
-        if selected_algorithm == "Lucas-Kanade":
-            winsize_str = cast(QComboBox, self.param_table.cellWidget(0, 0)).currentText()
-            winsize_tuple = eval(winsize_str)  # Safely convert string "(15, 15)" to tuple
-            self.lk_params["winSize"] = winsize_tuple
-            self.lk_params["maxLevel"] = int(cast(QComboBox, self.param_table.cellWidget(1, 0)).currentText())
-            criteria_val = cast(QComboBox, self.param_table.cellWidget(2, 0)).currentData()
-            self.lk_params["criteria"] = (criteria_val, 10, 0.03)
-
-            self.frame_model.confirm_algorithm_n_params(selected_algorithm, self.lk_params)
-        
-    def initialize_tool_window(self):
+        param_choices = get_estimator_class(selected_algorithm).param_choices
+        params = self._get_algo_params(selected_algorithm)
+
+        # Values are looked up by index so tuples (e.g. winSize) survive the
+        # round trip through the combo box untouched.
+        for row, (key, choices) in enumerate(param_choices.items()):
+            combo = cast(QComboBox, self.param_table.cellWidget(row, 0))
+            params[key] = choices[combo.currentIndex()][1]
+
+        self.frame_model.confirm_algorithm_n_params(selected_algorithm, params)
 
+    def initialize_tool_window(self):
         # Initialize the video rectangle to the full canvas size
         # This will be updated when the first frame arrives
         self.video_rect = QRect(0, 0, self.canvas_width, self.canvas_height)
@@ -308,7 +303,7 @@ class AlgorithmConfigurationHandler:
         # Bring the overlay to the front
         self.overlay_widget.raise_()
 
-    def process_new_frame(self, frame):
+    def process_new_frame(self, frame, timestamp=None):
         """
         Process and display a new frame received from the camera thread.
 
@@ -317,35 +312,31 @@ class AlgorithmConfigurationHandler:
 
         Args:
             frame: The new frame from the camera thread
+            timestamp: The capture time of the frame in seconds (unused here)
         """
 
         time_start = time.time()
 
-        # Store the current frame for potential further processing
+        # Store the current frame for potential further processing, keeping
+        # its buffer from being refilled until the next frame replaces it
+        frame = keep_frame(self.pipeline, frame)
+        self.frame_pool.release(self.current_frame)
         self.current_frame = frame
 
-        # Convert frame to QImage and scale it
-        cropped_frame = self._crop_image(frame)
-        qt_image = self._convert_frame_to_qimage(cropped_frame)
-        scaled_image = self._scale_image_to_canvas(qt_image)
-
-        # Create a resized frame for processing
-        resized_frame = self._create_resized_frame(
-            frame, scaled_image.width(), scaled_image.height()
-        )
+        # Resize once to the canvas; the display and the analysis share the result
+        resized_frame = fit_frame(frame, self.canvas_width, self.canvas_height)
+        qt_image = frame_to_qimage(resized_frame)
 
-        # Only allow to let frame pass in when the previous frame has been processed
-        # This is to prevent the overstacking of frames
-        self.camera_thread.if_release = False
+        # The camera thread sends the next frame once the main window has
+        # released this one, so frames do not stack up while this runs
         self._process_frame_with_model(resized_frame)
-        self.camera_thread.if_release = True
 
         # Display the frame on the canvas
-        pixmap = self._display_frame_on_canvas(scaled_image)
+        pixmap = self._display_frame_on_canvas(qt_image)
 
         self.previous_process_time = time.time() - time_start
         self._update_info_bar()
-    
+
     def _update_info_bar(self):
         """
         Update the information bar with the current frame time and average time.
@@ -357,7 +348,7 @@ class AlgorithmConfigurationHandler:
         if len(self.accumulated_process_time) == 30:
             self.process_time_avg_30 = sum(self.accumulated_process_time) / 30
             self.accumulated_process_time = self.accumulated_process_time[1:]
-            
+
         self.info_bar.setText(
             f"Frame time: {self.previous_process_time * 1000:.2f} ms |\
                  Avg (30): {self.process_time_avg_30 * 1000:.2f} ms"
@@ -367,73 +358,10 @@ class AlgorithmConfigurationHandler:
             border-radius: 4px;"
         )
 
-    def _crop_image(self, frame):
-        """
-        Crop the frame based on the canvas size.
-
-        Args:
-            frame: The frame to be cropped
-
-        Returns:
-            The cropped frame
-        """
-        # Calculate the cropping coordinates
-        x = (frame.shape[1] - self.canvas_width) // 2
-        y = (frame.shape[0] - self.canvas_height) // 2
-
-        # Crop the frame
-        cropped_frame = frame[y : y + self.canvas_height, x : x + self.canvas_width]
-
-        return cropped_frame
-        
-    def _convert_frame_to_qimage(self, frame):
-        """
-        Convert an OpenCV frame (BGR) to a Qt QImage (RGB).
-
-        Args:
-            frame: OpenCV frame in BGR format
-
-        Returns:
-            QImage: The converted Qt image
-        """
-        # Convert the frame from BGR to RGB format (OpenCV uses BGR, Qt uses RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Create a QImage from the frame data
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        return QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-
-    def _scale_image_to_canvas(self, qt_image):
-        """
-        Scale the QImage to fit the canvas while maintaining aspect ratio.
-
-        Args:
-            qt_image: The QImage to scale
-
-        Returns:
-            QImage: The scaled image
-        """
-        return qt_image.scaled(
-            self.canvas_width, self.canvas_height, Qt.AspectRatioMode.KeepAspectRatio
-        )
-
-    def _create_resized_frame(self, frame, width, height):
-        """
-        Create a resized NumPy array with the specified dimensions.
-
-        Args:
-            frame: The original frame
-            width: Target width
-            height: Target height
-
-        Returns:
-            ndarray: Resized frame
-        """
-        return cv2.resize(frame, (width, height))
-
     def _process_frame_with_model(self, resized_frame):
-        self.delta_pixels = self.frame_model.process_frame_for_algo_config(resized_frame)
+        self.delta_pixels = self.frame_model.process_frame_for_algo_config(
+            resized_frame
+        )
         print(self.delta_pixels)
         self.overlay_widget.display_roi_for_algo_config(self.delta_pixels)
 
@@ -462,23 +390,26 @@ class AlgorithmConfigurationHandler:
             event: The close event.
         """
         selected_algorithm = self.algorithm_selector.currentText()
-
-        if selected_algorithm == "Farneback":
-            params = self.of_params
-
-        else:
-            params = self.lk_params
+        params = self._get_algo_params(selected_algorithm)
 
         param_str = "\n".join(f"{k}: {v}" for k, v in params.items())
 
         QMessageBox.information(
             self.dialog,
             "Algorithm Configuration",
-            f"Algorithm: {selected_algorithm}\n Parameters:\n{param_str}"
+            f"Algorithm: {selected_algorithm}\n Parameters:\n{param_str}",
         )
 
         self.dialog.close()
 
+    def stop(self):
+        """
+        Stop showing the frames of the pipeline and release the current frame.
+        """
+        self.pipeline.frame_delivered.disconnect(self.process_new_frame)
+        self.frame_pool.release(self.current_frame)
+        self.current_frame = None
+
 
 class EventHandler:
     """
@@ -509,40 +440,86 @@ class EventHandler:
         self.canvas_width = self.gui.video_canvas_label.width()
         self.canvas_height = self.gui.video_canvas_label.height()
 
-        # Initialize camera thread for event-driven frame capture
-        self.camera_thread = CameraThread()
-        self.camera_thread.frame_available.connect(self.process_new_frame)
+        # One pipeline (capture thread, frame model with its ROIs and
+        # calibration, and analysis worker) per video source; the canvas shows
+        # the selected one while the others keep running
+        self.pipelines: list[CameraPipeline] = []
+        self.pipeline = self.add_pipeline()
+        self.pipeline.view = self
 
         # Initialize video capture for compatibility with existing code
         self.video_capture = None  # Keep for compatibility with existing code
         self.timer = QTimer()  # Keep for compatibility with existing code
 
         # Parameters of the event handling logic
-        self.playing = False
         self.confirm_algo = False
-        self.confirm_calibration = False
         self.current_frame = None
         self.frame_width = 0
         self.frame_height = 0
 
-        # Initialize the frame model for processing video frames
-        self.frame_model = FrameModel()
         self.current_frame_number = 0
         self.export = Export(self.gui)
 
-        # Initialize video recorder
+        # Initialize video recorder; it records the source it was started on
         self.video_recorder = VideoRecorder()
         self.recording_active = False
+        self.recording_pipeline: CameraPipeline | None = None
 
         # Overlay related attributes
         self.overlay_widget: OverlayWidget = cast(OverlayWidget, None)
         self.overlay_active = False
         self.video_rect = QRect()
 
+        # Display pixels per source-frame pixel; ROIs and the ruler are drawn on
+        # the canvas but stored in source coordinates
+        self.display_scale = 1.0
+
+        # Frames are shown at most at the display rate, whatever the capture
+        # and analysis rates
+        self.display_scheduler = DisplayScheduler(
+            self.gui.display_fps_combo.currentData()
+        )
+
+        # One persistent velocity curve per ROI of the selected source, and the
+        # (velocity, timestamp) of the highest point on the plot
+        self.velocity_curves: dict[ROI, pg.PlotDataItem] = {}
+        self.velocity_peak: tuple[float, float] | None = None
+        self.velocity_plot_state: tuple[float, float] | None = None
+
         self.if_save = False
         # Connect GUI signals to handler methods
         self.connect_signals()
 
+    # The camera thread, frame model, analysis worker and play and calibration
+    # state of the selected source
+    @property
+    def camera_thread(self) -> FrameSource:
+        return self.pipeline.camera_thread
+
+    @property
+    def frame_model(self) -> FrameModel:
+        return self.pipeline.frame_model
+
+    @property
+    def analysis_worker(self) -> FrameAnalyser:
+        return self.pipeline.analysis_worker
+
+    @property
+    def playing(self) -> bool:
+        return self.pipeline.playing
+
+    @playing.setter
+    def playing(self, value: bool) -> None:
+        self.pipeline.playing = value
+
+    @property
+    def confirm_calibration(self) -> bool:
+        return self.pipeline.confirm_calibration
+
+    @confirm_calibration.setter
+    def confirm_calibration(self, value: bool) -> None:
+        self.pipeline.confirm_calibration = value
+
     def connect_signals(self):
         """Connect GUI signals to their respective handler methods."""
         # Connect menu actions directly
@@ -551,6 +528,11 @@ class EventHandler:
 
         # # Connect buttons directly using the gui reference
         self.gui.play_pause_button.clicked.connect(self.pause_play)
+        self.gui.step_button.clicked.connect(self.step_frame)
+        self.gui.playback_speed_combo.currentIndexChanged.connect(
+            self.change_playback_speed
+        )
+        self.gui.display_fps_combo.currentIndexChanged.connect(self.change_display_rate)
         self.gui.add_roi_button.clicked.connect(self.add_roi)
         self.gui.algorithm_configuration.clicked.connect(
             self.open_algorithm_configuration
@@ -562,6 +544,163 @@ class EventHandler:
         self.gui.add_arrow_button.clicked.connect(self.start_arrow_drawing)
         self.gui.calibration_button.clicked.connect(self.start_ruler_calibration)
         self.gui.delete_roi_button.clicked.connect(self.delete_last_roi)
+        self.gui.analysis_scale_combo.currentIndexChanged.connect(
+            self.change_analysis_scale
+        )
+        self.gui.plot_span_combo.currentIndexChanged.connect(self.update_velocity_plot)
+        self.gui.source_combo.currentIndexChanged.connect(self.select_pipeline)
+        self.gui.add_source_button.clicked.connect(self.add_source)
+        self.gui.process_mode_checkbox.toggled.connect(self.change_pipeline_mode)
+        self.gui.batched_flow_checkbox.toggled.connect(self.change_batched_flow)
+        self.gui.cluster_gap_spinbox.valueChanged.connect(self.change_batched_flow)
+        self.gui.roi_workers_spinbox.valueChanged.connect(self.change_roi_workers)
+        self.gui.history_limit_combo.currentIndexChanged.connect(
+            self.change_history_limit
+        )
+
+    # -----------------------------------Video Sources-----------------------------------------------
+    def add_pipeline(self) -> CameraPipeline:
+        """
+        Create an idle pipeline for another video source and list it in the GUI.
+
+        Returns:
+            CameraPipeline: The new pipeline.
+        """
+        pipeline = self._pipeline_class()(f"Source {len(self.pipelines) + 1}")
+        self.pipelines.append(pipeline)
+        self.gui.source_combo.addItem(pipeline.name)
+        return pipeline
+
+    def _pipeline_class(self) -> type[CameraPipeline]:
+        """
+        Return the kind of pipeline new sources get: threads in this process,
+        or a camera process of their own.
+        """
+        if self.gui.process_mode_checkbox.isChecked():
+            return ProcessPipeline
+        return CameraPipeline
+
+    def change_pipeline_mode(self):
+        """
+        Apply the process mode to the selected source if it has not been opened
+        yet. Opened sources keep running the way they were started.
+        """
+        pipeline_class = self._pipeline_class()
+        if self.pipeline.source is not None or type(self.pipeline) is pipeline_class:
+            return
+
+        index = self.pipelines.index(self.pipeline)
+        pipeline = pipeline_class(self.pipeline.name)
+        self.pipeline.close()
+        self.pipelines[index] = pipeline
+        self.pipeline = pipeline
+        self.pipeline.view = self
+
+    def add_source(self):
+        """
+        Open another camera or video next to the current ones and show it.
+        """
+        pipeline = self.add_pipeline()
+        self.gui.source_combo.setCurrentIndex(len(self.pipelines) - 1)
+        self.handle_video_import()
+
+        if pipeline.source is None:
+            # The import was cancelled or failed
+            self.remove_pipeline(pipeline)
+
+    def remove_pipeline(self, pipeline: CameraPipeline) -> None:
+        """
+        Stop a pipeline and remove it from the GUI, keeping at least one.
+
+        Args:
+            pipeline: The pipeline to remove.
+        """
+        if len(self.pipelines) == 1:
+            return
+        index = self.pipelines.index(pipeline)
+        if pipeline is self.pipeline:
+            self.gui.source_combo.setCurrentIndex(index - 1 if index > 0 else 1)
+        pipeline.close()
+        self.pipelines.remove(pipeline)
+        self.gui.source_combo.removeItem(index)
+
+    def close_sources(self) -> None:
+        """
+        Stop every source for good, e.g. when the application quits, so camera
+        processes free their shared memory.
+        """
+        for pipeline in self.pipelines:
+            pipeline.close()
+
+    def select_pipeline(self, index: int) -> None:
+        """
+        Show the video, ROIs, calibration and results of another source.
+
+        The other sources keep capturing and analysing in the background.
+
+        Args:
+            index: The index of the source in the source combo box.
+        """
+        if (
+            not 0 <= index < len(self.pipelines)
+            or self.pipelines[index] is self.pipeline
+        ):
+            return
+
+        self.pipeline.view = None
+        self.pipeline.camera_thread.frame_pool.release(self.current_frame)
+        self.current_frame = None
+
+        self.pipeline = self.pipelines[index]
+        self.pipeline.view = self
+        self._show_pipeline_settings()
+
+    def _show_pipeline_settings(self) -> None:
+        """
+        Show the settings and results of the selected source in the GUI.
+        """
+        self.gui.video_canvas_label.clear()
+        if self.overlay_widget:
+            self.overlay_widget.display_roi(self.frame_model.roi_list)
+
+        self.gui.px2mm_result_textbox.setText(f"{self.frame_model.px2mm:.1f}")
+        self.gui.direction_textbox.setText(f"{self.frame_model.degree:.2f}")
+        for combo, value in (
+            (self.gui.analysis_scale_combo, self.frame_model.analysis_scale),
+            (self.gui.playback_speed_combo, self.camera_thread.speed),
+            (self.gui.history_limit_combo, self.frame_model.history_limit or 0),
+        ):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(max(0, combo.findData(value)))
+            combo.blockSignals(False)
+
+        options = (
+            self.gui.batched_flow_checkbox,
+            self.gui.cluster_gap_spinbox,
+            self.gui.roi_workers_spinbox,
+        )
+        for widget in options:
+            widget.blockSignals(True)
+        self.gui.batched_flow_checkbox.setChecked(self.frame_model.batched_flow)
+        gap = self.frame_model.cluster_gap
+        self.gui.cluster_gap_spinbox.setValue(-1 if gap is None else gap)
+        self.gui.roi_workers_spinbox.setValue(self.frame_model.roi_workers)
+        for widget in options:
+            widget.blockSignals(False)
+
+        self.update_velocity_plot()
+        self.update_ave_velo_table()
+
+    def _rename_pipeline(self, pipeline: CameraPipeline, name: str) -> None:
+        """
+        Name a source after the camera or video it shows.
+
+        Args:
+            pipeline: The pipeline of the source.
+            name: The new name.
+        """
+        pipeline.name = name
+        self.gui.source_combo.setItemText(self.pipelines.index(pipeline), name)
 
     def handle_video_import(self):
         if self.gui.webcam_radio.isChecked():
@@ -588,18 +727,16 @@ class EventHandler:
         )
 
         if file_path:
-            # Store the video source for pause/resume functionality
-            self.last_video_source = file_path
+            # Start the selected source's camera thread with the video file
+            if self.pipeline.start(file_path):
+                self._rename_pipeline(self.pipeline, os.path.basename(file_path))
 
-            # Start the camera thread with the selected video file
-            if self.camera_thread.start_capture(file_path):
                 # Get video properties
                 self.frame_width, self.frame_height = (
                     self.camera_thread.get_frame_dimensions()
                 )
 
                 # Start playing the video
-                self.playing = True
                 self.initialze_tool_window()
             else:
                 QMessageBox.critical(
@@ -658,18 +795,16 @@ class EventHandler:
         selected_camera = camera_combo.currentText()
         camera_index = int(selected_camera.split(" ")[1])
 
-        # Store the camera index for pause/resume functionality
-        self.last_video_source = camera_index
+        # Start the selected source's camera thread with the selected camera
+        if self.pipeline.start(camera_index):
+            self._rename_pipeline(self.pipeline, selected_camera)
 
-        # Start the camera thread with the selected camera
-        if self.camera_thread.start_capture(camera_index):
             # Get video properties
             self.frame_width, self.frame_height = (
                 self.camera_thread.get_frame_dimensions()
             )
 
             # Start playing the video
-            self.playing = True
             self.initialze_tool_window()
             # Close the dialog
             dialog.accept()
@@ -687,11 +822,11 @@ class EventHandler:
             QMessageBox.warning(self.gui, "Warning", "No video source loaded!")
             return
 
-        dialog = AlgorithmConfigurationHandler(self.gui, 
-                                                self.camera_thread, 
-                                                self.frame_model)
+        dialog = AlgorithmConfigurationHandler(
+            self.gui, self.pipeline, self.frame_model
+        )
         dialog.dialog.exec()
-        pass
+        dialog.stop()
 
     def pause_play(self):
         """
@@ -729,14 +864,32 @@ class EventHandler:
                 )
 
             # If the thread is not running, we need to restart it
-            elif hasattr(self, "last_video_source"):
-                self.camera_thread.start_capture(self.last_video_source)
-                self.playing = True
+            elif self.pipeline.source is not None:
+                self.pipeline.start(self.pipeline.source)
                 self.gui.statusBar().showMessage("Video started")
             else:
                 QMessageBox.warning(self.gui, "Warning", "Cannot resume video!")
                 return
 
+    def step_frame(self):
+        """
+        Show and analyse the next frame while the video is paused.
+        """
+        if not self.camera_thread.step():
+            self.gui.statusBar().showMessage("Pause the video to step through frames")
+
+    def change_playback_speed(self):
+        """
+        Apply the playback speed chosen in the combo box to the video.
+        """
+        self.camera_thread.set_speed(self.gui.playback_speed_combo.currentData())
+
+    def change_display_rate(self):
+        """
+        Apply the display rate chosen in the combo box to the canvas.
+        """
+        self.display_scheduler.set_max_fps(self.gui.display_fps_combo.currentData())
+
     def initialze_tool_window(self):
         if not self.playing:
             return
@@ -749,7 +902,11 @@ class EventHandler:
         # This will be updated when the first frame arrives
         self.video_rect = QRect(0, 0, canvas_width, canvas_height)
 
-        # Create and set up the overlay widget
+        # Create and set up the overlay widget, replacing the one of a source
+        # opened before
+        if self.overlay_widget:
+            self.overlay_widget.hide()
+            self.overlay_widget.deleteLater()
         self.overlay_widget = OverlayWidget(self.gui.video_container)
 
         # Connect the ROI created signal to our handler
@@ -796,127 +953,100 @@ class EventHandler:
         QMessageBox.information(self.gui, "Info", "Application reset for new mission.")
 
         self.if_save = False
-        self.confirm_calibration = False
         self.confirm_algo = False
         self.current_frame_number = 0
-        self.camera_thread.reset()
+
+        # Keep a single, empty source
+        self.gui.source_combo.setCurrentIndex(0)
+        for pipeline in self.pipelines[1:]:
+            self.remove_pipeline(pipeline)
+        self.pipeline.reset()
+        self._rename_pipeline(self.pipeline, "Source 1")
+
         self.gui.video_canvas_label.clear()
-        self.gui.plot_widget.clear()
-        self.frame_model.reset()
+        self._clear_velocity_plot()
         self.overlay_widget.reset()
 
     # -----------------------------------Frame Processing-----------------------------------------------
-    def process_new_frame(self, frame):
+    def show_frame(self, pipeline, frame, timestamp):
         """
-        Process and display a new frame received from the camera thread.
+        Display a new frame of the selected source.
 
-        This method is called whenever a new frame is available from the camera thread.
-        It processes the frame, updates the UI, and handles ROI display.
+        The pipeline calls this for every frame it delivers while it is
+        selected, after handing the frame to its analysis worker, and releases
+        the frame back to its camera thread afterwards. Frames beyond the
+        display rate return at once, before any conversion; stepped frames
+        are always shown.
 
         Args:
+            pipeline: The pipeline of the selected source
             frame: The new frame from the camera thread
+            timestamp: The capture time of the frame in seconds
         """
-        if not self.playing:
+        if not pipeline.camera_thread.is_paused() and not self.display_scheduler.due():
             return
 
-        # Store the current frame for potential further processing
+        # Store the current frame for potential further processing, keeping
+        # its buffer from being refilled until the next frame replaces it
+        frame = keep_frame(pipeline, frame)
+        pipeline.camera_thread.frame_pool.release(self.current_frame)
         self.current_frame = frame
 
-        # Convert frame to QImage and scale it
-        qt_image = self._convert_frame_to_qimage(frame)
-        scaled_image = self._scale_image_to_canvas(qt_image)
-
-        # Create a resized frame for processing
-        resized_frame = self._create_resized_frame(
-            frame, scaled_image.width(), scaled_image.height()
-        )
-
-        # Process the frame with the frame model
-
-        # Only allow to let frame pass in when the previous frame has been processed
-        # This is to prevent the overstacking of frames
-        self.camera_thread.if_release = False
-        self._process_frame_with_model(resized_frame)
-        self.camera_thread.if_release = True
+        # Resize once to the canvas and show the BGR pixels as they are
+        display_frame = fit_frame(frame, self.canvas_width, self.canvas_height)
+        qt_image = frame_to_qimage(display_frame)
+        self._update_display_scale(frame, qt_image)
 
         # Display the frame on the canvas
-        pixmap = self._display_frame_on_canvas(scaled_image)
+        pixmap = self._display_frame_on_canvas(qt_image)
 
-        # Update the overlay position
+        # Update the overlay position, and the ROIs with the latest results
         self._update_overlay_position(pixmap)
-
-        # Record frame if recording is active
-        if self.recording_active and self.video_recorder.is_active():
-            self.video_recorder.record_frame(frame)
+        if self.overlay_widget:
+            self.overlay_widget.display_roi(self.frame_model.roi_list)
 
         # Update status bar
         self._update_status_bar()
 
-    def _convert_frame_to_qimage(self, frame):
+    def show_results(self, pipeline, result):
         """
-        Convert an OpenCV frame (BGR) to a Qt QImage (RGB).
+        Render the results of an analysed frame of the selected source.
 
-        Args:
-            frame: OpenCV frame in BGR format
-
-        Returns:
-            QImage: The converted Qt image
-        """
-        # Convert the frame from BGR to RGB format (OpenCV uses BGR, Qt uses RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Create a QImage from the frame data
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        return QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-
-    def _scale_image_to_canvas(self, qt_image):
-        """
-        Scale the QImage to fit the canvas while maintaining aspect ratio.
+        This runs in the GUI thread with the result dict emitted by the
+        pipeline's analysis worker.
 
         Args:
-            qt_image: The QImage to scale
-
-        Returns:
-            QImage: The scaled image
+            pipeline: The pipeline of the selected source
+            result: The result dict from `AnalysisWorker.process`
         """
-        return qt_image.scaled(
-            self.canvas_width, self.canvas_height, Qt.AspectRatioMode.KeepAspectRatio
-        )
+        if not pipeline.playing and not pipeline.camera_thread.is_paused():
+            return
 
-    def _create_resized_frame(self, frame, width, height):
-        """
-        Create a resized NumPy array with the specified dimensions.
+        self.current_frame_number = result["frame_number"]
+        if pipeline.camera_thread.is_paused():
+            # No next frame will repaint the ROIs with this step's results
+            self.display_roi(self.frame_model.roi_list)
 
-        Args:
-            frame: The original frame
-            width: Target width
-            height: Target height
+        # Update the velocity plot with the latest data
+        if result["update_velo_plot"]:
+            self.update_velocity_plot()
 
-        Returns:
-            ndarray: Resized frame
-        """
-        return cv2.resize(frame, (width, height))
+        # Update the average velocity label
+        if result["update_average_velo"]:
+            self.update_ave_velo_table()
 
-    def _process_frame_with_model(self, resized_frame):
+    def _update_display_scale(self, frame, scaled_image):
         """
-        Process the frame with the frame model and display ROIs.
+        Record how many canvas pixels one source-frame pixel covers.
 
         Args:
-            resized_frame: The resized frame to process
+            frame: The source frame
+            scaled_image: The frame as scaled onto the canvas
         """
-        self.current_frame_number, roi_list, update_velo_plot, update_average_velo = (
-            self.frame_model.process_frame(resized_frame)
-        )
-        self.display_roi(roi_list)
-
-        # Update the velocity plot with the latest data
-        if update_velo_plot:
-            self.update_velocity_plot()
-
-        # Update the average velocity label
-        if update_average_velo:
-            self.update_ave_velo_table()
+        if frame.shape[1] > 0:
+            self.display_scale = scaled_image.width() / frame.shape[1]
+        if self.overlay_widget:
+            self.overlay_widget.display_scale = self.display_scale
 
     def _display_frame_on_canvas(self, scaled_image):
         """
@@ -957,8 +1087,20 @@ class EventHandler:
         Update status bar with frame information.
         """
         if hasattr(self.gui, "statusBar"):
+            frame_time = self.frame_model.last_processed_time
+            if frame_time is not None:
+                frame_time = format_timestamp(
+                    frame_time, self.camera_thread.time_origin
+                )
+            counts = self.camera_thread.frame_counts()
+            capture_fps, analysis_fps = self.pipeline.rates()
             self.gui.statusBar().showMessage(
-                f"Frame: {self.current_frame_number} | Time: {self.frame_model.last_processed_time}"
+                f"{self.pipeline.name} | Frame: {self.current_frame_number}"
+                f" | Time: {frame_time}"
+                f" | Capture: {capture_fps:.1f} fps | Analysis: {analysis_fps:.1f} fps"
+                f" | Captured: {counts['captured']} | Dropped: {counts['dropped']}"
+                f" | Skipped by analysis: {self.analysis_worker.frames_dropped}"
+                f" | Failed: {self.analysis_worker.frames_failed}"
             )
 
     # ------------------------------------Ruler Drawing------------------------------------------------
@@ -992,7 +1134,9 @@ class EventHandler:
         distance = self.gui.px2mm_spinbox.value()
         print("Spin box value:", distance)
         print("Drawed px:", px)
-        px_ratio = float(px / distance)
+
+        # The ruler is drawn on the canvas; calibrate in source-frame pixels
+        px_ratio = float(px / self.display_scale / distance)
 
         self.frame_model.get_px_to_mm(px_ratio)
         self.gui.px2mm_result_textbox.setText(f"{self.frame_model.px2mm:.1f}")
@@ -1055,12 +1199,12 @@ class EventHandler:
         Args:
             rect: QRect representing the ROI rectangle drawn by the user
         """
-        # Convert the rectangle coordinates to be relative to the video dimensions
-        # This is important for when the video is scaled to fit the canvas
-        video_x = rect.x()
-        video_y = rect.y()
-        video_width = rect.width()
-        video_height = rect.height()
+        # Convert the rectangle from canvas to source-frame coordinates, so the
+        # ROI does not depend on the window size
+        video_x = int(round(rect.x() / self.display_scale))
+        video_y = int(round(rect.y() / self.display_scale))
+        video_width = int(round(rect.width() / self.display_scale))
+        video_height = int(round(rect.height() / self.display_scale))
 
         # Store the ROI coordinates
         roi_coords = video_x, video_y, video_width, video_height
@@ -1096,6 +1240,33 @@ class EventHandler:
             return
         self.overlay_widget.display_roi(roi_list)
 
+    def change_analysis_scale(self):
+        """Apply the analysis scale selected in the GUI to the frame model."""
+        scale = float(self.gui.analysis_scale_combo.currentData())
+        self.frame_model.set_analysis_scale(scale)
+        self.gui.statusBar().showMessage(f"Analysis scale set to {scale:g}x")
+
+    def change_batched_flow(self):
+        """Apply the batched flow options selected in the GUI to the frame model."""
+        gap = self.gui.cluster_gap_spinbox.value()
+        self.frame_model.set_batched_flow(
+            self.gui.batched_flow_checkbox.isChecked(), None if gap < 0 else gap
+        )
+
+    def change_roi_workers(self):
+        """Apply the number of ROI workers selected in the GUI to the frame model."""
+        workers = self.gui.roi_workers_spinbox.value()
+        self.frame_model.set_roi_workers(workers)
+        self.gui.statusBar().showMessage(f"Analysing ROIs on {workers} thread(s)")
+
+    def change_history_limit(self):
+        """Apply the history length selected in the GUI to the frame model."""
+        rows = self.gui.history_limit_combo.currentData()
+        self.frame_model.set_history_limit(rows or None)
+        self.gui.statusBar().showMessage(
+            f"Keeping {self.gui.history_limit_combo.currentText().lower()}"
+        )
+
     def delete_last_roi(self):
         self.frame_model.delete_last_roi()
         self.overlay_widget.update()
@@ -1239,6 +1410,8 @@ class EventHandler:
 
             if success:
                 self.recording_active = True
+                self.recording_pipeline = self.pipeline
+                self.pipeline.recorder = self.video_recorder
                 self.gui.record_button.setText("  Stop Recording")
                 self.gui.record_button.setStyleSheet(
                     "QPushButton {\
@@ -1261,6 +1434,9 @@ class EventHandler:
         else:
             # Stop recording
             success, output_path, frame_count = self.video_recorder.stop_recording()
+            if self.recording_pipeline is not None:
+                self.recording_pipeline.recorder = None
+                self.recording_pipeline = None
 
             if success:
                 self.recording_active = False
@@ -1307,131 +1483,167 @@ class EventHandler:
             return True
 
     def save_data(self):
-        """Save the current analysis data."""
-        self.if_save = self.export.excel_results(
-            self.frame_model.roi_list, self.frame_model.degree, self.frame_model.px2mm
-        )
+        """Save the current analysis data, one file per open source."""
+        pipelines = [p for p in self.pipelines if p.source is not None] or [
+            self.pipeline
+        ]
+        saved = True
+        for pipeline in pipelines:
+            # With several sources, each file is named after its source
+            suffix = ""
+            if len(pipelines) > 1:
+                suffix = "_" + re.sub(r"\W+", "_", pipeline.name).strip("_")
+            saved = (
+                self.export.excel_results(
+                    pipeline.frame_model.roi_list,
+                    pipeline.frame_model.degree,
+                    pipeline.frame_model.px2mm,
+                    pipeline.frame_model.analysis_scale,
+                    pipeline.camera_thread.time_origin,
+                    pipeline.frame_counts(),
+                    suffix,
+                )
+                and saved
+            )
+        self.if_save = saved
 
     # ------------------------------------Plotting Functions------------------------------------------
     def update_velocity_plot(self):
         """Update the velocity plot with data from all ROIs.
 
-        This method extracts velocity history data from each ROI in the frame_model's roi_list
-        and plots it on the plot_widget. Each ROI's velocity history is plotted as a separate
-        line with a different color and labeled in the legend.
+        This method reads the velocity history of each ROI in the frame_model's roi_list
+        over the time span chosen in the plot span combo box and plots it on the
+        plot_widget. Each ROI's velocity history is plotted as a separate line with a
+        different color and labeled in the legend.
 
-        The plot displays a fixed window of 30 elements (3 seconds) with new data appearing
-        from the right edge and older data scrolling to the left. When the history exceeds
-        30 elements, the oldest elements are removed to maintain the fixed window size.
-        """
-        # Clear the plot widget
-        self.gui.plot_widget.clear()
+        The x-axis shows the seconds before the most recent velocity, so new data
+        appears at the right edge. Short spans show every velocity; longer spans are
+        read from the 1 s, 1 min or 1 h rollups so the plot stays fast however long
+        the session has run.
 
-        # Check if there are any ROIs to plot
-        if not self.frame_model.roi_list:
-            return
-
-        # Define a list of colors for different ROIs
-        colors = [
-            "r",
-            "g",
-            "b",
-            "c",
-            "m",
-            "y",
-            "w",
-        ]  # Red, green, blue, cyan, magenta, yellow, white
-
-        # Fixed window size (3 seconds)
-        WINDOW_SIZE = 30
-
-        # Find the maximum velocity across all ROIs for y-axis scaling
-        max_velocity = 0
-        if self.frame_model.roi_list and any(
-            roi.velo_only_history for roi in self.frame_model.roi_list
-        ):
-            max_velocity = max(
-                max(roi.velo_only_history) if roi.velo_only_history else 0
-                for roi in self.frame_model.roi_list
-            )
+        Each ROI keeps one curve, whose data is replaced with `setData`. The
+        y-axis follows the highest velocity on the plot, found among the points
+        added since the last update; the whole span is only searched again when
+        that peak scrolls out of it, or the span or the ROIs change.
 
-        # Plot velocity history for each ROI
-        for i, roi in enumerate(self.frame_model.roi_list):
-            # Skip if no velocity history
-            if not roi.velo_only_history:
+        The histories are read under the frame model's lock, as the analysis
+        worker appends to them; the queries return copies to plot afterwards.
+        """
+        # Time span to display, in seconds
+        span = self.gui.plot_span_combo.currentData() or 30.0
+
+        with self.frame_model.lock:
+            roi_list = list(self.frame_model.roi_list)
+            latest = [
+                roi.velo_only_history.latest
+                for roi in roi_list
+                if roi.velo_only_history.latest is not None
+            ]
+            series_list = [roi.velo_only_history.query(span) for roi in roi_list]
+
+        self._sync_velocity_curves(roi_list)
+        if not latest:
+            return
+        now = max(latest)
+
+        # Points up to the time of the last update were already looked at
+        since = None
+        if self.velocity_plot_state is not None and self.velocity_plot_state[0] == span:
+            since = self.velocity_plot_state[1]
+        if self.velocity_peak is not None and self.velocity_peak[1] < now - span:
+            since = None  # The peak scrolled out of the plot
+        if since is None:
+            self.velocity_peak = None
+        self.velocity_plot_state = (span, now)
+
+        peak = self.velocity_peak
+        for roi, series in zip(roi_list, series_list):
+            timestamps = series["timestamp"]
+            self.velocity_curves[roi].setData(timestamps - now, series["mean"])
+            if not len(timestamps):
                 continue
 
-            # Get color for this ROI (cycle through colors if more ROIs than colors)
-            color = colors[i % len(colors)]
-
-            # Get the velocity history data
-            history = roi.velo_only_history
-
-            # Limit history to the most recent WINDOW_SIZE elements
-            if len(history) > WINDOW_SIZE:
-                history = history[-WINDOW_SIZE:]
-
-            # Create a fixed-size array for display (30 elements)
-            display_data = [None] * WINDOW_SIZE
-
-            # Position the data at the right side of the display
-            # For example, if we have 5 elements, they go in positions 25-29 (0-indexed)
-            start_pos = WINDOW_SIZE - len(history)
-            for j, value in enumerate(history):
-                display_data[start_pos + j] = value
-
-            # Create x-axis data (fixed range from 0 to WINDOW_SIZE-1)
-            x_data = list(range(WINDOW_SIZE))
-
-            # Create y-axis data with None values filtered out for plotting
-            # (pyqtgraph will skip None values when plotting)
-            plot_x = []
-            plot_y = []
-            for x, y in zip(x_data, display_data):
-                if y is not None:
-                    plot_x.append(x)
-                    plot_y.append(y)
-
-            # Add the plot with a label for the legend
-            if plot_x and plot_y:  # Only plot if we have data
-                self.gui.plot_widget.plot(
-                    plot_x, plot_y, pen=color, name=f"ROI {i + 1}"
+            # The newest point is always looked at: a rollup bucket grows in place
+            start = 0
+            if since is not None:
+                start = min(
+                    int(np.searchsorted(timestamps, since, side="right")),
+                    len(timestamps) - 1,
                 )
+            index = start + int(np.argmax(series["max"][start:]))
+            if peak is None or series["max"][index] > peak[0]:
+                peak = (float(series["max"][index]), float(timestamps[index]))
+        self.velocity_peak = peak
 
-        # Set fixed x-axis range (0 to WINDOW_SIZE-1)
-        self.gui.plot_widget.setXRange(0, WINDOW_SIZE - 1)
+        # Set the x-axis range to the chosen span
+        self.gui.plot_widget.setXRange(-span, 0)
 
         # Set appropriate y-axis range if there's data
-        if max_velocity > 0:
+        if peak is not None and peak[0] > 0:
             # Add some padding to the top of the y-axis
-            self.gui.plot_widget.setYRange(0, max_velocity * 1.1)
+            self.gui.plot_widget.setYRange(0, peak[0] * 1.1)
 
-        # Update the plot
-        self.gui.plot_widget.update()
+    def _sync_velocity_curves(self, roi_list: list[ROI]) -> None:
+        """
+        Give every ROI a curve on the velocity plot and remove the curves of ROIs
+        that are gone, e.g. deleted or of another source.
+
+        Args:
+            roi_list: The ROIs of the selected source.
+        """
+        if list(self.velocity_curves) == roi_list:
+            return
+
+        for roi in list(self.velocity_curves):
+            if roi not in roi_list:
+                self.gui.plot_widget.removeItem(self.velocity_curves.pop(roi))
+        for i, roi in enumerate(roi_list):
+            if roi not in self.velocity_curves:
+                # 7 hues in 3 shades, dark enough to read on the white background
+                color = pg.intColor(i, hues=7, values=3, minValue=110, maxValue=230)
+                self.velocity_curves[roi] = self.gui.plot_widget.plot(
+                    pen=pg.mkPen(color, width=1.5), name=f"ROI {i + 1}"
+                )
+        # Keep the curves in ROI order, and look at all points again
+        self.velocity_curves = {roi: self.velocity_curves[roi] for roi in roi_list}
+        self.velocity_plot_state = None
+        self.velocity_peak = None
+
+    def _clear_velocity_plot(self) -> None:
+        """
+        Remove every curve from the velocity plot.
+        """
+        self.gui.plot_widget.clear()
+        self.velocity_curves = {}
+        self.velocity_plot_state = None
+        self.velocity_peak = None
 
     def update_ave_velo_table(self):
-        """Update the average velocity table with data from all ROIs."""
+        """Update the velocity statistics table with data from all ROIs.
+
+        Each row holds the mean, standard deviation, minimum and maximum
+        velocity of one ROI over one window. The ROIs keep these statistics
+        up to date as velocities arrive, so they are only read here.
+        """
         # Clear the table
         self.gui.table_widget.clear()
-        self.gui.table_widget.setRowCount(len(self.frame_model.roi_list))
 
         list_data = []
-        # Add data to the table
-        for i, roi in enumerate(self.frame_model.roi_list):
-            # Skip if no velocity history
-            if roi.average_velocity_past_30s is None:
-                list_data.append("N/A")
-                continue
-
-            print(list_data)
-            # Add average velocity to the table
-            list_data.append(roi.average_velocity_past_30s)
+        row_labels = []
+        # The analysis worker updates the statistics under the same lock
+        with self.frame_model.lock:
+            for i, roi in enumerate(self.frame_model.roi_list):
+                for duration, window in roi.velocity_stats.windows.items():
+                    row_labels.append(f"ROI {i + 1} {format_duration(duration)}")
+                    # NaN is shown for statistics that need more velocities
+                    list_data.append([window.mean, window.std, window.min, window.max])
 
         self.gui.table_widget.setData(list_data)
-        self.gui.table_widget.setHorizontalHeaderLabels(["mean_velocity  "])
+        self.gui.table_widget.setHorizontalHeaderLabels(STATS_COLUMNS)
+        self.gui.table_widget.setVerticalHeaderLabels(row_labels)
         self.gui.table_widget.setFormat("%.2f")
-        self.gui.table_widget.setColumnWidth(0, 120)
-        # self.table_widget.setColumnWidth(1, 100)
+        for column in range(len(STATS_COLUMNS)):
+            self.gui.table_widget.setColumnWidth(column, 60)
         self.gui.table_widget.setFixedHeight(200)
 
 
@@ -25,6 +25,13 @@ Imports:
     For timestamp generation and date manipulation.
 - openpyxl.Workbook:
     For creating and saving Excel files.
+- csv:
+    For writing flat CSV files.
+
+The data collection and file writing are also available as the module-level
+functions `collect_export_data`, `write_workbook` and `write_movement_csv`,
+which need no GUI and are used by the offline analysis. Frames are timestamped
+in seconds; `format_timestamp` turns them into readable times at export.
 """
 
 from PySide6.QtWidgets import (
@@ -43,6 +50,17 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont
 from datetime import datetime
 from openpyxl import Workbook
+import csv
+
+# Per-frame columns written for every ROI
+MOVEMENT_COLUMNS = [
+    "Frame Index",
+    "Timestamp",
+    "delta_pixels_x(px/frame)",
+    "delta_pixels_y(px/frame)",
+    "calibrated_delta(px/frame)",
+    "Velocity(mm/s)",
+]
 
 
 class Export(QFileDialog):
@@ -420,9 +438,21 @@ class Export(QFileDialog):
         self.finish_save_setting = True
         dialog.accept()
 
-    def excel_results(self, rois: list, arrow_angle: float, px2mm: float) -> bool:
+    def excel_results(
+        self,
+        rois: list,
+        arrow_angle: float,
+        px2mm: float,
+        analysis_scale: float = 1.0,
+        time_origin: float | None = None,
+        frame_counts: dict[str, int] | None = None,
+        suffix: str = "",
+    ) -> bool:
         """
         Handles exporting data for the program.
+
+        `suffix` is appended to the export filename, e.g. to tell the files of
+        several cameras apart.
         """
         try:
             # Check if export directory and filename are set
@@ -435,10 +465,14 @@ class Export(QFileDialog):
                 return False
 
             # Prepare the full file path
-            file_path_csv = f"{self.export_directory}/{self.export_filename}.csv"
+            file_path_csv = (
+                f"{self.export_directory}/{self.export_filename}{suffix}.csv"
+            )
 
             # Step 1: Collect data
-            export_data = self.collect_export_data(rois, arrow_angle, px2mm)
+            export_data = self.collect_export_data(
+                rois, arrow_angle, px2mm, analysis_scale, time_origin, frame_counts
+            )
 
             # Step 2: Write to both CSV and JSON
             self.write_csv(file_path_csv, export_data)
@@ -456,112 +490,198 @@ class Export(QFileDialog):
             )
             return False
 
-    def collect_export_data(self, rois: list, arrow_angle: float, px2mm: float) -> dict:
+    def collect_export_data(
+        self,
+        rois: list,
+        arrow_angle: float,
+        px2mm: float,
+        analysis_scale: float = 1.0,
+        time_origin: float | None = None,
+        frame_counts: dict[str, int] | None = None,
+    ) -> dict:
         """
         Collects and structures export data from the given regions of interest (ROIs).
 
-        This function processes the ROI data by iterating over each ROI and its frame
-        data, calculating the average velocity, and organizing the information into
-        a structured dictionary format. The arrow direction is converted from radians
-        to degrees and included in the export data.
+        See the module-level `collect_export_data`, which does not need a GUI.
+        """
+        return collect_export_data(
+            rois, arrow_angle, px2mm, analysis_scale, time_origin, frame_counts
+        )
 
-        Args:
-            rois (list): A list of ROIs, each containing an analysis module with
-                frame-level results including velocity and timestamp.
-            arrow_angle (float): The direction of the arrow in radians.
-
-        Returns:
-            dict: A dictionary containing the arrow direction in degrees and an
-            organized list of ROI data with movement data, including frame index,
-            velocity, timestamp, and average velocity.
+    def write_csv(self, file_path: str, data: dict) -> None:
+        """
+        Writes the export data to an Excel file, with each ROI in a separate sheet.
+
+        See the module-level `write_workbook`.
         """
+        write_workbook(file_path, data)
+
+
+def format_timestamp(seconds: float, time_origin: float | None = None) -> str:
+    """
+    Format a frame timestamp as a readable time.
+
+    Args:
+        seconds (float): The timestamp of the frame in seconds.
+        time_origin (float | None): The Unix time of timestamp 0, for frames
+            timestamped with a monotonic clock. None formats the timestamp as
+            elapsed time, which is the video time for video files.
 
-        data = {
-            "Arrow Direction": arrow_angle,  # Convert to degrees
-            "Pixels per mm": px2mm,
-            "roi_data": [],
+    Returns:
+        str: "HH:MM:SS.mmm", as wall-clock time or elapsed time.
+    """
+    if time_origin is not None:
+        return datetime.fromtimestamp(time_origin + seconds).strftime("%H:%M:%S.%f")[
+            :-3
+        ]
+
+    milliseconds = int(round(seconds * 1000))
+    whole, milliseconds = divmod(milliseconds, 1000)
+    return f"{whole // 3600:02d}:{whole // 60 % 60:02d}:{whole % 60:02d}.{milliseconds:03d}"
+
+
+def collect_export_data(
+    rois: list,
+    arrow_angle: float,
+    px2mm: float,
+    analysis_scale: float = 1.0,
+    time_origin: float | None = None,
+    frame_counts: dict[str, int] | None = None,
+) -> dict:
+    """
+    Collects and structures export data from the given regions of interest (ROIs).
+
+    This function processes the ROI data by iterating over each ROI and its frame
+    data, calculating the average velocity, and organizing the information into
+    a structured dictionary format. The arrow direction is converted from radians
+    to degrees and included in the export data.
+
+    Args:
+        rois (list): A list of ROIs, each containing an analysis module with
+            frame-level results including velocity and timestamp.
+        arrow_angle (float): The direction of the arrow in radians.
+        px2mm (float): Source-frame pixels per mm.
+        analysis_scale (float): The resolution the frames were analysed at,
+            relative to the source frame. delta_pixels are in analysis pixels.
+        time_origin (float | None): The Unix time of timestamp 0, passed to
+            `format_timestamp`.
+        frame_counts (dict[str, int] | None): Labelled counts of captured,
+            dropped and analysed frames, which explain gaps in the data.
+
+    Returns:
+        dict: A dictionary containing the arrow direction in degrees and an
+        organized list of ROI data with movement data, including frame index,
+        velocity, timestamp, and average velocity.
+    """
+
+    data = {
+        "Arrow Direction": arrow_angle,  # Convert to degrees
+        "Pixels per mm": px2mm,
+        "Analysis scale": analysis_scale,
+        "Frame counts": dict(frame_counts or {}),
+        "roi_data": [],
+    }
+
+    for i, roi in enumerate(rois):
+        roi_data = {
+            "ROI Index": i + 1,
+            "Movement Data": [],
         }
 
-        for i, roi in enumerate(rois):
-            roi_data = {
-                "ROI Index": i + 1,
-                "Movement Data": [],
-            }
+        # Read whole columns at once; dropped rows keep their frame numbers
+        history = roi.delta_history
+        first_index = history.dropped + 1
+        columns = zip(
+            history["timestamp"].tolist(),
+            history["dx"].tolist(),
+            history["dy"].tolist(),
+            history["calibrated"].tolist(),
+            history["velocity"].tolist(),
+        )
 
-            for frame_index, frame_data in enumerate(roi.delta_history):
-                timestamp = frame_data[0]
-                delta_pixels = frame_data[1]
-                calibrated_delta = frame_data[2]
-                velocity = frame_data[3]
-
-                # print("frame_index: ", frame_index + 1)
-                # print("delta_pixels: ", delta_pixels)
-                # print("calibrated_delta: ", calibrated_delta)  # Print the calibrated_delta element
-                # print("Velocity: ", velocity)
-                # print("timestamp: ", timestamp)
-                # print("\n")
-
-                roi_data["Movement Data"].append(
-                    {
-                        "Frame Index": frame_index + 1,
-                        "Timestamp": timestamp,
-                        "delta_pixels_x(px/frame)": delta_pixels[0],
-                        "delta_pixels_y(px/frame)": delta_pixels[1],
-                        "calibrated_delta(px/frame)": calibrated_delta,
-                        "Velocity(mm/s)": velocity,
-                    }
-                )
+        for frame_index, (
+            timestamp,
+            delta_x,
+            delta_y,
+            calibrated_delta,
+            velocity,
+        ) in enumerate(columns, first_index):
+            roi_data["Movement Data"].append(
+                {
+                    "Frame Index": frame_index,
+                    "Timestamp": format_timestamp(timestamp, time_origin),
+                    "delta_pixels_x(px/frame)": delta_x,
+                    "delta_pixels_y(px/frame)": delta_y,
+                    "calibrated_delta(px/frame)": calibrated_delta,
+                    # NaN marks frames that did not close a velocity window
+                    "Velocity(mm/s)": None if velocity != velocity else velocity,
+                }
+            )
 
-            data["roi_data"].append(roi_data)
+        data["roi_data"].append(roi_data)
 
-        return data
+    return data
 
-    def write_csv(self, file_path: str, data: dict) -> None:
-        """
-        Writes the export data to an Excel file, with each ROI in a separate sheet.
-        """
 
-        wb = Workbook()
+def write_workbook(file_path: str, data: dict) -> None:
+    """
+    Writes the export data to an Excel workbook, with each ROI in a separate sheet.
 
-        # Add the arrow direction in the first sheet
-        # arrow_sheet = wb.active
-        first_sheet = wb.active
+    Args:
+        file_path (str): The path of the workbook to write.
+        data (dict): The export data from `collect_export_data`.
+    """
 
-        first_sheet.title = "Calibration Data"  # pyright: ignore
-        first_sheet.append(["Arrow Direction"])  # pyright: ignore
-        first_sheet.append([data["Arrow Direction"]])  # pyright: ignore
-        first_sheet.append(["Pixels per mm"])  # pyright: ignore
-        first_sheet.append([data["Pixels per mm"]])  # pyright: ignore
+    wb = Workbook()
 
-        # Create separate sheets for each ROI
-        for roi in data["roi_data"]:
-            sheet_name = f"ROI {roi['ROI Index']}"
-            ws = wb.create_sheet(title=sheet_name)
-
-            # Add headers
-            ws.append(
-                [
-                    "Frame Index",
-                    "Timestamp",
-                    "delta_pixels_x(px/frame)",
-                    "delta_pixels_y(px/frame)",
-                    "calibrated_delta(px/frame)",
-                    "Velocity(mm/s)",
-                ]
-            )
+    # Add the arrow direction in the first sheet
+    # arrow_sheet = wb.active
+    first_sheet = wb.active
+
+    first_sheet.title = "Calibration Data"  # pyright: ignore
+    first_sheet.append(["Arrow Direction"])  # pyright: ignore
+    first_sheet.append([data["Arrow Direction"]])  # pyright: ignore
+    first_sheet.append(["Pixels per mm"])  # pyright: ignore
+    first_sheet.append([data["Pixels per mm"]])  # pyright: ignore
+    first_sheet.append(["Analysis scale"])  # pyright: ignore
+    first_sheet.append([data["Analysis scale"]])  # pyright: ignore
+    for label, count in data.get("Frame counts", {}).items():
+        first_sheet.append([label])  # pyright: ignore
+        first_sheet.append([count])  # pyright: ignore
 
-            # Add movement data
+    # Create separate sheets for each ROI
+    for roi in data["roi_data"]:
+        sheet_name = f"ROI {roi['ROI Index']}"
+        ws = wb.create_sheet(title=sheet_name)
+
+        # Add headers
+        ws.append(MOVEMENT_COLUMNS)
+
+        # Add movement data
+        for movement in roi["Movement Data"]:
+            ws.append([movement[column] for column in MOVEMENT_COLUMNS])
+
+    # Save the workbook
+    wb.save(file_path)
+
+
+def write_movement_csv(file_path: str, data: dict) -> None:
+    """
+    Writes the movement data of all ROIs to one flat CSV file.
+
+    Each row holds the ROI index followed by the `MOVEMENT_COLUMNS` of one
+    frame. The calibration values are not repeated on every row.
+
+    Args:
+        file_path (str): The path of the CSV file to write.
+        data (dict): The export data from `collect_export_data`.
+    """
+    with open(file_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["ROI Index"] + MOVEMENT_COLUMNS)
+        for roi in data["roi_data"]:
             for movement in roi["Movement Data"]:
-                ws.append(
-                    [
-                        movement["Frame Index"],
-                        movement["Timestamp"],
-                        movement["delta_pixels_x(px/frame)"],
-                        movement["delta_pixels_y(px/frame)"],
-                        movement["calibrated_delta(px/frame)"],
-                        movement["Velocity(mm/s)"],
-                    ]
+                writer.writerow(
+                    [roi["ROI Index"]]
+                    + [movement[column] for column in MOVEMENT_COLUMNS]
                 )
-
-        # Save the workbook
-        wb.save(file_path)
@@ -12,7 +12,11 @@ FrameModel
 
 Imports:
 --------
-- cv2 (OpenCV): For image processing operations.
+- froth_monitor.image_analysis: For the per-ROI optical flow.
+- froth_monitor.history: For the columnar per-frame histories.
+- froth_monitor.rolling_stats: For the multi-window velocity statistics.
+- froth_monitor.rollup: For the multi-resolution velocity history.
+- concurrent.futures: For analysing ROIs on a thread pool.
 - numpy: For numerical operations on frame data.
 - datetime: For timestamp generation.
 
@@ -33,60 +37,239 @@ print(f"Processing frame {frame_number}")
 ```
 """
 
+import cv2
 import numpy as np
+import os
+import threading
 import time
-import cv2
-from typing import cast
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar, cast
 from datetime import datetime
-from PySide6.QtCore import QRect
-from froth_monitor.image_analysis import VideoAnalysis
+from froth_monitor.estimators import available_estimators, get_estimator_class
+from froth_monitor.history import ColumnarHistory
+from froth_monitor.rolling_stats import DEFAULT_WINDOWS, RollingStats
+from froth_monitor.rollup import RollupStore
+from froth_monitor.image_analysis import (
+    VideoAnalysis,
+    cluster_rois,
+    scale_frame,
+    to_gray,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Per-frame ROI history; velocity is NaN on frames that do not close a window
+DELTA_COLUMNS = {
+    "timestamp": np.float64,
+    "dx": np.float32,
+    "dy": np.float32,
+    "calibrated": np.float64,
+    "velocity": np.float64,
+}
+
+# One row per processed frame
+FRAME_COLUMNS = {"frame_number": np.int64, "timestamp": np.float64}
+
+
+def opencv_thread_count(pool_workers: int, cpu_count: int | None = None) -> int:
+    """
+    Return how many threads OpenCV should use next to a pool of ROI workers.
+
+    OpenCV parallelises some functions internally. Running several of them at
+    once from a thread pool, each with a full set of OpenCV threads, would
+    oversubscribe the cores, so the cores are split between the pool workers.
+
+    Parameters
+    ----------
+    pool_workers : int
+        The number of threads analysing ROIs concurrently.
+    cpu_count : int | None
+        The number of cores, or None to ask the operating system.
+
+    Returns
+    -------
+    int
+        The thread count to pass to `cv2.setNumThreads`.
+    """
+    cores = cpu_count or os.cpu_count() or 1
+    return max(1, cores // max(1, pool_workers))
+
+
+# The ROI workers of every frame model analysing frames in this process. OpenCV's
+# thread count is process-wide, so it is set from their total
+_roi_workers: "weakref.WeakKeyDictionary[FrameModel, int]" = weakref.WeakKeyDictionary()
+_roi_workers_lock = threading.Lock()
+
+# The cores this process may use, or None for all of them
+_core_budget: int | None = None
+
+
+def total_roi_workers() -> int:
+    """
+    Return the number of ROI workers of all frame models in this process.
+    """
+    with _roi_workers_lock:
+        return sum(_roi_workers.values())
+
+
+def set_core_budget(cores: int | None) -> None:
+    """
+    Set how many cores the frame models of this process share, e.g. in one of
+    several worker processes, and apply the OpenCV thread count.
+
+    Parameters
+    ----------
+    cores : int | None
+        The number of cores, or None for all of them.
+    """
+    global _core_budget
+    _core_budget = cores
+    apply_opencv_threads()
+
+
+def apply_opencv_threads() -> None:
+    """
+    Split the cores of this process between the ROI workers of all frame models
+    and set OpenCV's thread count accordingly.
+    """
+    cv2.setNumThreads(opencv_thread_count(total_roi_workers(), _core_budget))
 
 
 class ROI:
-    def __init__(self, roi_coordinate: QRect, px2mm, degree) -> None:
+    def __init__(
+        self,
+        roi_coordinate: tuple[int, int, int, int],
+        px2mm,
+        degree,
+        analysis_scale: float = 1.0,
+        velocity_window: float = 1.0,
+        history_limit: int | None = None,
+        stats_windows: tuple[float, ...] = DEFAULT_WINDOWS,
+    ) -> None:
+        # (x, y, width, height) in source-frame pixels
         self.coordinate = roi_coordinate
         self.analysis = VideoAnalysis(0, 0)
 
         self.delta_pixels = (cast(float, None), cast(float, None))
         self.cross_position = None
 
-        self.delta_history = []
+        # Per-frame results; at most history_limit rows are kept if one is set
+        self.delta_history = ColumnarHistory(DELTA_COLUMNS, capacity=history_limit)
         self.arrow_dir = 0.0
         self.px2mm = px2mm
-        self.mm2px = 1 / px2mm
         self.degree = degree
-
-        # Initialize timestamp
-        self.timestamp = time.strftime("%H:%M:%S", time.localtime())
-        self.timestamp_buffer = self.timestamp
+        self.set_analysis_scale(analysis_scale)
+
+        # Capture time of the last frame in seconds, and the velocity window
+        # that started at window_start and has moved window_displacement mm so far
+        self.timestamp: float | None = None
+        self.velocity_window = velocity_window
+        self.window_start: float | None = None
+        self.window_displacement = 0.0
         self.current_velocity = 0.0
-        self.velo_only_history = []
+        # Recent velocities plus 1 s / 1 min / 1 h rollups, in bounded memory
+        self.velo_only_history = RollupStore()
+
+        # Mean, std, min and max of the velocities over each window length
+        self.velocity_stats = RollingStats(stats_windows)
+
+    def set_analysis_scale(self, analysis_scale: float) -> None:
+        """
+        Set the scale of the frames the ROI is analysed on.
+
+        Displacements are measured in analysis pixels, so the calibration is
+        adjusted to match: at a scale of 0.5, one mm spans half as many pixels.
+        The cached previous frame has the old size and is dropped.
 
-        self.average_velocity_past_30s = cast(float, None)
+        Parameters
+        ----------
+        analysis_scale : float
+            The analysis resolution relative to the source frame.
+        """
+        self.analysis_scale = analysis_scale
+        self.mm2px = 1 / (self.px2mm * analysis_scale)
+        self.analysis.previous_frame = None
 
-    def process_frame(self, frame: np.ndarray) -> tuple[bool, bool]:
+    def analysis_rect(self) -> tuple[int, int, int, int]:
+        """
+        Return the ROI rectangle in the coordinates of the analysis frame.
+
+        Returns
+        -------
+        tuple[int, int, int, int]
+            The (x, y, width, height) of the ROI on the scaled frame.
+        """
+        x, y, width, height = self.coordinate[:4]
+        scale = self.analysis_scale
+        return (
+            int(round(x * scale)),
+            int(round(y * scale)),
+            max(1, int(round(width * scale))),
+            max(1, int(round(height * scale))),
+        )
+
+    def process_frame(
+        self, frame: np.ndarray, timestamp: float | None = None
+    ) -> tuple[bool, bool]:
         """
         Process a cropped frame using the VideoAnalysis.analyze function and store the results.
 
         Parameters
         ----------
         frame : np.ndarray
-            The cropped video frame to process.
+            The cropped video frame to process, either gray or BGR.
+        timestamp : float | None
+            The capture time of the frame in seconds, or None to use the
+            monotonic clock.
         """
 
-        self.delta_pixels = self.analysis.analyze(frame)
+        return self.record_delta(self.analysis.analyze(frame), timestamp)
+
+    def record_delta(
+        self, delta_pixels: tuple[float, float], timestamp: float | None = None
+    ) -> tuple[bool, bool]:
+        """
+        Store a per-frame displacement and update the velocity bookkeeping.
+
+        This is the part of `process_frame` that follows the optical flow, so
+        callers that estimate the displacement themselves (e.g. the batched flow
+        in `FrameModel`) can feed the result in directly.
+
+        Parameters
+        ----------
+        delta_pixels : tuple[float, float]
+            The mean (dx, dy) displacement of the ROI in pixels, or (None, None)
+            if no estimate is available yet.
+        timestamp : float | None
+            The capture time of the frame in seconds, or None to use the
+            monotonic clock. Velocities are measured between these timestamps,
+            so video files pass their media time here.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.timestamp = timestamp
+        self.delta_pixels = delta_pixels
 
         if self.delta_pixels == (None, None):
+            # No displacement yet; the velocity window starts at this frame
+            self.window_start = timestamp
+            self.window_displacement = 0.0
             return False, False
 
         self.calibrated_delta = self.calculate_real_delta(self.delta_pixels)
 
-        # Update timestamp
-        self.timestamp = time.strftime("%H:%M:%S", time.localtime())
         if_new_velo = self.calculate_velocity(self.calibrated_delta)
-        if_new_average = self.calculate_average_velocity()
+        if_new_average = False
+        if if_new_velo:
+            if_new_average = self.calculate_average_velocity()
         self.delta_history.append(
-            [self.timestamp, self.delta_pixels, self.calibrated_delta, None]
+            self.timestamp,
+            self.delta_pixels[0],
+            self.delta_pixels[1],
+            self.calibrated_delta,
+            self.current_velocity if if_new_velo else np.nan,
         )
 
         return if_new_velo, if_new_average
@@ -130,37 +313,58 @@ class ROI:
         return projection_mm
 
     def calculate_velocity(self, delta) -> bool:
-        if self.timestamp == self.timestamp_buffer:
-            self.current_velocity += delta
-            return False
+        """
+        Add a frame's displacement to the velocity window and close the window
+        once it spans `velocity_window` seconds.
 
-        else:
-            self.timestamp_buffer = self.timestamp
+        Each displacement covers the interval since the previous analysed frame,
+        so the window's displacement divided by its real duration is the
+        velocity, however many frames were analysed or skipped in between.
 
-            # if len(self.delta_history) == 1:
-            #     self.delta_history[0][-1] = self.current_velocity
-            # else:
-            if len(self.delta_history) > 1:
-                self.delta_history[-1][-1] = self.current_velocity
+        Parameters
+        ----------
+        delta : float
+            The calibrated displacement of the frame in mm.
 
-            self.velo_only_history.append(self.current_velocity)
-            self.current_velocity = delta
-            return True
+        Returns
+        -------
+        bool
+            True if the window was closed and a new velocity was recorded.
+        """
+        # Only reached from record_delta, which has set the timestamp
+        timestamp = cast(float, self.timestamp)
+        if self.window_start is None or timestamp < self.window_start:
+            # No reference frame, or the clock restarted (e.g. a replayed video)
+            self.window_start = timestamp
+            self.window_displacement = 0.0
+            return False
 
-    def calculate_average_velocity(self) -> bool:
-        if len(self.velo_only_history) % 30 == 0:  # Average velocity every 30 seconds
-            sum_last_30 = sum(self.velo_only_history[-30:])
-            self.average_velocity_past_30s = sum_last_30 / 30
-            return True
-        else:
+        self.window_displacement += delta
+        elapsed = timestamp - self.window_start
+        if elapsed < self.velocity_window:
             return False
 
-    def get_algorithm_n_params(self, algorithm: str, params:dict):
-        self.analysis.current_algorithm = algorithm
-        if algorithm == "Farneback":
-            self.analysis.of_params = params
-        elif algorithm == "Lucas-kanade":
-            self.analysis.lk_params = params
+        self.current_velocity = self.window_displacement / elapsed
+        self.velo_only_history.add(timestamp, self.current_velocity)
+        self.window_start = timestamp
+        self.window_displacement = 0.0
+        return True
+
+    def calculate_average_velocity(self) -> bool:
+        """
+        Add the new velocity to the rolling statistics of every window.
+
+        Returns
+        -------
+        bool
+            True, as the statistics change with every velocity.
+        """
+        self.velocity_stats.add(cast(float, self.timestamp), self.current_velocity)
+        return True
+
+    def get_algorithm_n_params(self, algorithm: str, params: dict):
+        self.analysis.set_algorithm(algorithm, params)
+
 
 class FrameModel:
     """
@@ -174,10 +378,43 @@ class FrameModel:
     ----------
     frame_count : int
         Counter for the number of frames processed.
-    frame_history : list
-        Stores information about processed frames.
-    last_processed_time : datetime
-        Timestamp of the last processed frame.
+    frame_history : ColumnarHistory
+        The number and timestamp of every processed frame.
+    history_limit : int | None
+        The maximum number of rows kept in each history, for unattended runs.
+        None keeps the whole session. Set it with `set_history_limit`.
+    stats_windows : tuple[float, ...]
+        The lengths in seconds of the windows the velocity statistics of each
+        ROI are kept over.
+    previous_gray_frame : np.ndarray
+        The gray version of the last processed frame.
+    batched_flow : bool
+        If True, dense flow is computed once per cluster of nearby ROIs instead of
+        once per ROI (dense algorithms only).
+    cluster_gap : int | None
+        Maximum gap in pixels between ROIs that share a flow computation in batched
+        mode. None computes a single flow field over the union of all ROIs.
+    analysis_scale : float
+        The resolution frames are analysed at, relative to the source frame. Frames
+        are resized once with area interpolation; ROIs stay in source coordinates.
+    verbose : bool
+        Whether to print the processing time of every frame.
+    roi_workers : int
+        The number of threads that analyse ROIs (or ROI clusters) concurrently.
+        1 analyses them one after another on the calling thread. The models
+        that set it share the cores with OpenCV's threads, see `set_roi_workers`.
+    algorithm_list : list[str]
+        The names of the registered optical-flow estimators.
+    algorithm_params : dict[str, dict]
+        The parameters chosen for each estimator, filled with the estimator's
+        defaults on first use.
+    velocity_window : float
+        The span in seconds over which each ROI velocity is measured.
+    last_processed_time : float | None
+        Capture timestamp of the last processed frame, in seconds.
+    lock : threading.RLock
+        Held while a frame is processed and while the ROIs or the algorithm are
+        changed, so the analysis can run in a worker thread.
 
     Methods:
     -------
@@ -187,7 +424,7 @@ class FrameModel:
         Processes a video frame and returns its sequence number and the processed frame.
     get_frame_count() -> int
         Returns the total number of frames processed.
-    get_frame_history() -> list
+    get_frame_history() -> ColumnarHistory
         Returns the history of processed frames.
     get_current_time() -> str
         Returns the current timestamp in the format "dd/mm/yyyy HH:MM:SS.sss".
@@ -198,31 +435,35 @@ class FrameModel:
         Initialize the FrameModel with default values.
         """
         self.frame_count = 0
-        self.frame_history = []
+        self.history_limit: int | None = None
+        self.frame_history = ColumnarHistory(FRAME_COLUMNS, capacity=self.history_limit)
 
         self.roi_list = []
-        self.last_processed_time = None
+        self.last_processed_time: float | None = None
+        self.previous_gray_frame: np.ndarray | None = None
+        self.lock = threading.RLock()
+
+        # Batched optical flow over clusters of nearby ROIs
+        self.batched_flow = False
+        self.cluster_gap: int | None = 16
+        self.cluster_analyses: dict[tuple[int, int, int, int], VideoAnalysis] = {}
+
+        self.verbose = True
+
+        # Concurrent per-ROI analysis; the executor is created on first use
+        self.roi_workers = 1
+        self.executor: ThreadPoolExecutor | None = None
 
         self.px2mm = 1.0
         self.degree = -90.0
+        self.analysis_scale = 1.0
+        self.velocity_window = 1.0
+        self.stats_windows: tuple[float, ...] = DEFAULT_WINDOWS
 
         # Algorithm parameters
         self.current_algorithm = "Farneback"
-        self.algorithm_list = ["Farneback", "Lucas-Kanade"]
-        self.lk_params = dict(
-            winSize=(15, 15),
-            maxLevel=2,
-            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
-        )
-
-        self.of_params = dict(
-            pyr_scale=0.5,
-            levels=int(3),
-            winsize=int(15),
-            iterations=int(3),
-            poly_n=int(7),
-            poly_sigma=1.5,
-        )
+        self.algorithm_list = available_estimators()
+        self.algorithm_params: dict[str, dict] = {}
 
     def confirm_algorithm_n_params(self, algorithm: str, params: dict) -> None:
         """
@@ -236,25 +477,28 @@ class FrameModel:
             The parameters for the optical flow algorithm.
         """
 
-        self.current_algorithm = algorithm
-        if algorithm == "Farneback":
-            self.of_params = params
-        elif algorithm == "Lucas-Kanade":
-            self.lk_params = params
+        with self.lock:
+            self.current_algorithm = algorithm
+            self.algorithm_params[algorithm] = params
 
-        self.algo_roi.get_algorithm_n_params(self.current_algorithm, params)
+            self.algo_roi.get_algorithm_n_params(self.current_algorithm, params)
 
-    def process_frame(self, frame: np.ndarray) -> tuple[int, list[ROI], bool, bool]:
+    def process_frame(
+        self, frame: np.ndarray, timestamp: float | None = None
+    ) -> tuple[int, list[ROI], bool, bool]:
         """
         Process a video frame, increment the frame counter, and return the frame number
-        along with the processed frame. For each ROI in the roi_list, crop the frame
-        according to the ROI coordinates and pass the cropped frame to the ROI's
-        process_frame method.
+        along with the processed frame. The frame is converted to grayscale once, and
+        for each ROI in the roi_list a view of the gray frame is cropped according to
+        the ROI coordinates and passed to the ROI's process_frame method.
 
         Parameters
         ----------
         frame : np.ndarray
             The video frame to process.
+        timestamp : float | None
+            The capture time of the frame in seconds (the media time for video
+            files), or None to use the monotonic clock.
 
         Returns
         -------
@@ -269,51 +513,223 @@ class FrameModel:
         # Increment the frame counter
         self.frame_count += 1
 
-        # Record the current time
-        current_time = self.get_current_time()
-        self.last_processed_time = current_time
+        # Record the capture time; it is only formatted for display and export
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.last_processed_time = timestamp
 
         # Store frame information in history
-        self.frame_history.append(
-            {"frame_number": self.frame_count, "timestamp": current_time}
-        )
+        self.frame_history.append(self.frame_count, timestamp)
+
+        # Convert and resize once for all ROIs; the crops below are views into this array
+        gray_frame = scale_frame(to_gray(frame), self.analysis_scale)
 
         if_new_velo = 0
         if_new_average = 0
         update_velo_plot = False
         update_average_velo = False
-        # Process each ROI in the roi_list
-        for roi in self.roi_list:
-            # Get the ROI coordinates
-            x1 = roi.coordinate[0]
-            y1 = roi.coordinate[1]
-            x2 = roi.coordinate[2]
-            y2 = roi.coordinate[3]
 
-            # Crop the frame according to the ROI coordinates
-            # Ensure the coordinates are within the frame boundaries
-            if x1 >= 0 and y1 >= 0 and x2 > 0 and y2 > 0:
-                cropped_frame = frame[y1 : y1 + y2, x1 : x1 + x2]
+        if (
+            self.batched_flow
+            and get_estimator_class(self.current_algorithm).dense
+            and self.previous_gray_frame is not None
+            and self.previous_gray_frame.shape == gray_frame.shape
+        ):
+            results = self._process_rois_batched(gray_frame, timestamp)
+        else:
+            results = self._process_rois_individually(gray_frame, timestamp)
 
-                # Pass the cropped frame to the ROI's process_frame method
-                _new_velo, _new_average = roi.process_frame(cropped_frame)
-                if _new_velo == True:
-                    if_new_velo += 1
-                if _new_average == True:
-                    if_new_average += 1
+        for _new_velo, _new_average in results:
+            if _new_velo:
+                if_new_velo += 1
+            if _new_average:
+                if_new_average += 1
+
+        self.previous_gray_frame = gray_frame
 
         if if_new_velo > 0:
             update_velo_plot = True
         if if_new_average > 0:
             update_average_velo = True
 
-        print("time to process a frame: ", time.time() - time_1, "s")
+        if self.verbose:
+            print("time to process a frame: ", time.time() - time_1, "s")
         return self.frame_count, self.roi_list, update_velo_plot, update_average_velo
 
+    def _valid_rois(self) -> list[ROI]:
+        """
+        Return the ROIs whose coordinates describe a non-empty rectangle.
+        """
+        return [
+            roi
+            for roi in self.roi_list
+            if roi.coordinate[0] >= 0
+            and roi.coordinate[1] >= 0
+            and roi.coordinate[2] > 0
+            and roi.coordinate[3] > 0
+        ]
+
+    def _process_rois_individually(
+        self, gray_frame: np.ndarray, timestamp: float | None = None
+    ) -> list[tuple[bool, bool]]:
+        """
+        Run the optical flow separately on each ROI's crop of the gray frame.
+
+        Parameters
+        ----------
+        gray_frame : np.ndarray
+            The gray version of the current frame.
+        timestamp : float | None
+            The capture time of the frame in seconds.
+
+        Returns
+        -------
+        list[tuple[bool, bool]]
+            The (new velocity, new average) flags of each processed ROI.
+        """
+
+        def process(roi: ROI) -> tuple[bool, bool]:
+            x1, y1, x2, y2 = roi.analysis_rect()
+
+            # Crop the frame according to the ROI coordinates
+            cropped_frame = gray_frame[y1 : y1 + y2, x1 : x1 + x2]
+
+            # Pass the cropped frame to the ROI's process_frame method
+            return roi.process_frame(cropped_frame, timestamp)
+
+        # Each ROI only touches its own state, so the ROIs can run concurrently
+        return self._map(process, self._valid_rois())
+
+    def _process_rois_batched(
+        self, gray_frame: np.ndarray, timestamp: float | None = None
+    ) -> list[tuple[bool, bool]]:
+        """
+        Compute dense flow once per cluster of nearby ROIs and read each ROI's
+        mean flow from its slice of the shared flow field.
+
+        Parameters
+        ----------
+        gray_frame : np.ndarray
+            The gray version of the current frame. `previous_gray_frame` must
+            have the same shape.
+        timestamp : float | None
+            The capture time of the frame in seconds.
+
+        Returns
+        -------
+        list[tuple[bool, bool]]
+            The (new velocity, new average) flags of each processed ROI.
+        """
+        previous_gray = cast(np.ndarray, self.previous_gray_frame)
+        rois = self._valid_rois()
+        clusters = cluster_rois([roi.analysis_rect() for roi in rois], self.cluster_gap)
+
+        # Keep one analysis object per cluster box so its parameters (and any
+        # per-region state) persist while the ROI layout does not change
+        analyses = {}
+        for box, _ in clusters:
+            analysis = self.cluster_analyses.get(box)
+            if analysis is None:
+                analysis = VideoAnalysis(0, 0)
+            analysis.set_algorithm(self.current_algorithm, self.get_current_params())
+            analyses[box] = analysis
+
+        def compute(box: tuple[int, int, int, int]) -> np.ndarray:
+            cx, cy, cw, ch = box
+            return analyses[box].compute_flow(
+                previous_gray[cy : cy + ch, cx : cx + cw],
+                gray_frame[cy : cy + ch, cx : cx + cw],
+            )
+
+        # The flow fields are the expensive part; the per-ROI means are cheap
+        flows = self._map(compute, [box for box, _ in clusters])
+
+        results = []
+        for (box, members), flow in zip(clusters, flows):
+            cx, cy, _, _ = box
+            for index in members:
+                roi = rois[index]
+                x1, y1, x2, y2 = roi.analysis_rect()
+                roi_flow = flow[y1 - cy : y1 - cy + y2, x1 - cx : x1 - cx + x2]
+                delta = (
+                    cast(float, np.mean(roi_flow[..., 0])),
+                    cast(float, np.mean(roi_flow[..., 1])),
+                )
+
+                # Keep the ROI's own cache current so switching back to the
+                # per-ROI path does not compare against a stale frame
+                roi.analysis.previous_frame = gray_frame[y1 : y1 + y2, x1 : x1 + x2]
+                results.append(roi.record_delta(delta, timestamp))
+
+        self.cluster_analyses = analyses
+        return results
+
+    def _map(self, func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """
+        Apply `func` to every item, on the ROI thread pool if one is configured.
+
+        Results are returned in the order of `items`, whatever order the
+        workers finish in.
+        """
+        items = list(items)
+        if self.roi_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.roi_workers, thread_name_prefix="roi-worker"
+            )
+        return list(self.executor.map(func, items))
+
+    def set_roi_workers(self, workers: int, opencv_threads: int | None = None) -> None:
+        """
+        Set how many ROIs are analysed concurrently.
+
+        OpenCV's own thread count is process-wide. It is adjusted at the same
+        time, from the workers of every model that set them (e.g. one per
+        camera), so the pools and OpenCV together do not use more threads
+        than there are cores.
+
+        Parameters
+        ----------
+        workers : int
+            The number of pool threads. 1 disables the pool.
+        opencv_threads : int | None
+            The number of OpenCV threads, or None to share the cores with
+            `opencv_thread_count`.
+        """
+        with self.lock:
+            workers = max(1, int(workers))
+            if self.executor is not None and workers != self.roi_workers:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+            self.roi_workers = workers
+
+        with _roi_workers_lock:
+            _roi_workers[self] = workers
+        if opencv_threads is None:
+            apply_opencv_threads()
+        else:
+            cv2.setNumThreads(opencv_threads)
+
+    def close(self) -> None:
+        """
+        Stop the ROI thread pool and give its share of the cores to the other models.
+        """
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+        with _roi_workers_lock:
+            registered = _roi_workers.pop(self, None) is not None
+        if registered:
+            apply_opencv_threads()
+
     def initialize_algo_config(self):
-        roi = QRect(0, 0, 0, 0)
-        self.algo_roi = ROI(roi, 1, 1)
-        self.algo_roi.get_algorithm_n_params(self.current_algorithm, self.of_params)
+        self.algo_roi = ROI((0, 0, 0, 0), 1, 1)
+        self.algo_roi.get_algorithm_n_params(
+            self.current_algorithm, self.get_current_params()
+        )
 
     def process_frame_for_algo_config(self, frame: np.ndarray) -> tuple[float, float]:
         self.algo_roi.process_frame(frame)
@@ -330,14 +746,14 @@ class FrameModel:
         """
         return self.frame_count
 
-    def get_frame_history(self) -> list:
+    def get_frame_history(self) -> ColumnarHistory:
         """
         Return the history of processed frames.
 
         Returns
         -------
-        list
-            A list of dictionaries containing information about each processed frame.
+        ColumnarHistory
+            The "frame_number" and "timestamp" columns of the processed frames.
         """
         return self.frame_history
 
@@ -373,10 +789,157 @@ class FrameModel:
     def get_overflow_direction(self, degree: float) -> None:
         self.degree = degree
 
+    def get_params(self, algorithm: str) -> dict:
+        """
+        Return the parameters chosen for an algorithm, starting from the
+        estimator's defaults.
+
+        Parameters
+        ----------
+        algorithm : str
+            The name of a registered estimator.
+
+        Returns
+        -------
+        dict
+            The parameter dictionary of the algorithm.
+        """
+        if algorithm not in self.algorithm_params:
+            defaults = get_estimator_class(algorithm).default_params
+            self.algorithm_params[algorithm] = dict(defaults)
+        return self.algorithm_params[algorithm]
+
+    def get_current_params(self) -> dict:
+        """
+        Return the parameters of the currently selected algorithm.
+
+        Returns
+        -------
+        dict
+            The parameter dictionary of `current_algorithm`.
+        """
+        return self.get_params(self.current_algorithm)
+
+    def set_flow_options(self, warm_start: bool, reuse_flow_buffer: bool) -> None:
+        """
+        Set the Farneback warm start and buffer reuse options for all ROIs.
+
+        Parameters
+        ----------
+        warm_start : bool
+            Whether to seed each frame's flow with the previous flow field.
+        reuse_flow_buffer : bool
+            Whether to reuse one preallocated flow buffer per region.
+        """
+        with self.lock:
+            params = self.get_params("Farneback")
+            params["warm_start"] = warm_start
+            params["reuse_flow_buffer"] = reuse_flow_buffer
+            for roi in self.roi_list:
+                if roi.analysis.current_algorithm == "Farneback":
+                    roi.analysis.set_algorithm("Farneback", params)
+
+    def set_analysis_scale(self, analysis_scale: float) -> None:
+        """
+        Set the resolution frames are analysed at and update every ROI.
+
+        Parameters
+        ----------
+        analysis_scale : float
+            The analysis resolution relative to the source frame, e.g. 0.5.
+        """
+        with self.lock:
+            self.analysis_scale = analysis_scale
+            self.previous_gray_frame = None
+            self.cluster_analyses = {}
+            for roi in self.roi_list:
+                roi.set_analysis_scale(analysis_scale)
+
+    def set_history_limit(self, limit: int | None) -> None:
+        """
+        Set the maximum number of rows kept in the frame history and in the
+        history of every ROI, present and future.
+
+        The oldest rows beyond the limit are dropped at once.
+
+        Parameters
+        ----------
+        limit : int | None
+            The number of rows, or None to keep the whole session.
+        """
+        with self.lock:
+            self.history_limit = limit
+            self.frame_history.set_capacity(limit)
+            for roi in self.roi_list:
+                roi.delta_history.set_capacity(limit)
+
+    def set_batched_flow(self, enabled: bool, cluster_gap: int | None = 16) -> None:
+        """
+        Compute dense flow once per cluster of nearby ROIs, or once per ROI.
+
+        The mean flow of an ROI near the border of a cluster differs slightly
+        from the per-ROI result, as the flow there is computed with the
+        surrounding image rather than the edge of the ROI crop.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether ROIs share the flow computation of their cluster.
+        cluster_gap : int | None
+            Maximum gap in pixels between ROIs of one cluster, or None for a
+            single flow field over the union of all ROIs.
+        """
+        with self.lock:
+            self.batched_flow = enabled
+            self.cluster_gap = cluster_gap
+            self.cluster_analyses = {}
+
+    def set_velocity_window(self, seconds: float) -> None:
+        """
+        Set the span over which velocities are measured, for every ROI.
+
+        Parameters
+        ----------
+        seconds : float
+            The window length in seconds of capture time.
+        """
+        with self.lock:
+            self.velocity_window = seconds
+            for roi in self.roi_list:
+                roi.velocity_window = seconds
+
+    def set_stats_windows(self, durations: tuple[float, ...]) -> None:
+        """
+        Set the windows of the velocity statistics, for every ROI.
+
+        The statistics start again from the next velocity.
+
+        Parameters
+        ----------
+        durations : tuple[float, ...]
+            The window lengths in seconds.
+        """
+        with self.lock:
+            self.stats_windows = tuple(durations)
+            for roi in self.roi_list:
+                roi.velocity_stats = RollingStats(self.stats_windows)
+
     def add_roi(self, roi):
-        new_roi = ROI(roi, self.px2mm, self.degree)
-        new_roi.get_algorithm_n_params(self.current_algorithm, self.of_params)
-        self.roi_list.append(new_roi)
+        with self.lock:
+            new_roi = ROI(
+                roi,
+                self.px2mm,
+                self.degree,
+                self.analysis_scale,
+                self.velocity_window,
+                self.history_limit,
+                self.stats_windows,
+            )
+            new_roi.get_algorithm_n_params(
+                self.current_algorithm, self.get_current_params()
+            )
+            # Replace rather than append, so a reader iterating the old list is unaffected
+            self.roi_list = self.roi_list + [new_roi]
 
     def delete_last_roi(self):
         """
@@ -387,15 +950,21 @@ class FrameModel:
         bool
             True if an ROI was successfully deleted, False if the roi_list was empty.
         """
-        if not self.roi_list:
-            return False
+        with self.lock:
+            if not self.roi_list:
+                return False
 
-        # Remove the last ROI from the list
-        self.roi_list.pop()
+            # Remove the last ROI from the list
+            self.roi_list = self.roi_list[:-1]
 
-        return True
+            return True
 
     def reset(self):
-        self.frame_count = 0
-        self.frame_history = []
-        self.roi_list = []
+        with self.lock:
+            self.frame_count = 0
+            self.frame_history = ColumnarHistory(
+                FRAME_COLUMNS, capacity=self.history_limit
+            )
+            self.roi_list = []
+            self.previous_gray_frame = None
+            self.cluster_analyses = {}
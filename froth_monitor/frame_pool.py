@@ -0,0 +1,164 @@
+"""Frame Pool Module for Froth Tracker Application.
+
+This module defines the `FramePool` class, a small set of preallocated frame buffers
+that the capture thread fills in place with `VideoCapture.read(image=buffer)`. Reusing
+buffers avoids allocating a new full-resolution array for every frame (about 25 MB
+per frame at 4K), which otherwise keeps the allocator and the page cache busy.
+
+Every holder of a pooled frame (the frame queue, the GUI, the analysis worker) takes a
+reference with `retain` and gives it back with `release`. A buffer is only handed out
+again once nobody holds it, so a frame is never overwritten while it is still in use.
+Frames that do not come from the pool are ignored by `retain` and `release`, so the
+holders do not need to know where a frame came from.
+
+Example Usage:
+--------------
+```python
+pool = FramePool(size=8)
+
+# Capture thread: the caller holds one reference to the frame it gets
+buffer = pool.acquire()
+ret, frame = capture.read(image=buffer) if buffer is not None else capture.read()
+pool.replace(buffer, frame)
+
+# Consumer
+pool.retain(frame)
+...
+pool.release(frame)
+```
+"""
+
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """
+    A bounded pool of reference-counted frame buffers.
+
+    Attributes:
+        size (int): The most buffers the pool keeps.
+        allocated (int): Number of buffers added to the pool.
+        reused (int): Number of times a free buffer was handed out again.
+    """
+
+    def __init__(self, size: int = 8):
+        """
+        Initialize an empty pool.
+
+        Args:
+            size: The most buffers the pool keeps.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Forget every buffer, e.g. when the frame size changes with a new source.
+
+        Frames still held elsewhere stay valid; releasing them later does nothing.
+        """
+        with self.lock:
+            # Buffers and reference counts, keyed by the id of the buffer
+            self.buffers: dict[int, np.ndarray] = {}
+            self.refcounts: dict[int, int] = {}
+            self.allocated = 0
+            self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self.buffers)
+
+    def free_count(self) -> int:
+        """
+        Return the number of buffers that nobody holds.
+        """
+        with self.lock:
+            return sum(1 for count in self.refcounts.values() if count == 0)
+
+    def acquire(self) -> np.ndarray | None:
+        """
+        Take a free buffer to read the next frame into.
+
+        The caller holds one reference to the buffer.
+
+        Returns:
+            np.ndarray | None: A free buffer, or None if every buffer is in use
+            (or none has been allocated yet); the caller then lets `read`
+            allocate a new frame and passes it to `replace`.
+        """
+        with self.lock:
+            for key, count in self.refcounts.items():
+                if count == 0:
+                    self.refcounts[key] = 1
+                    self.reused += 1
+                    return self.buffers[key]
+        return None
+
+    def replace(self, buffer: np.ndarray | None, frame: np.ndarray) -> None:
+        """
+        Account for the frame `read` returned into `buffer`.
+
+        If `read` filled the buffer in place, nothing changes. Otherwise it
+        allocated a new frame (no buffer was free, or the frame size changed):
+        the stale buffer is removed from the pool and the new frame joins it,
+        held once by the caller, if the pool is not full.
+
+        Args:
+            buffer: The buffer returned by `acquire`, or None.
+            frame: The frame returned by `read`.
+        """
+        if frame is buffer:
+            return
+
+        with self.lock:
+            if buffer is not None:
+                self.buffers.pop(id(buffer), None)
+                self.refcounts.pop(id(buffer), None)
+            if frame is not None and len(self.buffers) < self.size:
+                self.buffers[id(frame)] = frame
+                self.refcounts[id(frame)] = 1
+                self.allocated += 1
+
+    def retain(self, frame: np.ndarray | None) -> None:
+        """
+        Take another reference to a pooled frame.
+
+        Args:
+            frame: The frame; frames that are not from the pool are ignored.
+        """
+        if frame is None:
+            return
+        with self.lock:
+            key = id(frame)
+            if self.buffers.get(key) is frame:
+                self.refcounts[key] += 1
+
+    def release(self, frame: np.ndarray | None) -> None:
+        """
+        Give back a reference to a pooled frame; once no reference is left,
+        the buffer can be filled with a new frame.
+
+        Args:
+            frame: The frame; frames that are not from the pool are ignored.
+        """
+        if frame is None:
+            return
+        with self.lock:
+            key = id(frame)
+            if self.buffers.get(key) is frame and self.refcounts[key] > 0:
+                self.refcounts[key] -= 1
+
+    def refcount(self, frame: np.ndarray) -> int:
+        """
+        Return the number of references held to a frame (0 if it is not pooled).
+        """
+        with self.lock:
+            key = id(frame)
+            return self.refcounts[key] if self.buffers.get(key) is frame else 0
@@ -0,0 +1,229 @@
+"""Frame Queue Module for Froth Tracker Application.
+
+This module defines the `FrameQueue` class, a bounded, thread-safe hand-off of frames
+between a producer (e.g. the capture thread) and a consumer (e.g. the GUI or the
+analysis worker). What happens when the consumer falls behind is set by a policy,
+and every frame that is not delivered is counted, so gaps in the data can be
+explained.
+
+Policies:
+---------
+- "latest": only the newest frame is kept; a new frame replaces any waiting one.
+  The consumer always works on the most recent frame. Best for live display.
+- "drop-oldest": up to `maxsize` frames wait; when full, the oldest is dropped.
+- "block": up to `maxsize` frames wait; when full, the producer waits for space.
+  No frame is lost, at the cost of slowing the producer down.
+
+Example Usage:
+--------------
+```python
+queue = FrameQueue(maxsize=4, policy="drop-oldest")
+
+# Producer thread
+queue.put(frame, timestamp)
+
+# Consumer thread
+item = queue.get()
+if item is not None:
+    frame, timestamp = item
+```
+"""
+
+import threading
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+# The supported policies for a full queue
+POLICIES = ("latest", "drop-oldest", "block")
+
+
+class FrameQueue:
+    """
+    A bounded frame queue with a policy for a full queue and drop accounting.
+
+    Attributes:
+        maxsize (int): The number of frames that can wait ("latest" keeps one).
+        policy (str): One of `POLICIES`.
+        captured (int): Number of frames put into the queue.
+        delivered (int): Number of frames taken out of the queue.
+        dropped (int): Number of frames discarded by the policy or by `clear`.
+        closed (bool): Whether the queue has been closed.
+        on_drop (Callable | None): Called with every frame the queue discards,
+            e.g. to give a pooled buffer back.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1,
+        policy: str = "latest",
+        on_drop: Callable[[np.ndarray], None] | None = None,
+    ):
+        """
+        Initialize an empty, open queue.
+
+        Args:
+            maxsize: The number of frames that can wait.
+            policy: What to do when the queue is full, one of `POLICIES`.
+            on_drop: Called with every frame the queue discards.
+
+        Raises:
+            ValueError: If the policy is unknown or maxsize is not positive.
+        """
+        self.on_drop = on_drop
+        self.condition = threading.Condition()
+        self.items: deque[tuple[np.ndarray, float | None]] = deque()
+        self.closed = False
+        self.captured = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.configure(maxsize, policy)
+
+    def configure(self, maxsize: int, policy: str) -> None:
+        """
+        Change the size and policy of the queue.
+
+        Args:
+            maxsize: The number of frames that can wait.
+            policy: What to do when the queue is full, one of `POLICIES`.
+
+        Raises:
+            ValueError: If the policy is unknown or maxsize is not positive.
+        """
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown queue policy: {policy}; expected one of {POLICIES}"
+            )
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        with self.condition:
+            self.policy = policy
+            self.maxsize = 1 if policy == "latest" else maxsize
+            while len(self.items) > self.maxsize:
+                self._drop()
+            self.condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def put(self, frame: np.ndarray, timestamp: float | None = None) -> bool:
+        """
+        Add a frame, applying the policy if the queue is full.
+
+        Args:
+            frame: The frame.
+            timestamp: The capture time of the frame in seconds.
+
+        Returns:
+            bool: False if the queue was closed and the frame was discarded.
+        """
+        with self.condition:
+            if self.policy == "block":
+                while not self.closed and len(self.items) >= self.maxsize:
+                    self.condition.wait()
+            if self.closed:
+                return False
+
+            self.captured += 1
+            while len(self.items) >= self.maxsize:
+                # "latest" and "drop-oldest" both make room by dropping the oldest
+                self._drop()
+            self.items.append((frame, timestamp))
+            self.condition.notify_all()
+            return True
+
+    def get(
+        self, timeout: float | None = None
+    ) -> tuple[np.ndarray, float | None] | None:
+        """
+        Remove and return the oldest waiting frame, waiting for one if needed.
+
+        Args:
+            timeout: The most seconds to wait, or None to wait until a frame
+                arrives or the queue is closed.
+
+        Returns:
+            tuple | None: The (frame, timestamp), or None if the queue was
+            closed or the timeout expired.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items or self.closed, timeout):
+                return None
+            return self._take()
+
+    def get_nowait(self) -> tuple[np.ndarray, float | None] | None:
+        """
+        Remove and return the oldest waiting frame, or None if there is none.
+        """
+        with self.condition:
+            return self._take()
+
+    def _take(self) -> tuple[np.ndarray, float | None] | None:
+        """
+        Remove the oldest frame and count it as delivered. The lock must be held.
+        """
+        if not self.items:
+            return None
+        item = self.items.popleft()
+        self.delivered += 1
+        self.condition.notify_all()
+        return item
+
+    def _drop(self) -> None:
+        """
+        Discard the oldest frame and count it as dropped. The lock must be held.
+        """
+        frame, _ = self.items.popleft()
+        self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop(frame)
+
+    def clear(self, reset_counts: bool = False) -> None:
+        """
+        Discard the waiting frames.
+
+        Args:
+            reset_counts: Also set the counters back to zero, e.g. for a new source.
+        """
+        with self.condition:
+            while self.items:
+                self._drop()
+            if reset_counts:
+                self.captured = 0
+                self.delivered = 0
+                self.dropped = 0
+            self.condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Discard the waiting frames and wake every waiting producer and consumer.
+        Later frames are refused until `reopen` is called.
+        """
+        with self.condition:
+            self.closed = True
+            while self.items:
+                self._drop()
+            self.condition.notify_all()
+
+    def reopen(self) -> None:
+        """
+        Accept frames again after `close`.
+        """
+        with self.condition:
+            self.closed = False
+
+    def counts(self) -> dict[str, int]:
+        """
+        Return the frame counters.
+
+        Returns:
+            dict[str, int]: The captured, delivered and dropped frame counts.
+        """
+        with self.condition:
+            return {
+                "captured": self.captured,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+            }
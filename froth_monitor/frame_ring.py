@@ -0,0 +1,210 @@
+"""Frame Ring Module for Froth Tracker Application.
+
+This module defines the `SharedFrameRing` class, a ring of frame slots in a
+`multiprocessing.shared_memory` block. A camera process writes every frame it captures
+into the next slot, and the GUI process maps the newest one for display. Frames are
+never pickled or sent through a pipe; the reader gets a numpy view of the slot.
+
+The ring has a single writer. Each slot carries a sequence number that is cleared
+while the slot is written and set once the frame is complete, so a reader can tell
+whether the frame it mapped was complete and is still there (a seqlock). With a few
+slots, the writer has to fill every other slot before it comes back to the newest
+one, which leaves the reader several frame intervals to use it.
+
+Example Usage:
+--------------
+```python
+# Camera process
+ring = SharedFrameRing.create(frame.shape, frame.dtype)
+ring.write(frame, timestamp)
+
+# GUI process
+ring = SharedFrameRing.attach(name, shape, dtype)
+item = ring.latest()
+if item is not None:
+    seq, timestamp, frame = item
+    image = to_display(frame)
+    if not ring.is_current(seq):
+        ...  # The slot was overwritten while it was read; skip the frame
+```
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# The default number of frame slots
+DEFAULT_SLOTS = 4
+
+
+class SharedFrameRing:
+    """
+    A single-writer ring of frames in shared memory.
+
+    The block starts with a header of int64 counters (the newest sequence
+    number, then one sequence number per slot, 0 for empty and -1 while the
+    slot is being written), followed by one float64 timestamp per slot and
+    the frame slots.
+
+    Attributes:
+        name (str): The name of the shared memory block, to attach to it.
+        shape (tuple[int, ...]): The shape of every frame.
+        dtype (np.dtype): The data type of every frame.
+        slots (int): The number of frame slots.
+        owner (bool): Whether this side created the block and unlinks it on close.
+        torn (int): Number of frames the reader found overwritten.
+    """
+
+    def __init__(
+        self,
+        memory: shared_memory.SharedMemory,
+        shape: tuple[int, ...],
+        dtype: np.dtype | str,
+        slots: int,
+        owner: bool,
+    ):
+        """
+        Map the header and the frame slots of a shared memory block.
+
+        Use `create` or `attach` instead of calling this directly.
+        """
+        self.memory = memory
+        self.name = memory.name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.owner = owner
+        self.torn = 0
+
+        header_size = (1 + slots) * 8
+        self.header: np.ndarray = np.ndarray((1 + slots,), np.int64, memory.buf)
+        self.timestamps: np.ndarray = np.ndarray(
+            (slots,), np.float64, memory.buf, header_size
+        )
+        self.frames: np.ndarray = np.ndarray(
+            (slots, *self.shape), self.dtype, memory.buf, header_size + slots * 8
+        )
+
+    @staticmethod
+    def nbytes(shape: tuple[int, ...], dtype: np.dtype | str, slots: int) -> int:
+        """
+        Return the size of the shared memory block for a ring.
+        """
+        frame_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return (1 + slots) * 8 + slots * 8 + slots * frame_size
+
+    @classmethod
+    def create(
+        cls, shape: tuple[int, ...], dtype: np.dtype | str, slots: int = DEFAULT_SLOTS
+    ) -> "SharedFrameRing":
+        """
+        Create an empty ring in a new shared memory block.
+
+        Args:
+            shape: The shape of every frame.
+            dtype: The data type of every frame.
+            slots: The number of frame slots.
+
+        Returns:
+            SharedFrameRing: The ring, which owns the block.
+
+        Raises:
+            ValueError: If slots is less than 2.
+        """
+        if slots < 2:
+            raise ValueError("A frame ring needs at least 2 slots")
+        memory = shared_memory.SharedMemory(
+            create=True, size=cls.nbytes(shape, dtype, slots)
+        )
+        ring = cls(memory, shape, dtype, slots, owner=True)
+        ring.header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        shape: tuple[int, ...],
+        dtype: np.dtype | str,
+        slots: int = DEFAULT_SLOTS,
+    ) -> "SharedFrameRing":
+        """
+        Map a ring created by another process.
+
+        Args:
+            name: The name of the ring's shared memory block.
+            shape: The shape of every frame.
+            dtype: The data type of every frame.
+            slots: The number of frame slots.
+
+        Returns:
+            SharedFrameRing: The ring; closing it leaves the block to its owner.
+        """
+        memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, shape, dtype, slots, owner=False)
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """
+        Copy a frame into the next slot and publish it as the newest frame.
+
+        Args:
+            frame: The frame, of the ring's shape.
+            timestamp: The capture time of the frame in seconds.
+
+        Returns:
+            int: The sequence number of the frame.
+        """
+        seq = int(self.header[0]) + 1
+        slot = seq % self.slots
+        self.header[1 + slot] = -1  # Readers of the old frame see it is gone
+        self.frames[slot][...] = frame
+        self.timestamps[slot] = timestamp
+        self.header[1 + slot] = seq
+        self.header[0] = seq
+        return seq
+
+    def latest(self) -> tuple[int, float, np.ndarray] | None:
+        """
+        Return the newest complete frame, without copying it.
+
+        The frame is a view of its slot. It stays valid until the writer comes
+        back to the slot; check with `is_current` after using it.
+
+        Returns:
+            tuple | None: The (sequence number, timestamp, frame), or None if no
+            frame was written yet or the newest one is already being overwritten.
+        """
+        seq = int(self.header[0])
+        if seq <= 0:
+            return None
+        slot = seq % self.slots
+        timestamp = float(self.timestamps[slot])
+        if not self.is_current(seq):
+            self.torn += 1
+            return None
+        return seq, timestamp, self.frames[slot]
+
+    def is_current(self, seq: int) -> bool:
+        """
+        Return whether the frame with this sequence number is still in its slot.
+
+        Args:
+            seq: The sequence number returned by `latest`.
+        """
+        return int(self.header[1 + seq % self.slots]) == seq
+
+    def close(self) -> None:
+        """
+        Unmap the block, and free it if this side created it.
+        """
+        del self.header, self.timestamps, self.frames
+        try:
+            self.memory.close()
+        except BufferError:
+            # A frame view is still held elsewhere; the mapping goes with the process
+            pass
+        if self.owner:
+            try:
+                self.memory.unlink()
+            except FileNotFoundError:
+                pass
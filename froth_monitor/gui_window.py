@@ -18,11 +18,14 @@ from PySide6.QtWidgets import (
     QFrame,
     QGroupBox,
     QSpinBox,
+    QCheckBox,
+    QComboBox,
 )
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon
 import pyqtgraph as pg
 import sys
+import math
 import numpy as np
 import os
 
@@ -143,6 +146,10 @@ class MainGUIWindow(QMainWindow):
         source_group = self._create_video_source_controls()
         left_layout.addWidget(source_group)
 
+        # Add analysis options
+        analysis_group = self._create_analysis_controls()
+        left_layout.addWidget(analysis_group)
+
         # Add calibration controls
         calibration_group = self._create_calibration_controls()
         left_layout.addWidget(calibration_group)
@@ -217,13 +224,153 @@ class MainGUIWindow(QMainWindow):
             """
         )
 
+        # Resolution the frames are analysed at, independent of the canvas size
+        scale_layout = QHBoxLayout()
+        scale_label = QLabel("Analysis scale")
+        scale_label.setStyleSheet("font-weight: normal; font-size: 14px; color: black")
+        self.analysis_scale_combo = QComboBox()
+        for scale in (1.0, 0.75, 0.5, 0.25):
+            self.analysis_scale_combo.addItem(f"{scale:g}x", scale)
+        self.analysis_scale_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        scale_layout.addWidget(scale_label)
+        scale_layout.addWidget(self.analysis_scale_combo)
+
+        # Sources open at once, each with its own ROIs and calibration; the
+        # selected one is shown on the canvas
+        sources_layout = QHBoxLayout()
+        self.source_combo = QComboBox()
+        self.source_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.source_combo.setToolTip("Source shown on the canvas")
+        self.add_source_button = QPushButton("Add Source")
+        self.add_source_button.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #4285f4;
+                color: white;
+                font-size: 14px;
+                padding: 8px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #3367d6;
+            }
+            """
+        )
+        self.add_source_button.setToolTip("Open another camera or video")
+        sources_layout.addWidget(self.source_combo, 1)
+        sources_layout.addWidget(self.add_source_button)
+
+        # Capture and analyse each new source in a process of its own
+        self.process_mode_checkbox = QCheckBox("Separate process per source")
+        self.process_mode_checkbox.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.process_mode_checkbox.setToolTip(
+            "Analyse each source opened from now on in its own process"
+        )
+
         source_layout.addWidget(self.webcam_radio)
         source_layout.addWidget(self.prerecorded_radio)
         source_layout.addWidget(self.import_button)
+        source_layout.addLayout(sources_layout)
+        source_layout.addWidget(self.process_mode_checkbox)
         source_layout.addWidget(self.algorithm_configuration)
+        source_layout.addLayout(scale_layout)
 
         return source_group
 
+    def _create_analysis_controls(self) -> QGroupBox:
+        """
+        Create the options of how the frames of the selected source are analysed.
+
+        Returns:
+            QGroupBox: The analysis options group box.
+        """
+        analysis_group = QGroupBox("Analysis Options")
+        analysis_group.setStyleSheet("font-weight: bold; font-size: 16px; color: black")
+        analysis_layout = QVBoxLayout(analysis_group)
+        analysis_layout.setSpacing(10)
+
+        # Dense flow once per cluster of nearby ROIs instead of once per ROI
+        self.batched_flow_checkbox = QCheckBox("Batched flow")
+        self.batched_flow_checkbox.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.batched_flow_checkbox.setToolTip(
+            "Compute the optical flow once for each cluster of nearby ROIs "
+            "(dense algorithms only).\nFaster with many ROIs; the means of ROIs "
+            "near a cluster border differ slightly from the per-ROI results."
+        )
+
+        gap_layout = QHBoxLayout()
+        gap_label = QLabel("Cluster gap (px)")
+        gap_label.setStyleSheet("font-weight: normal; font-size: 14px; color: black")
+        self.cluster_gap_spinbox = QSpinBox()
+        # The minimum stands for one flow field over all ROIs
+        self.cluster_gap_spinbox.setRange(-1, 1000)
+        self.cluster_gap_spinbox.setSpecialValueText("All ROIs")
+        self.cluster_gap_spinbox.setValue(16)
+        self.cluster_gap_spinbox.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.cluster_gap_spinbox.setToolTip(
+            "Largest gap between ROIs that share a flow computation"
+        )
+        gap_layout.addWidget(gap_label)
+        gap_layout.addWidget(self.cluster_gap_spinbox)
+
+        # ROIs (or ROI clusters) analysed concurrently
+        workers_layout = QHBoxLayout()
+        workers_label = QLabel("ROI workers")
+        workers_label.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.roi_workers_spinbox = QSpinBox()
+        self.roi_workers_spinbox.setRange(1, os.cpu_count() or 1)
+        self.roi_workers_spinbox.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.roi_workers_spinbox.setToolTip(
+            "Number of threads analysing the ROIs of the selected source at once"
+        )
+        workers_layout.addWidget(workers_label)
+        workers_layout.addWidget(self.roi_workers_spinbox)
+
+        # Rows kept in the frame and ROI histories; 0 keeps the whole session
+        history_layout = QHBoxLayout()
+        history_label = QLabel("History kept")
+        history_label.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.history_limit_combo = QComboBox()
+        for label, rows in (
+            ("All frames", 0),
+            ("Last 100k frames", 100_000),
+            ("Last 1M frames", 1_000_000),
+            ("Last 10M frames", 10_000_000),
+        ):
+            self.history_limit_combo.addItem(label, rows)
+        self.history_limit_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.history_limit_combo.setToolTip(
+            "Frames kept for the export; older ones are dropped so unattended "
+            "runs use bounded memory"
+        )
+        history_layout.addWidget(history_label)
+        history_layout.addWidget(self.history_limit_combo)
+
+        analysis_layout.addWidget(self.batched_flow_checkbox)
+        analysis_layout.addLayout(gap_layout)
+        analysis_layout.addLayout(workers_layout)
+        analysis_layout.addLayout(history_layout)
+
+        return analysis_group
+
     def _create_calibration_controls(self) -> QGroupBox:
         """
         Create the calibration controls.
@@ -582,19 +729,37 @@ class MainGUIWindow(QMainWindow):
             "font-weight: bold; font-size: 16px; \
             color: black"
         )
-        layout.addWidget(velocity_label)
+
+        # Time span shown by the plot; longer spans are drawn from rollups
+        self.plot_span_combo = QComboBox()
+        for label, seconds in (
+            ("30 s", 30),
+            ("10 min", 600),
+            ("1 h", 3600),
+            ("1 day", 86400),
+            ("1 week", 604800),
+        ):
+            self.plot_span_combo.addItem(label, float(seconds))
+        self.plot_span_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+
+        title_layout = QHBoxLayout()
+        title_layout.addWidget(velocity_label)
+        title_layout.addStretch()
+        title_layout.addWidget(self.plot_span_combo)
+        layout.addLayout(title_layout)
 
         horizontal_layout = QHBoxLayout()
 
-        example_1d_data = ["N/A"]
-        # ROI Movements Table
+        example_data = [["N/A", "N/A", "N/A", "N/A"]]
+        # ROI velocity statistics table, one row per ROI and window
         self.table_widget = pg.TableWidget()
-        self.table_widget.setData(example_1d_data)
-        # self.table_widget.setColumnCount(2)
-        self.table_widget.setHorizontalHeaderLabels(["mean_velocity  "])
+        self.table_widget.setData(example_data)
+        self.table_widget.setHorizontalHeaderLabels(["mean", "std", "min", "max"])
         self.table_widget.setFormat("%.2f")
-        self.table_widget.setColumnWidth(0, 120)
-        # self.table_widget.setColumnWidth(1, 100)
+        for column in range(4):
+            self.table_widget.setColumnWidth(column, 60)
         self.table_widget.setFixedHeight(200)
 
         # ROI Movements Canvas (graph)
@@ -612,15 +777,18 @@ class MainGUIWindow(QMainWindow):
 
         # layout.addWidget(self.plot_widget)
 
-        # Add "Average 30 s" label
-        avg_label = QLabel("Average over past 30s")
+        # Explain the statistics table
+        avg_label = QLabel(
+            "Velocity statistics over the past 10 s, 30 s, 5 min and 1 h"
+        )
         avg_label.setStyleSheet("font-size: 10px; color: #333333; text-align: left;")
         avg_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         layout.addWidget(avg_label)
 
     def _create_media_controls(self, layout: QVBoxLayout) -> None:
         """
-        Create media control buttons (play/pause) below the video canvas.
+        Create media controls (play/pause, step, playback speed and display rate)
+        below the video canvas.
 
         Args:
             layout: The layout to add the media controls to.
@@ -651,8 +819,62 @@ class MainGUIWindow(QMainWindow):
         self.play_pause_button.setFixedSize(40, 40)
         self.play_pause_button.setToolTip("Play/Pause Video")
 
-        # Add the button to the layout
+        # Create step button, which shows the next frame while paused
+        self.step_button = QPushButton("Step")
+        self.step_button.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #4285f4; color: white; font-size: 14px; padding: 8px; \
+            border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #3367d6;
+            }
+            """
+        )
+        self.step_button.setFixedHeight(40)
+        self.step_button.setToolTip("Show the next frame while paused")
+
+        # Playback speed of video files
+        self.playback_speed_combo = QComboBox()
+        for label, speed in (
+            ("0.25x", 0.25),
+            ("0.5x", 0.5),
+            ("1x", 1.0),
+            ("2x", 2.0),
+            ("4x", 4.0),
+            ("Max", math.inf),
+        ):
+            self.playback_speed_combo.addItem(label, speed)
+        self.playback_speed_combo.setCurrentIndex(2)
+        self.playback_speed_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.playback_speed_combo.setToolTip("Playback speed of video files")
+
+        # Most frames shown per second; every frame is still analysed
+        self.display_fps_combo = QComboBox()
+        for label, fps in (
+            ("10 fps", 10.0),
+            ("25 fps", 25.0),
+            ("30 fps", 30.0),
+            ("60 fps", 60.0),
+            ("All frames", math.inf),
+        ):
+            self.display_fps_combo.addItem(label, fps)
+        self.display_fps_combo.setCurrentIndex(1)
+        self.display_fps_combo.setStyleSheet(
+            "font-weight: normal; font-size: 14px; color: black"
+        )
+        self.display_fps_combo.setToolTip(
+            "Most frames shown per second; the analysis uses every frame"
+        )
+
+        # Add the controls to the layout
         media_controls_layout.addWidget(self.play_pause_button)
+        media_controls_layout.addWidget(self.step_button)
+        media_controls_layout.addWidget(self.playback_speed_combo)
+        media_controls_layout.addWidget(self.display_fps_combo)
         # Add a stretch to push the button to the right
         media_controls_layout.addStretch()
 
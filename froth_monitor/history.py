@@ -0,0 +1,296 @@
+"""History Module for Froth Tracker Application.
+
+This module defines the `ColumnarHistory` class, an append-only table that keeps
+each column in typed NumPy arrays. It replaces per-frame Python lists and dicts,
+which cost hundreds of bytes per row and grow without bound in long sessions.
+
+Classes:
+--------
+ColumnarHistory
+    Stores rows of fixed-type values column by column, growing in chunks, with
+    an optional bound on the number of rows kept.
+
+Example Usage:
+--------------
+```python
+history = ColumnarHistory({"timestamp": np.float64, "velocity": np.float64})
+history.append(0.04, 1.5)
+
+velocities = history["velocity"]           # All rows, as a NumPy array
+recent = history.tail("velocity", 30)      # The last 30 rows only
+```
+"""
+
+import threading
+from typing import Any
+
+import numpy as np
+
+
+class ColumnarHistory:
+    """
+    An append-only table with one typed NumPy array per column.
+
+    Rows are written into preallocated chunks of `chunk_size` rows, so appending
+    never copies earlier rows and a row costs only the size of its values. With
+    a `capacity`, the table keeps the most recent `capacity` rows and releases
+    the oldest chunk once it holds no kept row, so memory stays bounded (to at
+    most `capacity + chunk_size` rows) in sessions of any length.
+
+    Attributes:
+    ----------
+    names : tuple[str, ...]
+        The column names, in the order `append` expects the values.
+    dtypes : dict[str, np.dtype]
+        The type of each column.
+    chunk_size : int
+        The number of rows allocated at a time.
+    max_chunk_size : int
+        The chunk size asked for, used when the capacity does not limit it.
+    capacity : int | None
+        The maximum number of rows kept, or None to keep every row.
+    total : int
+        The number of rows appended since creation or the last `clear`,
+        including rows that were dropped.
+    """
+
+    def __init__(
+        self,
+        columns: dict[str, Any],
+        chunk_size: int = 4096,
+        capacity: int | None = None,
+    ) -> None:
+        """
+        Initialize an empty history.
+
+        Parameters
+        ----------
+        columns : dict[str, Any]
+            The column names and their NumPy types.
+        chunk_size : int
+            The number of rows allocated at a time.
+        capacity : int | None
+            The maximum number of rows kept, or None to keep every row.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive or None")
+
+        self.names = tuple(columns)
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        # A bounded history never needs chunks larger than its capacity
+        self.max_chunk_size = chunk_size
+        self.chunk_size = min(chunk_size, capacity) if capacity else chunk_size
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every row and release the chunks.
+        """
+        with self.lock:
+            self._chunks: dict[str, list[np.ndarray]] = {
+                name: [] for name in self.names
+            }
+            self._offset = 0  # Position of the oldest kept row in the first chunk
+            self._length = 0
+            self.total = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of rows dropped to respect `capacity`.
+
+        This is also the index, counted from the first row ever appended, of
+        the oldest row still kept.
+        """
+        return self.total - self._length
+
+    @property
+    def row_nbytes(self) -> int:
+        """
+        The number of bytes one row occupies.
+        """
+        return sum(dtype.itemsize for dtype in self.dtypes.values())
+
+    def append(self, *values: Any) -> None:
+        """
+        Append one row.
+
+        Parameters
+        ----------
+        *values : Any
+            One value per column, in the order of `names`.
+        """
+        if len(values) != len(self.names):
+            raise ValueError(f"Expected {len(self.names)} values, got {len(values)}")
+
+        with self.lock:
+            end = self._offset + self._length
+            if end == len(self._chunks[self.names[0]]) * self.chunk_size:
+                for name in self.names:
+                    self._chunks[name].append(
+                        np.empty(self.chunk_size, self.dtypes[name])
+                    )
+
+            chunk, row = divmod(end, self.chunk_size)
+            for name, value in zip(self.names, values):
+                self._chunks[name][chunk][row] = value
+            self._length += 1
+            self.total += 1
+
+            if self.capacity is not None and self._length > self.capacity:
+                self._discard(1)
+
+    def set_capacity(self, capacity: int | None) -> None:
+        """
+        Change the maximum number of rows kept, dropping the oldest rows beyond it.
+
+        The kept rows are copied into chunks sized for the new capacity.
+
+        Parameters
+        ----------
+        capacity : int | None
+            The maximum number of rows kept, or None to keep every row.
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive or None")
+
+        with self.lock:
+            if capacity is not None and self._length > capacity:
+                self._discard(self._length - capacity)
+            kept = {name: self._tail(name, self._length).copy() for name in self.names}
+
+            self.capacity = capacity
+            self.chunk_size = (
+                min(self.max_chunk_size, capacity) if capacity else self.max_chunk_size
+            )
+            self._chunks = {name: [] for name in self.names}
+            self._offset = 0
+            for name, values in kept.items():
+                for start in range(0, len(values), self.chunk_size):
+                    chunk = np.empty(self.chunk_size, self.dtypes[name])
+                    part = values[start : start + self.chunk_size]
+                    chunk[: len(part)] = part
+                    self._chunks[name].append(chunk)
+
+    def discard(self, count: int = 1) -> None:
+        """
+        Drop the oldest rows, e.g. to keep only a recent span of time.
+
+        Parameters
+        ----------
+        count : int
+            The number of rows to drop.
+        """
+        with self.lock:
+            self._discard(count)
+
+    def _discard(self, count: int) -> None:
+        """
+        Drop the oldest rows and release the chunks that no longer hold any.
+        The lock must be held.
+        """
+        count = max(0, min(count, self._length))
+        self._offset += count
+        self._length -= count
+        released = self._offset // self.chunk_size
+        if released:
+            for name in self.names:
+                del self._chunks[name][:released]
+            self._offset -= released * self.chunk_size
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return every kept value of a column, oldest first.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only array of `len(self)` values.
+        """
+        return self.tail(name, self._length)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def tail(self, name: str, count: int) -> np.ndarray:
+        """
+        Return the most recent values of a column, oldest first.
+
+        Only the chunks that hold the requested rows are read, so the cost
+        does not depend on the length of the history.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+        count : int
+            The number of rows to return; fewer are returned if the history
+            is shorter.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only array of at most `count` values.
+        """
+        with self.lock:
+            values = self._tail(name, count)
+
+        values = values.view()
+        values.flags.writeable = False
+        return values
+
+    def _tail(self, name: str, count: int) -> np.ndarray:
+        """
+        Return the most recent values of a column. The lock must be held.
+        """
+        count = max(0, min(count, self._length))
+        end = self._offset + self._length
+        start = end - count
+        first_chunk = start // self.chunk_size
+        last_chunk = max(first_chunk, (end - 1) // self.chunk_size)
+        chunks = self._chunks[name][first_chunk : last_chunk + 1]
+
+        base = first_chunk * self.chunk_size
+        if len(chunks) == 1:
+            return chunks[0][start - base : end - base]
+        if chunks:
+            return np.concatenate(chunks)[start - base : end - base]
+        return np.empty(0, self.dtypes[name])
+
+    def first(self, name: str) -> Any:
+        """
+        Return the oldest kept value of a column, or None if it is empty.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+        """
+        with self.lock:
+            if not self._length:
+                return None
+            return self._chunks[name][0][self._offset].item()
+
+    def last(self, name: str) -> Any:
+        """
+        Return the most recent value of a column, or None if it is empty.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+        """
+        values = self.tail(name, 1)
+        return values[0].item() if len(values) else None
@@ -9,11 +9,13 @@ Classes:
 --------
 VideoAnalysisModule
     Provides functionality to process video frames and calculate motion
-    velocities based on dense optical flow.
+    velocities with one of the estimators registered in
+    `froth_monitor.estimators`.
 
 Imports:
 --------
-- cv2: For video frame processing and optical flow calculations.
+- cv2: For video frame processing.
+- froth_monitor.estimators: For the optical flow algorithms.
 - numpy: For mathematical operations and averaging flow data.
 - random: For generating random colors for visualization.
 - datetime: For timestamp generation.
@@ -28,9 +30,90 @@ the velocity history.
 
 import cv2
 import numpy as np
-from cv2.typing import MatLike
 from typing import cast
 
+from froth_monitor.estimators import FlowEstimator, create_estimator
+
+
+def to_gray(frame: np.ndarray) -> np.ndarray:
+    """
+    Return a single-channel view of the frame, converting from BGR only if needed.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        A BGR frame (H x W x 3) or an already-gray frame (H x W).
+
+    Returns
+    -------
+    np.ndarray
+        The gray frame. Gray input is returned as-is, without copying.
+    """
+    if frame.ndim == 2:
+        return frame
+    return cast(np.ndarray, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+
+
+def fit_frame(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Resize the frame to fit in a width x height box, keeping its aspect ratio.
+
+    This is the single resize of the display path: the result is shown as it is,
+    without a further scaling step in Qt.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        The frame to resize, either gray or BGR.
+    width : int
+        The width of the box in pixels.
+    height : int
+        The height of the box in pixels.
+
+    Returns
+    -------
+    np.ndarray
+        The resized frame. A frame that already fits exactly is returned as-is.
+    """
+    frame_height, frame_width = frame.shape[:2]
+    scale = min(width / frame_width, height / frame_height)
+    size = (
+        max(1, int(frame_width * scale)),
+        max(1, int(frame_height * scale)),
+    )
+    if size == (frame_width, frame_height):
+        return frame
+    # Bilinear rather than area interpolation: a display frame is due every few
+    # milliseconds, and area averaging a 4K frame alone takes longer than that
+    return cast(np.ndarray, cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR))
+
+
+def scale_frame(frame: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Resize the frame by a uniform factor for analysis.
+
+    Downscaling uses area interpolation, which averages the source pixels and
+    avoids the aliasing that would otherwise show up as spurious motion.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        The frame to resize.
+    scale : float
+        The resize factor, e.g. 0.5 for half resolution.
+
+    Returns
+    -------
+    np.ndarray
+        The resized frame. At a scale of 1 the frame is returned as-is.
+    """
+    if scale == 1.0:
+        return frame
+    return cast(
+        np.ndarray,
+        cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA),
+    )
+
 
 class VideoAnalysis:
     """
@@ -43,8 +126,8 @@ class VideoAnalysis:
 
     Attributes:
     ----------
-    previous_frame : np.ndarray
-        The last processed frame for motion analysis.
+    previous_frame : np.ndarray | None
+        The last processed gray frame for motion analysis.
     velocity_history : list
         Stores the history of motion velocities and timestamps for each frame.
     color : tuple[int, int, int]
@@ -55,6 +138,10 @@ class VideoAnalysis:
         The x component of the scrolling axis direction.
     arrow_dir_y : float
         The y component of the scrolling axis direction.
+    current_algorithm : str
+        The name of the registered estimator in use.
+    estimator : FlowEstimator
+        The estimator instance, which keeps any per-region state between frames.
 
     Methods:
     -------
@@ -86,94 +173,147 @@ class VideoAnalysis:
             The y direction for the scrolling axis (positive is down, negative is up).
         """
 
-        self.previous_frame = None  # Store the previous frame for motion analysis
+        # Store the previous frame for motion analysis
+        self.previous_frame: np.ndarray | None = None
         self.current_velocity = 0
         self.arrow_dir_x = arrow_dir_x
         self.arrow_dir_y = arrow_dir_y
-        self.current_algorithm = "Farneback"  # or "lucas-kanade"
+        self.current_algorithm = "Farneback"
+        self.estimator: FlowEstimator = create_estimator(self.current_algorithm)
 
-        self.lk_params = dict(
-            winSize=(15, 15),
-            maxLevel=2,
-            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
-        )
+    @property
+    def confidence(self) -> float | None:
+        """
+        The confidence of the last estimate, if the estimator provides one.
+        """
+        return self.estimator.confidence
 
-        self.of_params = dict(
-            pyr_scale=0.5,
-            levels=int(3),
-            winsize=int(15),
-            iterations=int(3),
-            poly_n=int(7),
-            poly_sigma=1.5,
-        )
+    def set_algorithm(self, algorithm: str, params: dict | None = None) -> None:
+        """
+        Select the estimator and its parameters.
+
+        A new estimator is only created when the algorithm changes, so per-region
+        state (tracked points, flow buffers, DIS instances) survives parameter
+        updates.
+
+        Parameters
+        ----------
+        algorithm : str
+            The name of a registered estimator.
+        params : dict | None
+            The estimator parameters; None keeps the current ones.
+        """
+        if algorithm != self.current_algorithm:
+            self.estimator = create_estimator(algorithm, params)
+            self.current_algorithm = algorithm
+        elif params is not None:
+            self.estimator.set_params(params)
 
     def analyze(self, current_frame: np.ndarray) -> tuple[float, float]:
+        """
+        Estimate the mean motion between the cached previous frame and this one.
+
+        Parameters
+        ----------
+        current_frame : np.ndarray
+            The current frame. Gray frames (H x W) are used directly, so callers
+            that already hold a gray image can pass a view of it; BGR frames are
+            converted once here.
+
+        Returns
+        -------
+        tuple[float, float]
+            The mean (dx, dy) displacement in pixels, or (None, None) for the
+            first frame.
+        """
+        gray_current = to_gray(current_frame)
+
         if self.previous_frame is None:
-            self.previous_frame = current_frame
-            self.prev_pts = None
+            self.previous_frame = gray_current
+            self.estimator.reset()
             return cast(float, None), cast(float, None)
 
-        gray_current: MatLike = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
-        gray_previous: MatLike = cv2.cvtColor(self.previous_frame, cv2.COLOR_BGR2GRAY)
-
-        if self.current_algorithm == "Farneback":
-            flow = cv2.calcOpticalFlowFarneback(
-                prev=gray_previous,
-                next=gray_current,
-                flow=cast(MatLike, None),
-                **self.of_params,  # type: ignore
-                flags=0,
-            )  # type: ignore
-
-            flow_x = flow[..., 0]
-            flow_y = flow[..., 1]
-            avg_flow_x = cast(float, np.mean(flow_x))  # type: ignore
-            avg_flow_y = cast(float, np.mean(flow_y))  # type: ignore
-
-        elif self.current_algorithm == "Lucas-Kanade":
-            if getattr(self, "prev_pts", None) is None:
-                # Detect good features to track in the previous frame
-                self.prev_pts = cv2.goodFeaturesToTrack(
-                    gray_previous,
-                    maxCorners=100,
-                    qualityLevel=0.3,
-                    minDistance=7,
-                    blockSize=7,
-                )
-
-            if self.prev_pts is not None:
-                next_pts, status, err = cv2.calcOpticalFlowPyrLK(
-                    gray_previous,
-                    gray_current,
-                    self.prev_pts,
-                    None, # type: ignore
-                    **self.lk_params,  # type: ignore
-                )  # type: ignore
-                good_new = (
-                    next_pts[status == 1] if next_pts is not None else np.array([])
-                )
-                good_old = (
-                    self.prev_pts[status == 1]
-                    if self.prev_pts is not None
-                    else np.array([])
-                )
-
-                if len(good_new) > 0 and len(good_old) > 0:
-                    flow_vectors = good_new - good_old
-                    avg_flow_x = float(np.mean(flow_vectors[:, 0]))  # type: ignore
-                    avg_flow_y = float(np.mean(flow_vectors[:, 1]))  # type: ignore
-
-                else:
-                    avg_flow_x, avg_flow_y = 0.0, 0.0
-                self.prev_pts = (
-                    good_new.reshape(-1, 1, 2) if len(good_new) > 0 else None
-                )
-
-            else:
-                avg_flow_x, avg_flow_y = 0.0, 0.0
-        else:
-            raise ValueError(f"Unknown algorithm: {self.current_algorithm}")
-
-        self.previous_frame = current_frame
+        avg_flow_x, avg_flow_y = self.estimator.estimate(
+            self.previous_frame, gray_current
+        )
+
+        # Cache the gray frame so the next call does not convert it again
+        self.previous_frame = gray_current
 
         return avg_flow_x, avg_flow_y
+
+    def compute_flow(
+        self, gray_previous: np.ndarray, gray_current: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the dense flow field between two gray frames with the current
+        estimator, which must be dense.
+
+        Unlike `analyze`, this does not touch the cached previous frame, so it can
+        be used on regions that are larger than a single ROI (see `cluster_rois`).
+
+        Parameters
+        ----------
+        gray_previous : np.ndarray
+            The earlier gray frame.
+        gray_current : np.ndarray
+            The later gray frame, with the same shape as `gray_previous`.
+
+        Returns
+        -------
+        np.ndarray
+            An H x W x 2 float32 array holding the (dx, dy) flow of every pixel.
+            Estimators may return an internal buffer that the next call overwrites.
+        """
+        return self.estimator.compute_flow(gray_previous, gray_current)
+
+
+def cluster_rois(
+    rects: list[tuple[int, int, int, int]], max_gap: int | None = None
+) -> list[tuple[tuple[int, int, int, int], list[int]]]:
+    """
+    Group ROI rectangles whose bounding boxes overlap or lie close together.
+
+    Dense flow can then be computed once per cluster instead of once per ROI,
+    and each ROI reads its mean flow from its slice of the cluster's field.
+
+    Parameters
+    ----------
+    rects : list[tuple[int, int, int, int]]
+        The ROI rectangles as (x, y, width, height).
+    max_gap : int | None
+        Two clusters are merged when the gap between their bounding boxes is at
+        most this many pixels. None merges everything into one union box.
+
+    Returns
+    -------
+    list[tuple[tuple[int, int, int, int], list[int]]]
+        One entry per cluster: its bounding box as (x, y, width, height) and the
+        indices of the member rectangles in `rects`.
+    """
+    clusters = [([x, y, x + w, y + h], [i]) for i, (x, y, w, h) in enumerate(rects)]
+
+    merged = True
+    while merged and len(clusters) > 1:
+        merged = False
+        for a in range(len(clusters)):
+            for b in range(a + 1, len(clusters)):
+                box_a, box_b = clusters[a][0], clusters[b][0]
+                gap_x = max(box_a[0], box_b[0]) - min(box_a[2], box_b[2])
+                gap_y = max(box_a[1], box_b[1]) - min(box_a[3], box_b[3])
+                if max_gap is None or max(gap_x, gap_y) <= max_gap:
+                    box_a[0] = min(box_a[0], box_b[0])
+                    box_a[1] = min(box_a[1], box_b[1])
+                    box_a[2] = max(box_a[2], box_b[2])
+                    box_a[3] = max(box_a[3], box_b[3])
+                    clusters[a][1].extend(clusters[b][1])
+                    del clusters[b]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return [
+        ((x1, y1, x2 - x1, y2 - y1), sorted(members))
+        for (x1, y1, x2, y2), members in clusters
+    ]
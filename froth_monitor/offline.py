@@ -0,0 +1,612 @@
+"""Offline Analysis Module for Froth Tracker Application.
+
+This module analyses recorded videos without the GUI. Frames are decoded as fast as
+the CPU allows, instead of at the video's native frame rate, and run through the
+same `FrameModel`, `ROI` and `VideoAnalysis` code as the live application. The
+results are written with the same columns as the GUI export.
+
+Several videos can be analysed at once in separate worker processes, and a single
+long video can be split into time segments that are analysed in parallel (see
+`analyze_video_segmented`).
+
+ROI file format:
+----------------
+A JSON file holding either a list of ROI rectangles or an object with the ROIs
+and the calibration. Rectangles are (x, y, width, height) in source-frame pixels.
+
+```json
+{
+    "rois": [[40, 200, 120, 100], [260, 200, 120, 100]],
+    "px2mm": 12.5,
+    "degree": -90.0,
+    "algorithm": "Farneback",
+    "params": {"winsize": 15},
+    "analysis_scale": 1.0,
+    "velocity_window": 1.0,
+    "batched_flow": false,
+    "cluster_gap": 16,
+    "roi_workers": 1,
+    "history_limit": null
+}
+```
+
+With `"batched_flow"`, dense flow is computed once per cluster of ROIs that are
+at most `"cluster_gap"` pixels apart (`null` for one field over all ROIs). `"roi_workers"` threads analyse the ROIs of a
+frame concurrently. `"history_limit"` keeps only the last rows of each history, so
+very long videos are analysed in bounded memory (the export then covers those rows).
+
+Example Usage:
+--------------
+```
+python -m froth_monitor analyze video.mp4 --rois rois.json
+python -m froth_monitor analyze shift_*.mp4 --rois rois.json --jobs 4 --format csv
+python -m froth_monitor analyze long_shift.mp4 --rois rois.json --segments 16
+```
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import cv2
+
+from froth_monitor.estimators import create_estimator
+from froth_monitor.export import collect_export_data, write_movement_csv, write_workbook
+from froth_monitor.fm_model import FrameModel, set_core_budget
+
+# Defaults used when the ROI file does not set a value
+DEFAULT_CONFIG: dict[str, Any] = {
+    "rois": [],
+    "px2mm": 1.0,
+    "degree": -90.0,
+    "algorithm": "Farneback",
+    "params": {},
+    "analysis_scale": 1.0,
+    "velocity_window": 1.0,
+    "batched_flow": False,
+    "cluster_gap": 16,
+    "roi_workers": 1,
+    "history_limit": None,
+}
+
+# Output formats and their file extensions
+OUTPUT_FORMATS = {"xlsx": ".xlsx", "csv": ".csv"}
+
+
+def load_roi_config(path: str) -> dict[str, Any]:
+    """
+    Load the ROIs and calibration from a JSON file.
+
+    Args:
+        path (str): The path of the ROI file.
+
+    Returns:
+        dict: The configuration, with defaults for any missing value.
+
+    Raises:
+        ValueError: If the file defines no ROIs or a malformed rectangle.
+    """
+    with open(path) as file:
+        loaded = json.load(file)
+
+    if isinstance(loaded, list):
+        loaded = {"rois": loaded}
+
+    config = {**DEFAULT_CONFIG, **loaded}
+    rois = [tuple(int(v) for v in rect) for rect in config["rois"]]
+    if not rois:
+        raise ValueError(f"No ROIs defined in {path}")
+    for rect in rois:
+        if len(rect) != 4 or rect[2] <= 0 or rect[3] <= 0:
+            raise ValueError(
+                f"Invalid ROI {list(rect)} in {path}; expected [x, y, width, height]"
+            )
+
+    config["rois"] = rois
+    return config
+
+
+def frame_time(capture: cv2.VideoCapture, frame_index: int, fps: float) -> float:
+    """
+    Return the media time of the frame just read, in seconds.
+
+    Args:
+        capture (cv2.VideoCapture): The capture the frame was read from.
+        frame_index (int): The zero-based index of the frame.
+        fps (float): The frame rate of the video, used when the backend does
+            not report the position.
+
+    Returns:
+        float: The time of the frame since the start of the video.
+    """
+    timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+    if timestamp <= 0 and frame_index > 0:
+        timestamp = frame_index / fps
+    return timestamp
+
+
+def create_frame_model(config: dict[str, Any]) -> FrameModel:
+    """
+    Create a FrameModel set up with the ROIs and calibration of a configuration.
+
+    Args:
+        config (dict): The configuration from `load_roi_config`.
+
+    Returns:
+        FrameModel: The frame model, with one ROI per configured rectangle.
+    """
+    frame_model = FrameModel()
+    frame_model.verbose = False
+    frame_model.px2mm = float(config["px2mm"])
+    frame_model.degree = float(config["degree"])
+    history_limit = config.get("history_limit", DEFAULT_CONFIG["history_limit"])
+    frame_model.set_history_limit(None if history_limit is None else int(history_limit))
+    frame_model.set_analysis_scale(float(config["analysis_scale"]))
+    frame_model.set_velocity_window(
+        float(config.get("velocity_window", DEFAULT_CONFIG["velocity_window"]))
+    )
+    cluster_gap = config.get("cluster_gap", DEFAULT_CONFIG["cluster_gap"])
+    frame_model.set_batched_flow(
+        bool(config.get("batched_flow", DEFAULT_CONFIG["batched_flow"])),
+        None if cluster_gap is None else int(cluster_gap),
+    )
+    frame_model.set_roi_workers(
+        int(config.get("roi_workers", DEFAULT_CONFIG["roi_workers"]))
+    )
+
+    algorithm = config["algorithm"]
+    frame_model.current_algorithm = algorithm
+    frame_model.get_params(algorithm).update(config["params"])
+
+    for rect in config["rois"]:
+        frame_model.add_roi(rect)
+    return frame_model
+
+
+def analyze_video(
+    video_path: str, config: dict[str, Any], max_frames: int | None = None
+) -> dict[str, Any]:
+    """
+    Analyse a video file as fast as it can be decoded.
+
+    Frames are timestamped with their media time, so velocities are measured
+    per second of video rather than per second of processing.
+
+    Args:
+        video_path (str): The path of the video.
+        config (dict): The configuration from `load_roi_config`.
+        max_frames (int | None): Stop after this many frames, or None for all.
+
+    Returns:
+        dict: The export data from `collect_export_data`, plus the number of
+        frames analysed under "Frames".
+
+    Raises:
+        OSError: If the video cannot be opened.
+    """
+    capture = open_video(video_path)
+    fps = video_fps(capture)
+
+    frame_model = create_frame_model(config)
+    frame_index = 0
+    try:
+        while max_frames is None or frame_index < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frame_model.process_frame(frame, frame_time(capture, frame_index, fps))
+            frame_index += 1
+    finally:
+        capture.release()
+        frame_model.close()
+
+    return export_frame_model(frame_model, frame_index)
+
+
+def open_video(video_path: str) -> cv2.VideoCapture:
+    """
+    Open a video file for decoding.
+
+    Raises:
+        OSError: If the video cannot be opened.
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise OSError(f"Cannot open video: {video_path}")
+    return capture
+
+
+def video_fps(capture: cv2.VideoCapture) -> float:
+    """Return the frame rate of an open video."""
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 30.0  # Default to 30 FPS if unable to determine, as CameraThread does
+    return fps
+
+
+def export_frame_model(frame_model: FrameModel, frames: int) -> dict[str, Any]:
+    """Return the export data of a frame model, plus the number of frames analysed."""
+    data = collect_export_data(
+        frame_model.roi_list,
+        frame_model.degree,
+        frame_model.px2mm,
+        frame_model.analysis_scale,
+    )
+    data["Frames"] = frames
+    return data
+
+
+def is_segmentable(config: dict[str, Any]) -> bool:
+    """
+    Return whether a video can be split into segments for this configuration.
+
+    Splitting is exact only if the estimator is stateless, i.e. each delta
+    depends on nothing but the two frames it compares.
+    """
+    return create_estimator(config["algorithm"], config["params"]).is_stateless()
+
+
+def plan_segments(frame_count: int, segments: int) -> list[tuple[int, int]]:
+    """
+    Split the frames of a video into contiguous, nearly equal segments.
+
+    Args:
+        frame_count (int): The number of frames to analyse.
+        segments (int): The number of segments wanted.
+
+    Returns:
+        list[tuple[int, int]]: The (start, stop) frame range of each segment,
+        in order. Fewer segments are returned for very short videos.
+    """
+    segments = max(1, min(segments, frame_count // 2 or 1))
+    bounds = [round(i * frame_count / segments) for i in range(segments + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(segments)]
+
+
+def _seek(
+    capture: cv2.VideoCapture, video_path: str, frame_index: int
+) -> cv2.VideoCapture:
+    """
+    Position a capture so the next read returns `frame_index`.
+
+    Falls back to reading from the start when the backend cannot seek to the
+    exact frame, so the segment always sees the same frames as a serial run.
+    """
+    if frame_index == 0:
+        return capture
+
+    capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index:
+        return capture
+
+    capture.release()
+    capture = open_video(video_path)
+    for _ in range(frame_index):
+        if not capture.grab():
+            break
+    return capture
+
+
+def compute_segment_deltas(
+    video_path: str, config: dict[str, Any], start: int, stop: int | None
+) -> list[tuple[float, list[tuple[float, float]]]]:
+    """
+    Compute the media time and per-ROI deltas of the frames in [start, stop).
+
+    The segment also decodes frame `start - 1`, so the first delta compares
+    against the same previous frame as a serial run. The deltas go through the
+    same `FrameModel.process_frame` code as a serial run, so they are identical.
+
+    Args:
+        video_path (str): The path of the video.
+        config (dict): The configuration from `load_roi_config`.
+        start (int): The first frame of the segment.
+        stop (int | None): The frame after the last one of the segment, or None
+            to read to the end of the video.
+
+    Returns:
+        list[tuple[float, list[tuple[float, float]]]]: For each frame of the
+        segment, its media time and the delta_pixels of every ROI. The first
+        frame of the video has (None, None).
+    """
+    first = max(0, start - 1)
+    capture = _seek(open_video(video_path), video_path, first)
+    fps = video_fps(capture)
+    frame_model = create_frame_model(config)
+
+    deltas = []
+    frame_index = first
+    try:
+        while stop is None or frame_index < stop:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            timestamp = frame_time(capture, frame_index, fps)
+            frame_model.process_frame(frame, timestamp)
+            if frame_index >= start:
+                deltas.append(
+                    (timestamp, [roi.delta_pixels for roi in frame_model.roi_list])
+                )
+            frame_index += 1
+    finally:
+        capture.release()
+        frame_model.close()
+    return deltas
+
+
+def analyze_video_segmented(
+    video_path: str,
+    config: dict[str, Any],
+    segments: int,
+    max_frames: int | None = None,
+) -> dict[str, Any]:
+    """
+    Analyse one video by splitting it into time segments analysed in parallel.
+
+    Each worker process seeks to its own segment and returns the raw per-ROI
+    deltas. The deltas are then replayed in frame order through
+    `ROI.record_delta`, so the velocities, averages and export data are
+    identical to `analyze_video`. Stateful estimators (e.g. Lucas-Kanade or
+    a warm-started Farneback) cannot be split and are analysed serially.
+
+    Args:
+        video_path (str): The path of the video.
+        config (dict): The configuration from `load_roi_config`.
+        segments (int): The number of segments, and of worker processes.
+        max_frames (int | None): Stop after this many frames, or None for all.
+
+    Returns:
+        dict: The export data, as returned by `analyze_video`.
+    """
+    if segments <= 1 or not is_segmentable(config):
+        if segments > 1:
+            print(
+                f"{config['algorithm']} carries state between frames; "
+                f"analysing {video_path} serially",
+                file=sys.stderr,
+            )
+        return analyze_video(video_path, config, max_frames)
+
+    capture = open_video(video_path)
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    if max_frames is not None:
+        frame_count = min(frame_count, max_frames)
+
+    plan: list[tuple[int, int | None]] = list(plan_segments(frame_count, segments))
+    if max_frames is None:
+        # The container's frame count can be approximate; read the tail to the end
+        plan[-1] = (plan[-1][0], None)
+    with ProcessPoolExecutor(
+        max_workers=len(plan), initializer=_init_worker_process, initargs=(len(plan),)
+    ) as executor:
+        futures = [
+            executor.submit(compute_segment_deltas, video_path, config, start, stop)
+            for start, stop in plan
+        ]
+        segment_deltas = [future.result() for future in futures]
+
+    # Replay the deltas in frame order through the normal bookkeeping
+    frame_model = create_frame_model(config)
+    frame_index = 0
+    for deltas in segment_deltas:
+        for timestamp, frame_deltas in deltas:
+            frame_model.frame_count += 1
+            for roi, delta in zip(frame_model.roi_list, frame_deltas):
+                roi.record_delta(delta, timestamp)
+            frame_index += 1
+    frame_model.close()
+
+    return export_frame_model(frame_model, frame_index)
+
+
+def analyze_file(
+    video_path: str,
+    config: dict[str, Any],
+    output_dir: str | None = None,
+    output_format: str = "xlsx",
+    max_frames: int | None = None,
+    segments: int = 1,
+) -> tuple[str, int, float]:
+    """
+    Analyse one video and write the results next to it or to `output_dir`.
+
+    Args:
+        video_path (str): The path of the video.
+        config (dict): The configuration from `load_roi_config`.
+        output_dir (str | None): The output directory, or None for the video's own.
+        output_format (str): "xlsx" for the GUI's workbook layout, or "csv" for
+            one flat table.
+        max_frames (int | None): Stop after this many frames, or None for all.
+        segments (int): Split the video into this many segments analysed in
+            parallel processes.
+
+    Returns:
+        tuple[str, int, float]: The output path, the number of frames analysed
+        and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    data = analyze_video_segmented(video_path, config, segments, max_frames)
+
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    directory = output_dir or os.path.dirname(os.path.abspath(video_path))
+    output_path = os.path.join(directory, stem + OUTPUT_FORMATS[output_format])
+
+    if output_format == "csv":
+        write_movement_csv(output_path, data)
+    else:
+        write_workbook(output_path, data)
+
+    return output_path, data["Frames"], time.perf_counter() - start
+
+
+def _init_worker_process(jobs: int) -> None:
+    """Share the cores between the worker processes instead of oversubscribing them."""
+    set_core_budget(max(1, (os.cpu_count() or 1) // jobs))
+
+
+def analyze_files(
+    video_paths: list[str],
+    config: dict[str, Any],
+    output_dir: str | None = None,
+    output_format: str = "xlsx",
+    jobs: int = 1,
+    max_frames: int | None = None,
+    segments: int = 1,
+) -> list[tuple[str, int, float]]:
+    """
+    Analyse several videos, in parallel worker processes if `jobs` > 1.
+
+    Args:
+        video_paths (list[str]): The paths of the videos.
+        config (dict): The configuration from `load_roi_config`.
+        output_dir (str | None): The output directory, or None for each video's own.
+        output_format (str): "xlsx" or "csv".
+        jobs (int): The number of worker processes.
+        max_frames (int | None): Stop after this many frames, or None for all.
+        segments (int): Split each video into this many parallel segments.
+
+    Returns:
+        list[tuple[str, int, float]]: The result of `analyze_file` for each video,
+        in the order of `video_paths`.
+    """
+    arguments = [
+        (path, config, output_dir, output_format, max_frames, segments)
+        for path in video_paths
+    ]
+
+    jobs = max(1, min(jobs, len(video_paths)))
+    if jobs == 1:
+        return [analyze_file(*args) for args in arguments]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker_process, initargs=(jobs,)
+    ) as executor:
+        return list(executor.map(analyze_file, *zip(*arguments)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser of the `analyze` command.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="froth_monitor analyze",
+        description="Analyse recorded videos without the GUI, as fast as they can be decoded.",
+    )
+    parser.add_argument("videos", nargs="+", help="video files to analyse")
+    parser.add_argument(
+        "--rois", required=True, help="JSON file with the ROIs and calibration"
+    )
+    parser.add_argument(
+        "--output-dir", help="directory for the results (default: next to each video)"
+    )
+    parser.add_argument(
+        "--format", choices=sorted(OUTPUT_FORMATS), default="xlsx", help="output format"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="number of videos analysed in parallel"
+    )
+    parser.add_argument(
+        "--max-frames", type=int, help="analyse at most this many frames per video"
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=1,
+        help="split each video into this many time segments analysed in parallel",
+    )
+    parser.add_argument("--algorithm", help="override the algorithm in the ROI file")
+    parser.add_argument(
+        "--px2mm", type=float, help="override the pixels per mm in the ROI file"
+    )
+    parser.add_argument(
+        "--degree", type=float, help="override the overflow direction in the ROI file"
+    )
+    parser.add_argument(
+        "--scale", type=float, help="override the analysis scale in the ROI file"
+    )
+    parser.add_argument(
+        "--velocity-window",
+        type=float,
+        help="override the span in seconds each velocity is measured over",
+    )
+    parser.add_argument(
+        "--batched-flow",
+        action="store_true",
+        default=None,
+        help="compute dense flow once per cluster of nearby ROIs; faster with many "
+        "ROIs, but the means of ROIs near a cluster border differ slightly",
+    )
+    parser.add_argument(
+        "--cluster-gap",
+        type=int,
+        help="largest gap in pixels between ROIs of one cluster in batched flow "
+        "(negative for one flow field over all ROIs)",
+    )
+    parser.add_argument(
+        "--roi-workers",
+        type=int,
+        help="number of threads analysing the ROIs of each frame concurrently",
+    )
+    parser.add_argument(
+        "--history-limit",
+        type=int,
+        help="keep only the last N frames of each history, for bounded memory; "
+        "the results then cover those frames only",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the `analyze` command.
+
+    Args:
+        argv (list[str] | None): The command-line arguments after "analyze".
+
+    Returns:
+        int: The exit code.
+    """
+    args = build_parser().parse_args(argv)
+
+    config = load_roi_config(args.rois)
+    overrides = {
+        "algorithm": args.algorithm,
+        "px2mm": args.px2mm,
+        "degree": args.degree,
+        "analysis_scale": args.scale,
+        "velocity_window": args.velocity_window,
+        "batched_flow": args.batched_flow,
+        "roi_workers": args.roi_workers,
+        "history_limit": args.history_limit,
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    if args.cluster_gap is not None:
+        config["cluster_gap"] = None if args.cluster_gap < 0 else args.cluster_gap
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = analyze_files(
+        args.videos,
+        config,
+        args.output_dir,
+        args.format,
+        args.jobs,
+        args.max_frames,
+        args.segments,
+    )
+    for output_path, frames, elapsed in results:
+        print(
+            f"{output_path}: {frames} frames in {elapsed:.1f} s ({frames / max(elapsed, 1e-9):.0f} fps)"
+        )
+    print(f"Analysed {len(results)} video(s) in {time.perf_counter() - start:.1f} s")
+    return 0
@@ -55,6 +55,10 @@ class OverlayWidget(QWidget):
 
         # Store video position within the canvas
         self.video_rect = QRect()
+
+        # Overlay pixels per source-frame pixel, used to draw ROIs stored in
+        # source coordinates
+        self.display_scale = 1.0
         
         self.if_algo_config = False
         self.algo_delta_pixels = (0.0, 0.0)
@@ -487,11 +491,11 @@ class OverlayWidget(QWidget):
 
         # Draw each ROI in the list
         for i, roi in enumerate(self.roi_list):
-            # Get the ROI coordinates
-            x1 = roi.coordinate[0]
-            y1 = roi.coordinate[1]
-            x2 = roi.coordinate[2]
-            y2 = roi.coordinate[3]
+            # Get the ROI coordinates, mapped from the source frame to the overlay
+            x1 = int(round(roi.coordinate[0] * self.display_scale))
+            y1 = int(round(roi.coordinate[1] * self.display_scale))
+            x2 = int(round(roi.coordinate[2] * self.display_scale))
+            y2 = int(round(roi.coordinate[3] * self.display_scale))
 
             # Calculate width and height of the ROI
             width = x2
@@ -523,8 +527,12 @@ class OverlayWidget(QWidget):
             painter.drawText(number_x, number_y, sequence_number)
 
             # Draw the moving cross based on delta_pixels if available
-            if roi.delta_pixels is not None:
-                delta_x, delta_y = roi.delta_pixels
+            # (None, None) until the ROI has a previous frame to compare with
+            if roi.delta_pixels is not None and roi.delta_pixels[0] is not None:
+                # delta_pixels are measured on the analysis-scale frame
+                to_display = self.display_scale / roi.analysis_scale
+                delta_x = roi.delta_pixels[0] * to_display
+                delta_y = roi.delta_pixels[1] * to_display
 
                 if roi.cross_position is None:
                     roi.cross_position = int(x1 + x2 // 2), int(y1 + y1 // 2)
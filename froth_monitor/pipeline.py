@@ -0,0 +1,377 @@
+"""Camera Pipeline Module for Froth Tracker Application.
+
+This module defines the `CameraPipeline` class, which holds everything needed to
+monitor one video source: its capture thread, its analysis worker, its frame model
+(with the source's ROIs and calibration) and its frame-rate counters. Several
+pipelines run side by side, one per camera, each in its own threads. The GUI shows
+one of them at a time, while the others keep capturing and analysing. A
+`DisplayScheduler` limits how many frames per second the GUI shows, independently of
+the rate they are analysed at.
+
+All cameras stamp their frames with the same monotonic clock, so the velocities of
+different cameras can be compared in time.
+
+Example Usage:
+--------------
+```python
+pipeline = CameraPipeline("Camera 0")
+pipeline.view = event_handler  # Shows the frames and results of this pipeline
+pipeline.start(0)
+```
+"""
+
+import time
+from typing import Any, Protocol
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from froth_monitor.analysis_worker import AnalysisWorker
+from froth_monitor.camera_thread import CameraThread
+from froth_monitor.fm_model import FrameModel
+from froth_monitor.frame_pool import FramePool
+from froth_monitor.video_recorder import VideoRecorder
+
+# The most frames per second shown on the canvas by default
+DEFAULT_DISPLAY_FPS = 25.0
+
+
+class FrameSource(Protocol):
+    """
+    What a pipeline and the GUI use of its capture, see `CameraThread`.
+
+    `camera_process.RemoteCamera` stands in for a `CameraThread` when the
+    source is captured in a process of its own.
+    """
+
+    frame_pool: FramePool
+    is_video_file: bool
+    speed: float
+    time_origin: float | None
+
+    def start_capture(self, video_source: int | str) -> bool: ...
+    def stop_capture(self) -> None: ...
+    def is_running(self) -> bool: ...
+    def is_paused(self) -> bool: ...
+    def pause(self) -> None: ...
+    def resume(self) -> None: ...
+    def step(self) -> bool: ...
+    def set_speed(self, speed: float) -> None: ...
+    def get_frame_dimensions(self) -> tuple[int, int]: ...
+    def get_fps(self) -> float: ...
+    def release_buffer(self, frame=None) -> None: ...
+    def frame_counts(self) -> dict[str, int]: ...
+    def reset(self) -> None: ...
+
+
+class FrameAnalyser(Protocol):
+    """
+    What a pipeline and the GUI use of its analysis worker, see `AnalysisWorker`.
+
+    `camera_process.RemoteAnalysisWorker` stands in for an `AnalysisWorker`
+    when the source is analysed in a process of its own.
+    """
+
+    @property
+    def frames_submitted(self) -> int: ...
+    @property
+    def frames_dropped(self) -> int: ...
+    @property
+    def frames_failed(self) -> int: ...
+
+    def submit(self, frame: np.ndarray, timestamp: float | None = None) -> None: ...
+    def clear(self) -> None: ...
+    def stop(self) -> None: ...
+
+
+class FrameRateMeter:
+    """
+    The rate at which a frame counter grows, in frames per second.
+
+    Attributes:
+        interval (float): The shortest interval in seconds the rate is measured over.
+        rate (float): The last measured rate.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """
+        Initialize the meter.
+
+        Args:
+            interval: The shortest interval in seconds the rate is measured over.
+        """
+        self.interval = interval
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the measurements.
+        """
+        self.rate = 0.0
+        self._last: tuple[float, int] | None = None
+
+    def update(self, count: int, now: float | None = None) -> float:
+        """
+        Read the counter and return the rate.
+
+        Args:
+            count: The current value of the counter.
+            now: The current monotonic time in seconds, or None for the clock.
+
+        Returns:
+            float: The frames per second over the last full interval.
+        """
+        now = time.perf_counter() if now is None else now
+        if self._last is None or count < self._last[1]:
+            # First reading, or the counter was reset
+            self._last = (now, count)
+            return self.rate
+
+        last_time, last_count = self._last
+        elapsed = now - last_time
+        if elapsed >= self.interval:
+            self.rate = (count - last_count) / elapsed
+            self._last = (now, count)
+        return self.rate
+
+
+class DisplayScheduler:
+    """
+    Decides which delivered frames are shown, at most `max_fps` per second.
+
+    Frames that are not shown are still analysed; they only skip the
+    conversion to a QPixmap and the repaint.
+
+    Attributes:
+        max_fps (float): The most frames shown per second; `math.inf` shows all.
+        shown (int): Number of frames that were due.
+        skipped (int): Number of frames that were not.
+    """
+
+    def __init__(self, max_fps: float = DEFAULT_DISPLAY_FPS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_fps: The most frames shown per second.
+
+        Raises:
+            ValueError: If max_fps is not positive.
+        """
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, max_fps: float) -> None:
+        """
+        Set the most frames shown per second and start counting again.
+
+        Args:
+            max_fps: The display rate; `math.inf` shows every frame.
+
+        Raises:
+            ValueError: If max_fps is not positive.
+        """
+        if not max_fps > 0:
+            raise ValueError("max_fps must be positive")
+        self.max_fps = max_fps
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the schedule and the counters.
+        """
+        self.next_time: float | None = None
+        self.shown = 0
+        self.skipped = 0
+
+    def due(self, now: float | None = None) -> bool:
+        """
+        Decide whether the frame delivered now is shown.
+
+        Args:
+            now: The current monotonic time in seconds, or None for the clock.
+
+        Returns:
+            bool: True to show the frame, False to skip it.
+        """
+        now = time.perf_counter() if now is None else now
+        if self.next_time is not None and now < self.next_time:
+            self.skipped += 1
+            return False
+
+        interval = 1.0 / self.max_fps
+        # Keep to the rate on average, but do not catch up after a gap
+        if self.next_time is None or now - self.next_time > interval:
+            self.next_time = now
+        self.next_time += interval
+        self.shown += 1
+        return True
+
+
+class CameraPipeline(QObject):
+    """
+    One video source with its own capture thread, analysis worker, ROIs and calibration.
+
+    Every delivered frame is handed to the analysis worker and, if a view is
+    attached, shown by it. Frames are released back to the capture thread
+    once both are done with them.
+
+    Attributes:
+        frame_delivered (Signal): Emitted with every delivered frame and its
+            timestamp, before the frame is released; slots that keep the frame
+            must `retain` it in the camera thread's frame pool, or copy it if
+            it comes from a `ProcessPipeline`'s shared ring.
+        name (str): The name the GUI shows for the source.
+        source (int | str | None): The camera index or video path, once started.
+        camera_thread (FrameSource): Captures the frames of the source.
+        frame_model (FrameModel): The ROIs, calibration and results of the source.
+        analysis_worker (FrameAnalyser): Analyses the frames in its own thread.
+        playing (bool): Whether the frames are being shown and analysed.
+        confirm_calibration (bool): Whether the arrow and ruler were confirmed.
+        view: The object that shows the frames and results, with
+            `show_frame(pipeline, frame, timestamp)` and
+            `show_results(pipeline, result)` methods, or None.
+        recorder (VideoRecorder | None): Records the frames of the source, if set.
+        capture_rate (FrameRateMeter): Frames captured per second.
+        analysis_rate (FrameRateMeter): Frames analysed per second.
+    """
+
+    frame_delivered = Signal(np.ndarray, float)
+
+    def __init__(self, name: str):
+        """
+        Initialize an idle pipeline and start its analysis worker.
+
+        Args:
+            name: The name the GUI shows for the source.
+        """
+        super().__init__()
+        self.name = name
+        self.source: int | str | None = None
+
+        self.playing = False
+        self.confirm_calibration = False
+        self.view: Any = None
+        self.recorder: VideoRecorder | None = None
+
+        self.capture_rate = FrameRateMeter()
+        self.analysis_rate = FrameRateMeter()
+
+        self._init_workers()
+
+    def _init_workers(self) -> None:
+        """
+        Create the capture thread, frame model and analysis worker and connect them.
+        """
+        camera_thread = CameraThread()
+        self.frame_model = FrameModel()
+        # Count the analysis thread when the cores are shared out
+        self.frame_model.set_roi_workers(1)
+        analysis_worker = AnalysisWorker(self.frame_model, camera_thread.frame_pool)
+
+        camera_thread.frame_available.connect(self.handle_frame)
+        analysis_worker.results_ready.connect(self.handle_results)
+        analysis_worker.start()
+        self.camera_thread: FrameSource = camera_thread
+        self.analysis_worker: FrameAnalyser = analysis_worker
+
+    def start(self, source: int | str) -> bool:
+        """
+        Start capturing from a camera or video file and play it.
+
+        Args:
+            source: A camera index or a video file path.
+
+        Returns:
+            bool: True if the source was opened.
+        """
+        if not self.camera_thread.start_capture(source):
+            return False
+        self.source = source
+        self.playing = True
+        self.capture_rate.reset()
+        self.analysis_rate.reset()
+        return True
+
+    def handle_frame(self, frame: np.ndarray, timestamp: float) -> None:
+        """
+        Analyse, show and record a frame delivered by the capture thread.
+
+        Args:
+            frame: The new frame.
+            timestamp: The capture time of the frame in seconds.
+        """
+        try:
+            self.frame_delivered.emit(frame, timestamp)
+            # While paused, the only frames delivered are the stepped ones
+            if self.playing or self.camera_thread.is_paused():
+                # If the worker is still busy, the newest frame replaces the one
+                # waiting, so neither the capture nor the display waits for it
+                self.analysis_worker.submit(frame, timestamp)
+                if self.view is not None:
+                    self.view.show_frame(self, frame, timestamp)
+                if self.recorder is not None and self.recorder.is_active():
+                    self.recorder.record_frame(frame)
+        finally:
+            self.camera_thread.release_buffer(frame)
+
+    def handle_results(self, result: dict) -> None:
+        """
+        Pass the results of an analysed frame to the view.
+
+        Args:
+            result: The result dict from `AnalysisWorker.process`.
+        """
+        if self.view is not None:
+            self.view.show_results(self, result)
+
+    def rates(self) -> tuple[float, float]:
+        """
+        Return the capture and analysis rates.
+
+        Returns:
+            tuple[float, float]: Frames captured and analysed per second.
+        """
+        return (
+            self.capture_rate.update(self.camera_thread.frame_counts()["captured"]),
+            self.analysis_rate.update(self.frame_model.frame_count),
+        )
+
+    def frame_counts(self) -> dict[str, int]:
+        """
+        Return how many frames were captured, shown and analysed.
+
+        Returns:
+            dict[str, int]: The frame counts, labelled for the export.
+        """
+        counts = self.camera_thread.frame_counts()
+        return {
+            "Frames captured": counts["captured"],
+            "Frames delivered": counts["delivered"],
+            "Frames dropped": counts["dropped"],
+            "Frames dropped before decoding": counts["skipped"],
+            "Frames submitted for analysis": self.analysis_worker.frames_submitted,
+            "Frames skipped by analysis": self.analysis_worker.frames_dropped,
+            "Frames failed in analysis": self.analysis_worker.frames_failed,
+            "Frames analysed": self.frame_model.frame_count,
+        }
+
+    def reset(self) -> None:
+        """
+        Stop the source and clear the ROIs, calibration and results.
+        """
+        self.camera_thread.reset()
+        self.analysis_worker.clear()
+        self.frame_model.reset()
+        self.playing = False
+        self.confirm_calibration = False
+        self.capture_rate.reset()
+        self.analysis_rate.reset()
+
+    def close(self) -> None:
+        """
+        Stop the capture and analysis threads for good.
+        """
+        self.view = None
+        self.camera_thread.stop_capture()
+        self.analysis_worker.stop()
+        self.frame_model.close()
@@ -0,0 +1,226 @@
+"""Rolling Statistics Module for Froth Tracker Application.
+
+This module keeps running statistics of a time series over sliding time windows,
+such as the mean, standard deviation, minimum and maximum of an ROI's velocity
+over the past 10 s, 30 s, 5 min and 1 h. Every sample updates all windows in
+constant amortised time, so the statistics are always current and reading them
+costs nothing.
+
+Classes:
+--------
+RollingWindow
+    Statistics of the samples in one sliding time window.
+RollingStats
+    A set of `RollingWindow`s fed with the same samples.
+
+Example Usage:
+--------------
+```python
+stats = RollingStats((10.0, 30.0, 300.0))
+stats.add(timestamp, velocity)
+
+window = stats.windows[30.0]
+print(window.mean, window.std, window.min, window.max)
+```
+"""
+
+import math
+from collections import deque
+
+# Default windows in seconds: 10 s, 30 s, 5 min and 1 h
+DEFAULT_WINDOWS = (10.0, 30.0, 300.0, 3600.0)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a window length for display, e.g. "30 s", "5 min" or "1 h".
+
+    Args:
+        seconds (float): The window length in seconds.
+
+    Returns:
+        str: The length in the largest unit that divides it.
+    """
+    for unit, size in (("h", 3600), ("min", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{int(seconds // size)} {unit}"
+    return f"{seconds:g} s"
+
+
+class RollingWindow:
+    """
+    Running statistics of the samples of the last `duration` seconds.
+
+    The mean and variance are kept with Welford's update, applied in reverse
+    when a sample leaves the window, and the extremes with monotonic queues,
+    so adding a sample costs constant amortised time whatever the window
+    length. The variance is recomputed exactly every so often to stop
+    rounding errors from accumulating in long sessions.
+
+    Attributes:
+        duration (float): The window length in seconds.
+        count (int): The number of samples in the window.
+        mean (float): The mean of the samples, or NaN if there are none.
+    """
+
+    def __init__(self, duration: float):
+        """
+        Initialize an empty window.
+
+        Args:
+            duration (float): The window length in seconds.
+        """
+        if duration <= 0:
+            raise ValueError("duration must be positive")
+        self.duration = duration
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every sample from the window.
+        """
+        self.samples: deque[tuple[float, float]] = deque()
+        self.count = 0
+        self.mean = math.nan
+        self._m2 = 0.0
+        self._removals = 0
+
+        # (sequence number, value) candidates for the extremes, and the
+        # sequence numbers of the next sample and of the oldest one kept
+        self._min_queue: deque[tuple[int, float]] = deque()
+        self._max_queue: deque[tuple[int, float]] = deque()
+        self._next_sequence = 0
+        self._first_sequence = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """
+        Add a sample and drop the samples that fell out of the window.
+
+        Args:
+            timestamp (float): The time of the sample in seconds.
+            value (float): The sample.
+        """
+        if self.samples and timestamp < self.samples[-1][0]:
+            # The clock restarted (e.g. a replayed video); start over
+            self.clear()
+
+        self.samples.append((timestamp, value))
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            self._m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((sequence, value))
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((sequence, value))
+
+        self._expire(timestamp - self.duration)
+
+    def _expire(self, cutoff: float) -> None:
+        """
+        Remove the samples taken at or before `cutoff`.
+        """
+        while self.samples and self.samples[0][0] <= cutoff:
+            _, value = self.samples.popleft()
+            self._first_sequence += 1
+            self.count -= 1
+            if self.count == 0:
+                self.mean = math.nan
+                self._m2 = 0.0
+            else:
+                delta = value - self.mean
+                self.mean -= delta / self.count
+                self._m2 -= delta * (value - self.mean)
+            self._removals += 1
+
+        while self._min_queue and self._min_queue[0][0] < self._first_sequence:
+            self._min_queue.popleft()
+        while self._max_queue and self._max_queue[0][0] < self._first_sequence:
+            self._max_queue.popleft()
+
+        # Recomputing once per window length of removals keeps the cost
+        # amortised constant
+        if self._removals >= max(self.count, 64):
+            self._recompute()
+
+    def _recompute(self) -> None:
+        """
+        Recompute the mean and variance exactly from the samples in the window.
+        """
+        self._removals = 0
+        if not self.samples:
+            return
+        values = [value for _, value in self.samples]
+        self.mean = math.fsum(values) / self.count
+        self._m2 = math.fsum((value - self.mean) ** 2 for value in values)
+
+    @property
+    def std(self) -> float:
+        """
+        The sample standard deviation, or NaN with fewer than two samples.
+        """
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+    @property
+    def min(self) -> float:
+        """
+        The smallest sample in the window, or NaN if it is empty.
+        """
+        return self._min_queue[0][1] if self._min_queue else math.nan
+
+    @property
+    def max(self) -> float:
+        """
+        The largest sample in the window, or NaN if it is empty.
+        """
+        return self._max_queue[0][1] if self._max_queue else math.nan
+
+
+class RollingStats:
+    """
+    Rolling statistics of one time series over several window lengths.
+
+    Attributes:
+        windows (dict[float, RollingWindow]): The windows, keyed by their
+            length in seconds, shortest first.
+    """
+
+    def __init__(self, durations: tuple[float, ...] = DEFAULT_WINDOWS):
+        """
+        Initialize empty windows.
+
+        Args:
+            durations (tuple[float, ...]): The window lengths in seconds.
+        """
+        self.windows = {
+            duration: RollingWindow(duration) for duration in sorted(durations)
+        }
+
+    def add(self, timestamp: float, value: float) -> None:
+        """
+        Add a sample to every window.
+
+        Args:
+            timestamp (float): The time of the sample in seconds.
+            value (float): The sample.
+        """
+        for window in self.windows.values():
+            window.add(timestamp, value)
+
+    def clear(self) -> None:
+        """
+        Remove every sample from every window.
+        """
+        for window in self.windows.values():
+            window.clear()
@@ -0,0 +1,308 @@
+"""Rollup Module for Froth Tracker Application.
+
+This module defines the `RollupStore` class, a multi-resolution in-memory store for
+a time series such as an ROI's velocity. It keeps the raw samples of the last few
+minutes and summarises older data into 1 s, 1 min and 1 h buckets (mean, min, max
+and count). Every level holds a bounded number of rows, so memory stays flat in
+sessions that run for days, and a plot of any time span reads a few hundred points
+from the level that suits it.
+
+Classes:
+--------
+RollupTier
+    Fixed-width buckets summarising the samples that fall into them.
+RollupStore
+    Raw samples plus a set of `RollupTier`s fed with the same samples.
+
+Example Usage:
+--------------
+```python
+store = RollupStore()
+store.add(timestamp, velocity)
+
+# Everything needed to plot the last day, from the 1 min buckets
+series = store.query(span=86400.0)
+plot(series["timestamp"], series["mean"])
+```
+"""
+
+import math
+from typing import cast
+
+import numpy as np
+
+from froth_monitor.history import ColumnarHistory
+
+# Raw samples are kept for this many seconds
+RAW_SPAN = 600.0
+
+# (bucket width in seconds, number of buckets kept): 1 s buckets for 6 hours,
+# 1 min buckets for a week and 1 h buckets for a year
+DEFAULT_TIERS = ((1.0, 6 * 3600), (60.0, 7 * 24 * 60), (3600.0, 365 * 24))
+
+# The most points a query returns from a rollup tier, before picking a coarser one
+MAX_POINTS = 1000
+
+RAW_COLUMNS = {"timestamp": np.float64, "value": np.float64}
+
+BUCKET_COLUMNS = {
+    "start": np.float64,
+    "mean": np.float64,
+    "min": np.float64,
+    "max": np.float64,
+    "count": np.int64,
+}
+
+
+class RollupTier:
+    """
+    Summaries of a time series in buckets of `width` seconds.
+
+    Buckets are aligned to multiples of `width`. The bucket that is still
+    filling is kept apart and only written to `history` once a sample falls
+    into a later bucket.
+
+    Attributes:
+        width (float): The bucket width in seconds.
+        history (ColumnarHistory): The closed buckets, at most `capacity` of them.
+    """
+
+    def __init__(self, width: float, capacity: int):
+        """
+        Initialize an empty tier.
+
+        Args:
+            width (float): The bucket width in seconds.
+            capacity (int): The number of closed buckets kept.
+        """
+        self.width = width
+        self.history = ColumnarHistory(BUCKET_COLUMNS, capacity=capacity)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every bucket.
+        """
+        self.history.clear()
+        self.open_start: float | None = None
+        self.open_sum = 0.0
+        self.open_min = math.inf
+        self.open_max = -math.inf
+        self.open_count = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """
+        Add a sample to its bucket, closing the previous bucket if needed.
+
+        Args:
+            timestamp (float): The time of the sample in seconds.
+            value (float): The sample.
+        """
+        start = math.floor(timestamp / self.width) * self.width
+        if start != self.open_start:
+            if self.open_count:
+                self.history.append(*self._open_row())
+            self.open_start = start
+            self.open_sum = 0.0
+            self.open_min = math.inf
+            self.open_max = -math.inf
+            self.open_count = 0
+
+        self.open_sum += value
+        self.open_min = min(self.open_min, value)
+        self.open_max = max(self.open_max, value)
+        self.open_count += 1
+
+    def _open_row(self) -> tuple[float, float, float, float, int]:
+        """
+        Return the bucket that is still filling as a (start, mean, min, max, count) row.
+
+        Only called while the bucket holds samples, so `open_start` is set.
+        """
+        return (
+            cast(float, self.open_start),
+            self.open_sum / self.open_count,
+            self.open_min,
+            self.open_max,
+            self.open_count,
+        )
+
+    def covers(self, since: float) -> bool:
+        """
+        Return whether the tier still holds every bucket from `since` onwards.
+        """
+        return self.history.dropped == 0 or self.history.first("start") <= since
+
+    def query(self, since: float) -> dict[str, np.ndarray]:
+        """
+        Return the buckets that end after `since`, including the open one.
+
+        Args:
+            since (float): The start of the requested span in seconds.
+
+        Returns:
+            dict[str, np.ndarray]: The bucket columns.
+        """
+        count = int(math.ceil(max(0.0, self._latest_end() - since) / self.width)) + 1
+        columns = {name: self.history.tail(name, count) for name in BUCKET_COLUMNS}
+        if self.open_count:
+            for name, value in zip(BUCKET_COLUMNS, self._open_row()):
+                columns[name] = np.append(columns[name], value)
+
+        keep = columns["start"] + self.width > since
+        return {name: values[keep] for name, values in columns.items()}
+
+    def _latest_end(self) -> float:
+        """
+        Return the end time of the most recent bucket.
+        """
+        if self.open_start is not None:
+            return self.open_start + self.width
+        last = self.history.last("start")
+        return last + self.width if last is not None else 0.0
+
+
+class RollupStore:
+    """
+    A time series kept at several resolutions with bounded memory.
+
+    Raw samples are kept for `raw_span` seconds. Every sample is also added to
+    each tier's current bucket, which costs constant time per tier, and each
+    tier keeps a fixed number of buckets.
+
+    Attributes:
+        raw_span (float): How long raw samples are kept, in seconds.
+        raw (ColumnarHistory): The recent samples, with "timestamp" and "value" columns.
+        tiers (list[RollupTier]): The rollup tiers, finest first.
+        latest (float | None): The timestamp of the most recent sample.
+    """
+
+    def __init__(
+        self,
+        raw_span: float = RAW_SPAN,
+        tiers: tuple[tuple[float, int], ...] = DEFAULT_TIERS,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            raw_span (float): How long raw samples are kept, in seconds.
+            tiers (tuple[tuple[float, int], ...]): The (bucket width in seconds,
+                number of buckets kept) of each tier.
+        """
+        self.raw_span = raw_span
+        self.raw = ColumnarHistory(RAW_COLUMNS, chunk_size=1024)
+        self.tiers = [RollupTier(width, capacity) for width, capacity in sorted(tiers)]
+        self.latest: float | None = None
+
+    def __len__(self) -> int:
+        """
+        Return the number of raw samples kept.
+        """
+        return len(self.raw)
+
+    def clear(self) -> None:
+        """
+        Remove every sample and bucket.
+        """
+        self.raw.clear()
+        for tier in self.tiers:
+            tier.clear()
+        self.latest = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """
+        Add a sample to the raw samples and to every tier.
+
+        Args:
+            timestamp (float): The time of the sample in seconds.
+            value (float): The sample.
+        """
+        if self.latest is not None and timestamp < self.latest:
+            # The clock restarted (e.g. a replayed video); start over
+            self.clear()
+        self.latest = timestamp
+
+        self.raw.append(timestamp, value)
+        cutoff = timestamp - self.raw_span
+        while len(self.raw) > 1 and self.raw.first("timestamp") <= cutoff:
+            self.raw.discard(1)
+
+        for tier in self.tiers:
+            tier.add(timestamp, value)
+
+    def select(self, span: float, max_points: int = MAX_POINTS) -> RollupTier | None:
+        """
+        Pick the finest level that holds the whole span in at most `max_points` points.
+
+        Args:
+            span (float): The length of the span ending at the latest sample, in seconds.
+            max_points (int): The most points the plot should draw.
+
+        Returns:
+            RollupTier | None: The tier to read, or None for the raw samples.
+        """
+        if self.latest is None:
+            return None
+        since = self.latest - span
+
+        if self.raw.dropped == 0 or self.raw.first("timestamp") <= since:
+            timestamps = self.raw["timestamp"]
+            if (
+                len(timestamps) - np.searchsorted(timestamps, since, side="right")
+                <= max_points
+            ):
+                return None
+
+        for tier in self.tiers:
+            if tier.covers(since) and span / tier.width <= max_points:
+                return tier
+        return self.tiers[-1] if self.tiers else None
+
+    def query(
+        self, span: float, max_points: int = MAX_POINTS
+    ) -> dict[str, np.ndarray | float]:
+        """
+        Return the series over the last `span` seconds at a suitable resolution.
+
+        Args:
+            span (float): The length of the span ending at the latest sample, in seconds.
+            max_points (int): The most points the plot should draw.
+
+        Returns:
+            dict: "timestamp", "mean", "min" and "max" arrays, and the
+            "resolution" in seconds (0 for raw samples). Bucket timestamps are
+            the bucket centres; raw samples have equal mean, min and max.
+        """
+        empty = np.empty(0)
+        if self.latest is None:
+            return {
+                "timestamp": empty,
+                "mean": empty,
+                "min": empty,
+                "max": empty,
+                "resolution": 0.0,
+            }
+
+        since = self.latest - span
+        tier = self.select(span, max_points)
+        if tier is None:
+            timestamps = self.raw["timestamp"]
+            keep = timestamps > since
+            values = self.raw["value"][keep]
+            return {
+                "timestamp": timestamps[keep],
+                "mean": values,
+                "min": values,
+                "max": values,
+                "resolution": 0.0,
+            }
+
+        buckets = tier.query(since)
+        return {
+            "timestamp": buckets["start"] + tier.width / 2,
+            "mean": buckets["mean"],
+            "min": buckets["min"],
+            "max": buckets["max"],
+            "resolution": tier.width,
+        }
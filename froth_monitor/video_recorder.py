@@ -158,7 +158,11 @@ class VideoRecorder(QObject):
             frame = cv2.resize(frame, (self.frame_width, self.frame_height))
 
         if not self.is_video_file:
-            self.previous_frame = frame
+            # Keep a copy: the frame's buffer is reused for later frames
+            if self.previous_frame is None or self.previous_frame.shape != frame.shape:
+                self.previous_frame = frame.copy()
+            else:
+                np.copyto(self.previous_frame, frame)
             self.previous_frame_time = time.time()
 
         # Write the frame
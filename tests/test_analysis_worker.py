@@ -0,0 +1,80 @@
+"""Tests for the analysis worker."""
+
+import time
+
+import numpy as np
+
+from froth_monitor.analysis_worker import AnalysisWorker
+from froth_monitor.fm_model import FrameModel
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((40, 40), value, dtype=np.uint8)
+
+
+def test_submit_keeps_only_the_latest_frame():
+    """Check that frames submitted while busy replace the pending one."""
+    worker = AnalysisWorker(FrameModel())
+
+    for value in range(3):
+        worker.submit(_frame(value))
+
+    assert worker.frames_submitted == 3
+    assert worker.frames_dropped == 2
+    pending = worker.take_pending()
+    assert pending is not None and pending[0, 0] == 2
+    assert worker.take_pending() is None
+
+
+def test_process_returns_lightweight_results():
+    """Check that a processed frame reports its number and one delta per ROI."""
+    model = FrameModel()
+    model.add_roi((0, 0, 20, 20))
+    worker = AnalysisWorker(model)
+
+    worker.process(_frame(0))
+    result = worker.process(_frame(0))
+
+    assert result["frame_number"] == 2
+    assert len(result["deltas"]) == 1
+    assert result["process_time"] >= 0.0
+
+
+def test_worker_thread_processes_submitted_frames():
+    """Check that the worker thread analyses frames until it is stopped."""
+    model = FrameModel()
+    worker = AnalysisWorker(model)
+    worker.start()
+    try:
+        worker.submit(_frame(0))
+        deadline = time.time() + 5.0
+        while model.frame_count == 0 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        worker.stop()
+
+    assert model.frame_count == 1
+    assert not worker.running
+
+
+def test_worker_thread_counts_failed_frames(capsys):
+    """Check that failing frames are counted and a repeated error is printed once."""
+    model = FrameModel()
+    worker = AnalysisWorker(model)
+    worker.process = lambda frame, timestamp=None: 1 / 0  # type: ignore[method-assign]
+    worker.start()
+    try:
+        for value in range(3):
+            worker.submit(_frame(value))
+            deadline = time.time() + 5.0
+            while worker.frames_failed <= value and time.time() < deadline:
+                time.sleep(0.01)
+    finally:
+        worker.stop()
+
+    assert worker.frames_failed == 3
+    assert worker.last_error == "ZeroDivisionError: division by zero"
+    assert capsys.readouterr().out.count("Error while analysing a frame") == 1
+
+    worker.clear()
+    assert worker.frames_failed == 0 and worker.last_error is None
@@ -0,0 +1,82 @@
+"""Tests for the process-per-camera pipeline."""
+
+import math
+import queue
+import time
+
+from froth_monitor.camera_process import (
+    CameraProcess,
+    ProcessPipeline,
+    RemoteFrameModel,
+)
+
+
+def test_mirror_model_forwards_changes_and_replays_results_by_roi_key():
+    """Check that results are recorded on the ROI they were computed for."""
+    commands = []
+    model = RemoteFrameModel(
+        lambda command, args=None: commands.append((command, args))
+    )
+    model.add_roi((0, 0, 10, 10))
+    model.add_roi((20, 0, 10, 10))
+    model.delete_last_roi()
+    model.add_roi((40, 0, 10, 10))
+    assert [command for command, _ in commands] == [
+        "add_roi",
+        "add_roi",
+        "delete_last_roi",
+        "add_roi",
+    ]
+    assert commands[-1][1] == (2, (40, 0, 10, 10))
+
+    # The deleted ROI (key 1) may still be in a result sent before the delete
+    result = model.apply_result(
+        {
+            "frame_number": 7,
+            "timestamp": 0.28,
+            "deltas": [(0, (1.0, 2.0)), (1, (5.0, 5.0)), (2, (3.0, 4.0))],
+            "process_time": 0.01,
+        }
+    )
+    assert result["frame_number"] == model.frame_count == 7
+    assert result["deltas"] == [(1.0, 2.0), (3.0, 4.0)]
+    assert [len(roi.delta_history) for roi in model.roi_list] == [1, 1]
+
+
+def test_video_is_analysed_in_a_camera_process():
+    """Check a short run of a video in its own process."""
+    pipeline = ProcessPipeline("Video")
+    try:
+        assert pipeline.start("data/test.avi")
+        pipeline.frame_model.add_roi((40, 40, 100, 100))
+        pipeline.camera_thread.set_speed(math.inf)
+
+        deadline = time.monotonic() + 20
+        while pipeline.frame_model.frame_count < 20 and time.monotonic() < deadline:
+            pipeline.poll()
+            time.sleep(0.01)
+
+        assert pipeline.frame_model.frame_count >= 20
+        assert len(pipeline.frame_model.roi_list[0].delta_history) > 0
+        assert pipeline.camera_thread.ring is not None
+        assert pipeline.camera_thread.get_frame_dimensions() != (0, 0)
+    finally:
+        pipeline.close()
+    assert pipeline.camera_thread.process is None
+
+
+def test_failed_commands_are_counted_and_reported_in_the_status():
+    """Check that a failing command leaves the camera process running."""
+    commands, messages = queue.Queue(), queue.Queue()
+    camera_process = CameraProcess(messages)
+    try:
+        for command in [("no_such_command", None), ("speed", 0.0), ("shutdown", None)]:
+            commands.put(command)
+        camera_process.run(commands)
+    finally:
+        camera_process.close()
+
+    status = camera_process.status()
+    assert status["commands_failed"] == 2
+    assert status["command_error"].startswith("speed: ValueError")
+    assert status["frames_failed"] == 0
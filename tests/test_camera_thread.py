@@ -0,0 +1,108 @@
+"""Tests for the frame pacing and decoding choices of the camera thread."""
+
+import math
+import time
+
+import pytest
+from PySide6.QtCore import Qt
+
+from froth_monitor.camera_thread import CameraThread
+
+
+def test_target_rate_decodes_at_most_the_target_fps():
+    """Check that a 25 fps stream is thinned to 10 fps of decoded frames."""
+    camera = CameraThread()
+    camera.set_decode_policy("target-rate", target_fps=10.0)
+    decoded = [i for i in range(100) if camera._should_decode(i / 25.0)]
+
+    assert len(decoded) == 40  # 4 s of video
+    assert decoded[:5] == [0, 3, 5, 8, 10]
+
+
+def test_consumer_ready_skips_frames_while_the_consumer_is_busy():
+    """Check that frames are only decoded once the consumer can take them."""
+    camera = CameraThread()
+    assert camera._should_decode(0.0)
+
+    camera.buffer_size = camera.max_buffer  # A delivered frame is being shown
+    assert not camera._should_decode(0.04)
+
+    camera.set_queue_policy("block", maxsize=2)
+    assert camera._should_decode(0.08)  # A blocking queue loses no frame
+
+    with pytest.raises(ValueError):
+        camera.set_decode_policy("target-rate")
+
+
+def test_pause_step_and_speed_control_the_capture_loop():
+    """Check pacing, stepping while paused and the speed limits on a video."""
+    camera = CameraThread()
+    camera.set_decode_policy("all")
+    assert camera.start_capture("data/test.avi")
+    try:
+        start = time.perf_counter()
+        while camera.frames_read < 11:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        # The 11th frame is grabbed once the 10th is due, at 1x
+        assert elapsed >= 9 * camera.frame_delay * 0.9
+
+        camera.pause()
+        time.sleep(0.1)
+        paused_at = camera.frames_read
+        time.sleep(0.1)
+        assert camera.frames_read == paused_at
+        # The first step delivers the frame held back by the pause, the next
+        # one grabs a new frame
+        assert camera.step()
+        time.sleep(0.1)
+        assert camera.frames_read == paused_at
+        assert camera.step()
+        time.sleep(0.1)
+        assert camera.frames_read == paused_at + 1
+
+        camera.set_speed(math.inf)
+        camera.resume()
+        time.sleep(0.2)
+        assert camera.frames_read > paused_at + 50
+    finally:
+        camera.stop_capture()
+
+    with pytest.raises(ValueError):
+        camera.set_speed(0.1)
+
+
+def test_pause_holds_back_the_frame_waiting_for_its_deadline():
+    """Check that a pause delivers no early frame, and the held one comes next."""
+    camera = CameraThread()
+    camera.set_decode_policy("all")
+    delivered = []
+
+    def receive(frame, timestamp):
+        delivered.append(timestamp)
+        camera.release_buffer(frame)
+
+    camera.frame_available.connect(receive, Qt.ConnectionType.DirectConnection)
+    assert camera.start_capture("data/test.avi")
+    try:
+        while len(delivered) < 3:
+            time.sleep(0.001)
+        # Pause halfway through the wait for the next frame, which was grabbed
+        time.sleep(camera.frame_delay / 2)
+        camera.pause()
+        time.sleep(0.1)
+        assert len(delivered) == camera.frames_read - 1
+
+        assert camera.step()
+        time.sleep(0.1)
+        assert len(delivered) == camera.frames_read
+
+        stepped = len(delivered)
+        camera.resume()
+        while len(delivered) < stepped + 2:
+            time.sleep(0.001)
+        # No frame was skipped or delivered twice
+        gaps = [b - a for a, b in zip(delivered, delivered[1:])]
+        assert gaps == pytest.approx([camera.frame_delay] * len(gaps), abs=1e-3)
+    finally:
+        camera.stop_capture()
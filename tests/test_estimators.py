@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from froth_monitor.estimators import (
+    FlowEstimator,
+    _registry,
+    available_estimators,
+    create_estimator,
+    get_estimator_class,
+    register_estimator,
+)
+from froth_monitor.estimators.lucas_kanade import get_grid_points
+from froth_monitor.image_analysis import VideoAnalysis
+
+
+class ConstantEstimator(FlowEstimator):
+    """Dummy estimator that always reports the configured displacement."""
+
+    name = "Constant"
+    default_params = {"dx": 1.0}
+    param_choices = {"dx": [("1", 1.0), ("2", 2.0)]}
+
+    def estimate(self, gray_previous, gray_current):
+        return self.params["dx"], 0.0
+
+
+def test_builtin_estimators_are_registered():
+    """Check that the built-in algorithms are listed and their params are valid choices."""
+    builtin = [
+        "Farneback",
+        "Lucas-Kanade",
+        "Lucas-Kanade Grid",
+        "DIS",
+        "PhaseCorrelation",
+    ]
+    assert available_estimators()[: len(builtin)] == builtin
+
+    for name in builtin:
+        estimator = get_estimator_class(name)
+        for key, choices in estimator.param_choices.items():
+            assert estimator.default_params[key] in [value for _, value in choices]
+
+
+def test_unknown_estimator_raises():
+    """Check that an unknown name is rejected."""
+    with pytest.raises(ValueError):
+        create_estimator("NoSuchFlow")
+
+
+def test_registered_estimator_is_used_by_video_analysis():
+    """Check that a registered estimator is picked up without other changes."""
+    register_estimator("Constant", ConstantEstimator)
+    try:
+        assert "Constant" in available_estimators()
+
+        analysis = VideoAnalysis(0, 0)
+        analysis.set_algorithm("Constant", {"dx": 2.0})
+        frame = np.zeros((8, 8), dtype=np.uint8)
+        assert analysis.analyze(frame) == (None, None)
+        assert analysis.analyze(frame) == (2.0, 0.0)
+    finally:
+        del _registry["Constant"]
+
+
+@pytest.mark.parametrize("detector", ["Grid", "FAST"])
+def test_grid_lucas_kanade_tops_up_cells_that_are_not_empty(detector):
+    """Check that the point count returns to max_points although no cell is empty."""
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, (200, 200), dtype=np.uint8)
+    estimator = create_estimator("Lucas-Kanade Grid", {"detector": detector})
+    max_points = estimator.params["max_points"]
+
+    # Every one of the 16 cells keeps 3 of its 4 points
+    grid = get_grid_points(200, 200, estimator.params["grid_size"], 4)
+    estimator.prev_pts = grid[:, :3].reshape(-1, 1, 2).copy()
+
+    estimator._refill(texture)
+    assert len(estimator.prev_pts) == max_points
+    # The new points do not duplicate tracked ones
+    points = estimator.prev_pts.reshape(-1, 2)
+    assert len(np.unique(points.round(1), axis=0)) == max_points
+
+
+@pytest.mark.parametrize("grid_size, max_points", [(6, 64), (8, 16)])
+def test_grid_lucas_kanade_shares_the_remainder_between_cells(grid_size, max_points):
+    """Check that max_points are tracked when it is not a multiple of the cell count."""
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, (240, 240), dtype=np.uint8)
+    estimator = create_estimator(
+        "Lucas-Kanade Grid", {"grid_size": grid_size, "max_points": max_points}
+    )
+
+    estimator._refill(texture)
+    assert len(estimator.prev_pts) == max_points
+    # Every cell holds its share give or take one point
+    cells = estimator._cell_index(estimator.prev_pts.reshape(-1, 2), 240, 240)
+    counts = np.bincount(cells, minlength=grid_size * grid_size)
+    assert counts.max() - counts.min() <= 1
@@ -0,0 +1,150 @@
+"""Tests for the frame model."""
+
+import cv2
+import numpy as np
+
+from froth_monitor.fm_model import (
+    ROI,
+    FrameModel,
+    opencv_thread_count,
+    total_roi_workers,
+)
+
+
+def _shifted_frames(shift: int = 4) -> tuple[np.ndarray, np.ndarray]:
+    """Return a smooth random gray texture and a copy shifted right by `shift` pixels."""
+    rng = np.random.default_rng(1)
+    base = rng.integers(0, 255, size=(60, 80), dtype=np.uint8)
+    base = np.repeat(np.repeat(base, 4, axis=0), 4, axis=1)
+    return base, np.roll(base, shift, axis=1)
+
+
+def test_analysis_scale_keeps_roi_in_source_coordinates_and_mm_calibration():
+    """Check that a reduced analysis scale gives the same calibrated motion."""
+    first, second = _shifted_frames()
+
+    calibrated = {}
+    for scale in (1.0, 0.5):
+        model = FrameModel()
+        model.degree = 0.0  # Project onto +x
+        model.set_analysis_scale(scale)
+        model.add_roi((40, 40, 160, 120))
+
+        roi = model.roi_list[0]
+        assert roi.coordinate == (40, 40, 160, 120)
+        assert roi.analysis_rect() == tuple(int(v * scale) for v in (40, 40, 160, 120))
+
+        model.process_frame(first)
+        model.process_frame(second)
+        calibrated[scale] = roi.delta_history.last("calibrated")
+
+    assert abs(calibrated[1.0] - 4.0) < 0.5
+    assert abs(calibrated[0.5] - calibrated[1.0]) < 0.5
+
+
+def test_roi_thread_pool_matches_serial_results_in_order():
+    """Check that concurrent ROI analysis gives the serial results in ROI order."""
+    first, second = _shifted_frames()
+    rects = [(0, 0, 80, 60), (80, 0, 80, 60), (0, 120, 160, 100), (200, 100, 100, 100)]
+
+    histories = {}
+    for workers in (1, 3):
+        model = FrameModel()
+        model.set_roi_workers(workers)
+        for rect in rects:
+            model.add_roi(rect)
+        model.process_frame(first)
+        model.process_frame(second)
+        histories[workers] = [
+            (roi.delta_history.last("dx"), roi.delta_history.last("dy"))
+            for roi in model.roi_list
+        ]
+        model.close()
+
+    assert histories[3] == histories[1]
+
+
+def test_velocity_follows_frame_timestamps_not_processing_rate():
+    """Check that velocities are the displacement per second of capture time."""
+    velocities = {}
+    for step in (1, 2):  # Every frame, or every other frame as when frames are skipped
+        roi = ROI((0, 0, 10, 10), 1.0, 0.0)
+        roi.record_delta((None, None), 0.0)
+        for frame in range(step, 53, step):
+            roi.record_delta((4.0 * step, 0.0), frame / 25.0)
+        velocities[step] = roi.velo_only_history.raw["value"]
+
+    # 4 mm per frame at 25 frames per second, measured over 1 s windows
+    assert np.allclose(velocities[1], [100.0, 100.0])
+    assert np.allclose(velocities[2], velocities[1])
+    window_velocities = roi.delta_history["velocity"]
+    assert np.array_equal(
+        window_velocities[~np.isnan(window_velocities)], velocities[2]
+    )
+
+
+def test_opencv_thread_count_splits_cores_between_workers():
+    """Check that the pool and OpenCV together do not exceed the core count."""
+    assert opencv_thread_count(1, cpu_count=8) == 8
+    assert opencv_thread_count(4, cpu_count=8) == 2
+    assert opencv_thread_count(16, cpu_count=8) == 1
+
+
+def test_opencv_threads_follow_the_workers_of_every_model():
+    """Check that the OpenCV thread count is shared by the pools of all models."""
+    first, second = FrameModel(), FrameModel()
+    before = total_roi_workers()
+    first.set_roi_workers(2)
+    second.set_roi_workers(3)
+    assert total_roi_workers() == before + 5
+    assert cv2.getNumThreads() == opencv_thread_count(before + 5)
+
+    second.close()
+    assert total_roi_workers() == before + 2
+    assert cv2.getNumThreads() == opencv_thread_count(before + 2)
+    first.close()
+
+
+def test_history_limit_bounds_frame_and_roi_rows():
+    """Check that a bounded model keeps at most `history_limit` rows in every history."""
+    first, second = _shifted_frames()
+    model = FrameModel()
+    model.verbose = False
+    model.add_roi((0, 0, 80, 60))
+    for i in range(6):
+        model.process_frame(first if i % 2 else second, i * 0.04)
+    assert len(model.frame_history) == 6
+
+    # Rows beyond the limit go at once, for existing and new ROIs alike
+    model.set_history_limit(3)
+    model.add_roi((80, 0, 80, 60))
+    for i in range(6, 20):
+        model.process_frame(first if i % 2 else second, i * 0.04)
+
+    assert len(model.frame_history) == 3
+    assert list(model.frame_history["frame_number"]) == [18, 19, 20]
+    assert [len(roi.delta_history) for roi in model.roi_list] == [3, 3]
+
+    model.set_history_limit(None)
+    model.process_frame(first, 0.8)
+    assert len(model.frame_history) == 4
+
+
+def test_velocity_statistics_cover_each_window():
+    """Check that every window reports the statistics of its own recent velocities."""
+    model = FrameModel()
+    model.set_stats_windows((3.0, 10.0))
+    model.add_roi((0, 0, 10, 10))
+    roi = model.roi_list[0]
+
+    roi.record_delta((None, None), 0.0)
+    velocities = [1.0, 5.0, 2.0, 8.0, 4.0]
+    for second, velocity in enumerate(velocities, 1):
+        roi.record_delta((0.0, velocity), float(second))  # Degree -90 projects onto +y
+
+    short, long = roi.velocity_stats.windows.values()
+    assert short.count == 3 and long.count == 5
+    assert np.isclose(short.mean, np.mean(velocities[-3:]))
+    assert np.isclose(long.std, np.std(velocities, ddof=1))
+    assert (short.min, short.max) == (2.0, 8.0)
+    assert (long.min, long.max) == (1.0, 8.0)
@@ -0,0 +1,69 @@
+"""Tests for the reference-counted frame buffer pool."""
+
+import numpy as np
+
+from froth_monitor.frame_pool import FramePool
+from froth_monitor.frame_queue import FrameQueue
+
+
+def _read(pool: FramePool, value: int, shape=(4, 4, 3)) -> np.ndarray:
+    """Mimic `VideoCapture.read(image=buffer)` with the pool."""
+    buffer = pool.acquire()
+    if buffer is not None and buffer.shape == shape:
+        buffer[...] = value
+        frame = buffer
+    else:
+        frame = np.full(shape, value, dtype=np.uint8)
+    pool.replace(buffer, frame)
+    return frame
+
+
+def test_buffer_is_reused_only_once_every_holder_released_it():
+    """Check that a held buffer is never handed out and a free one is reused."""
+    pool = FramePool(size=2)
+    first = _read(pool, 1)
+    pool.retain(first)  # e.g. the analysis worker
+    pool.release(first)  # the capture loop is done with it
+
+    second = _read(pool, 2)
+    assert second is not first
+    assert first[0, 0, 0] == 1
+    assert len(pool) == 2
+
+    pool.release(second)
+    assert _read(pool, 3) is second
+
+    pool.release(first)
+    pool.release(first)  # extra releases are ignored
+    assert pool.refcount(first) == 0
+    assert _read(pool, 4) is first
+    assert pool.allocated == 2
+
+
+def test_full_pool_and_size_change_fall_back_to_plain_frames():
+    """Check that frames beyond the pool size or of a new size are handled."""
+    pool = FramePool(size=1)
+    pooled = _read(pool, 1)
+    extra = _read(pool, 2)
+    assert pool.refcount(extra) == 0  # not pooled; retain and release ignore it
+    pool.retain(extra)
+    pool.release(extra)
+
+    pool.release(pooled)
+    resized = _read(pool, 3, shape=(8, 8, 3))
+    assert resized is not pooled
+    assert pool.refcount(pooled) == 0
+    assert pool.refcount(resized) == 1
+
+
+def test_queue_gives_dropped_frames_back_to_the_pool():
+    """Check that frames dropped by a queue policy are released."""
+    pool = FramePool(size=4)
+    queue = FrameQueue(maxsize=1, policy="latest", on_drop=pool.release)
+    frames = [_read(pool, value) for value in range(3)]
+    for frame in frames:
+        queue.put(frame)
+
+    assert [pool.refcount(frame) for frame in frames] == [0, 0, 1]
+    queue.close()
+    assert pool.free_count() == 3
@@ -0,0 +1,77 @@
+"""Tests for the bounded frame queue."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from froth_monitor.frame_queue import FrameQueue
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((4, 4), value, dtype=np.uint8)
+
+
+def _drain(queue: FrameQueue) -> list[int]:
+    values = []
+    while (item := queue.get_nowait()) is not None:
+        values.append(int(item[0][0, 0]))
+    return values
+
+
+@pytest.mark.parametrize(
+    "policy, expected", [("latest", [4]), ("drop-oldest", [2, 3, 4])]
+)
+def test_full_queue_drops_according_to_policy(policy, expected):
+    """Check which frames survive a burst and that the others are counted."""
+    queue = FrameQueue(maxsize=3, policy=policy)
+    for value in range(5):
+        queue.put(_frame(value), float(value))
+
+    assert _drain(queue) == expected
+    assert queue.counts() == {
+        "captured": 5,
+        "delivered": len(expected),
+        "dropped": 5 - len(expected),
+    }
+
+
+def test_block_policy_waits_for_the_consumer():
+    """Check that a blocking queue loses no frame and holds the producer back."""
+    queue = FrameQueue(maxsize=2, policy="block")
+    received = []
+
+    def consume():
+        for _ in range(10):
+            item = queue.get(timeout=5.0)
+            received.append(int(item[0][0, 0]))
+            time.sleep(0.001)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for value in range(10):
+        assert queue.put(_frame(value))
+        assert len(queue) <= 2
+    consumer.join(timeout=5.0)
+
+    assert received == list(range(10))
+    assert queue.dropped == 0
+
+
+def test_close_wakes_waiting_producer_and_consumer():
+    """Check that closing the queue releases blocked threads."""
+    queue = FrameQueue(maxsize=1, policy="block")
+    queue.put(_frame(0))
+    results = []
+
+    producer = threading.Thread(target=lambda: results.append(queue.put(_frame(1))))
+    producer.start()
+    time.sleep(0.05)
+    queue.close()
+    producer.join(timeout=1.0)
+
+    assert results == [False]
+    assert queue.get(timeout=1.0) is None
+    with pytest.raises(ValueError):
+        queue.configure(1, "newest")
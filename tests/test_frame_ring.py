@@ -0,0 +1,47 @@
+"""Tests for the shared-memory frame ring."""
+
+import numpy as np
+import pytest
+
+from froth_monitor.frame_ring import SharedFrameRing
+
+
+def test_reader_maps_the_newest_frame_without_copying():
+    """Check that a second mapping of the block sees the frames written."""
+    ring = SharedFrameRing.create((4, 4, 3), np.uint8, slots=3)
+    reader = SharedFrameRing.attach(ring.name, (4, 4, 3), "|u1", slots=3)
+    try:
+        assert reader.latest() is None
+        for value in range(1, 5):
+            ring.write(np.full((4, 4, 3), value, np.uint8), value / 25.0)
+
+        seq, timestamp, frame = reader.latest()
+        assert (seq, timestamp, frame[0, 0, 0]) == (4, 0.16, 4)
+        assert np.shares_memory(frame, reader.frames)
+        assert reader.is_current(seq)
+        del frame
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_overwritten_and_half_written_frames_are_detected():
+    """Check the sequence numbers of the slots act as a seqlock."""
+    ring = SharedFrameRing.create((2, 2), np.uint8, slots=2)
+    try:
+        ring.write(np.zeros((2, 2), np.uint8), 0.0)
+        seq, _, frame = ring.latest()
+        ring.write(np.ones((2, 2), np.uint8), 0.04)
+        assert ring.is_current(seq)
+        ring.write(np.full((2, 2), 2, np.uint8), 0.08)  # Back to the first slot
+        assert not ring.is_current(seq)
+
+        ring.header[1 + ring.header[0] % ring.slots] = -1  # A write in progress
+        assert ring.latest() is None
+        assert ring.torn == 1
+        del frame
+    finally:
+        ring.close()
+
+    with pytest.raises(ValueError):
+        SharedFrameRing.create((2, 2), np.uint8, slots=1)
@@ -0,0 +1,49 @@
+"""Tests for the columnar history."""
+
+import numpy as np
+import pytest
+
+from froth_monitor.history import ColumnarHistory
+
+COLUMNS = {"timestamp": np.float64, "dx": np.float32}
+
+
+def test_rows_are_kept_in_order_across_chunks():
+    """Check that growing by chunks keeps every row and its column types."""
+    history = ColumnarHistory(COLUMNS, chunk_size=4)
+    for i in range(10):
+        history.append(i * 0.04, i)
+
+    assert len(history) == 10
+    assert history["dx"].dtype == np.float32
+    assert np.array_equal(history["dx"], np.arange(10))
+    assert np.array_equal(history.tail("dx", 6), np.arange(4, 10))
+    assert history.last("timestamp") == pytest.approx(0.36)
+    assert history.row_nbytes == 12
+
+
+def test_capacity_keeps_only_the_most_recent_rows():
+    """Check that a bounded history drops the oldest rows and counts them."""
+    history = ColumnarHistory(COLUMNS, chunk_size=4, capacity=5)
+    for i in range(23):
+        history.append(i, i)
+
+    assert len(history) == 5
+    assert history.total == 23
+    assert history.dropped == 18
+    assert np.array_equal(history["dx"], np.arange(18, 23))
+    assert len(history._chunks["dx"]) <= 3
+
+
+def test_columns_are_read_only_and_clear_empties_the_history():
+    """Check that callers cannot modify the history through a returned column."""
+    history = ColumnarHistory(COLUMNS)
+    history.append(0.0, 1.0)
+
+    with pytest.raises(ValueError):
+        history["dx"][0] = 2.0
+
+    history.clear()
+    assert len(history) == 0
+    assert history.last("dx") is None
+    assert history.tail("dx", 30).shape == (0,)
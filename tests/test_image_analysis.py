@@ -0,0 +1,127 @@
+"""Tests for the image analysis module."""
+
+import numpy as np
+
+from froth_monitor.image_analysis import VideoAnalysis, cluster_rois, fit_frame, to_gray
+
+
+def _textured_frames(shift: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """Return a random BGR texture and a copy shifted right by `shift` pixels."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, size=(120, 160), dtype=np.uint8)
+    base = np.repeat(np.repeat(base, 2, axis=0), 2, axis=1)[:120, :160]
+    first = np.dstack([base] * 3)
+    second = np.roll(first, shift, axis=1)
+    return first, second
+
+
+def test_to_gray_returns_gray_input_unchanged():
+    """Check that gray frames are passed through without a copy."""
+    gray = np.zeros((10, 10), dtype=np.uint8)
+    assert to_gray(gray) is gray
+    assert to_gray(np.zeros((10, 10, 3), dtype=np.uint8)).shape == (10, 10)
+
+
+def test_analyze_gray_matches_bgr():
+    """Check that gray and BGR inputs give the same motion estimate."""
+    first, second = _textured_frames()
+
+    bgr_analysis = VideoAnalysis(0, 0)
+    bgr_analysis.analyze(first)
+    bgr_delta = bgr_analysis.analyze(second)
+
+    gray_analysis = VideoAnalysis(0, 0)
+    gray_analysis.analyze(to_gray(first))
+    gray_delta = gray_analysis.analyze(to_gray(second))
+
+    assert bgr_delta == gray_delta
+    assert bgr_delta[0] > 1.0
+
+
+def test_farneback_reuses_flow_buffer_with_warm_start():
+    """Check that Farneback writes into one buffer and still tracks the shift."""
+    first, second = _textured_frames()
+    third = np.roll(second, 2, axis=1)
+
+    analysis = VideoAnalysis(0, 0)
+    analysis.set_algorithm("Farneback", {"warm_start": True})
+    analysis.analyze(to_gray(first))
+    analysis.analyze(to_gray(second))
+    buffer = analysis.estimator.flow_buffer
+    dx, _ = analysis.analyze(to_gray(third))
+
+    assert analysis.estimator.flow_buffer is buffer
+    assert dx > 1.0
+
+
+def test_dis_reuses_instance_and_tracks_shift():
+    """Check that DIS keeps one instance per analysis and recovers the shift."""
+    first, second = _textured_frames()
+
+    analysis = VideoAnalysis(0, 0)
+    analysis.set_algorithm("DIS")
+    analysis.analyze(to_gray(first)[10:110, 10:150])
+    analysis.analyze(to_gray(first)[10:110, 10:150])
+    dis = analysis.estimator.dis
+    dx, dy = analysis.analyze(to_gray(second)[10:110, 10:150])
+
+    assert dis is not None and analysis.estimator.dis is dis
+    assert abs(dx - 2.0) < 0.5
+    assert abs(dy) < 0.5
+
+
+def test_phase_correlation_returns_shift_and_confidence():
+    """Check that phase correlation recovers the shift with a confidence value."""
+    first, second = _textured_frames(shift=3)
+
+    analysis = VideoAnalysis(0, 0)
+    analysis.set_algorithm("PhaseCorrelation")
+    analysis.analyze(to_gray(first))
+    dx, dy = analysis.analyze(to_gray(second))
+
+    assert abs(dx - 3.0) < 0.2
+    assert abs(dy) < 0.2
+    assert 0.0 < analysis.confidence <= 1.0
+
+
+def test_grid_lucas_kanade_keeps_bounded_points_and_tracks_shift():
+    """Check that grid LK refills lost points up to the target and recovers the shift."""
+    first, second = _textured_frames()
+
+    analysis = VideoAnalysis(0, 0)
+    analysis.set_algorithm("Lucas-Kanade Grid", {"grid_size": 4, "max_points": 32})
+    analysis.analyze(to_gray(first))
+    dx, dy = analysis.analyze(to_gray(second))
+
+    estimator = analysis.estimator
+    assert 0 < len(estimator.prev_pts) <= 32
+    assert abs(dx - 2.0) < 0.5
+    assert abs(dy) < 0.5
+
+    # Points that drifted away are dropped and their cells reseeded
+    estimator.prev_pts = estimator.prev_pts[:3]
+    analysis.analyze(to_gray(first))
+    assert len(estimator.prev_pts) > 3
+
+
+def test_cluster_rois_merges_nearby_boxes():
+    """Check that only ROIs within the gap share a cluster."""
+    rects = [(0, 0, 10, 10), (12, 0, 10, 10), (100, 100, 5, 5)]
+
+    clusters = cluster_rois(rects, max_gap=4)
+    assert clusters == [((0, 0, 22, 10), [0, 1]), ((100, 100, 5, 5), [2])]
+
+    union = cluster_rois(rects, max_gap=None)
+    assert union == [((0, 0, 105, 105), [0, 1, 2])]
+
+
+def test_fit_frame_resizes_once_keeping_the_aspect_ratio():
+    """Check the display size of wide, tall and already fitting frames."""
+    wide = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    assert fit_frame(wide, 640, 480).shape == (360, 640, 3)
+
+    tall = np.zeros((400, 100), dtype=np.uint8)
+    assert fit_frame(tall, 640, 480).shape == (480, 120)
+
+    fitting = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert fit_frame(fitting, 640, 480) is fitting
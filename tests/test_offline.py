@@ -0,0 +1,133 @@
+"""Tests for the headless offline analysis."""
+
+import csv
+import json
+import os
+
+import pytest
+
+from froth_monitor.offline import (
+    DEFAULT_CONFIG,
+    analyze_file,
+    analyze_video,
+    analyze_video_segmented,
+    build_parser,
+    create_frame_model,
+    load_roi_config,
+    plan_segments,
+)
+from froth_monitor.export import format_timestamp
+
+VIDEO = os.path.join(os.path.dirname(__file__), os.pardir, "data", "test.avi")
+
+
+def test_load_roi_config_accepts_a_bare_list(tmp_path):
+    """Check that a plain list of rectangles gets the default calibration."""
+    path = tmp_path / "rois.json"
+    path.write_text(json.dumps([[0, 0, 10, 20]]))
+
+    config = load_roi_config(str(path))
+    assert config["rois"] == [(0, 0, 10, 20)]
+    assert config["algorithm"] == "Farneback"
+
+
+def test_load_roi_config_rejects_empty_rectangles(tmp_path):
+    """Check that a rectangle without area is reported."""
+    path = tmp_path / "rois.json"
+    path.write_text(json.dumps({"rois": [[0, 0, 0, 20]]}))
+
+    with pytest.raises(ValueError):
+        load_roi_config(str(path))
+
+
+def test_analysis_flags_reach_the_frame_model():
+    """Check that --batched-flow, a negative --cluster-gap and --roi-workers are applied."""
+    args = build_parser().parse_args(
+        [
+            "video.mp4",
+            "--rois",
+            "rois.json",
+            "--batched-flow",
+            "--cluster-gap",
+            "-1",
+            "--roi-workers",
+            "3",
+        ]
+    )
+    assert args.batched_flow is True
+    assert args.cluster_gap == -1
+    assert args.roi_workers == 3
+    assert (
+        build_parser().parse_args(["video.mp4", "--rois", "rois.json"]).batched_flow
+        is None
+    )
+
+    config = {
+        **DEFAULT_CONFIG,
+        "rois": [(0, 0, 10, 20)],
+        "batched_flow": True,
+        "cluster_gap": None,
+        "roi_workers": 3,
+    }
+    frame_model = create_frame_model(config)
+    assert frame_model.batched_flow
+    assert frame_model.cluster_gap is None
+    assert frame_model.roi_workers == 3
+    frame_model.close()
+
+
+def test_format_timestamp_shows_elapsed_media_time():
+    """Check that timestamps without an origin are formatted as elapsed time."""
+    assert format_timestamp(0.0) == "00:00:00.000"
+    assert format_timestamp(3661.04) == "01:01:01.040"
+
+
+def test_plan_segments_covers_every_frame_once():
+    """Check that segments are contiguous, ordered and nearly equal."""
+    plan = plan_segments(10, 3)
+    assert plan == [(0, 3), (3, 7), (7, 10)]
+    assert plan_segments(3, 8) == [(0, 3)]
+
+
+@pytest.mark.skipif(not os.path.exists(VIDEO), reason="sample video not available")
+def test_segmented_analysis_is_identical_to_serial():
+    """Check that stitching the segments reproduces the serial export exactly."""
+    config = {
+        "rois": [(40, 200, 120, 100), (260, 200, 120, 100)],
+        "px2mm": 10.0,
+        "degree": -90.0,
+        "algorithm": "Farneback",
+        "params": {},
+        "analysis_scale": 0.5,
+    }
+
+    serial = analyze_video(VIDEO, config, max_frames=60)
+    segmented = analyze_video_segmented(VIDEO, config, segments=3, max_frames=60)
+
+    assert segmented["Frames"] == 60
+    assert segmented == serial
+
+
+@pytest.mark.skipif(not os.path.exists(VIDEO), reason="sample video not available")
+def test_analyze_file_writes_export_columns(tmp_path):
+    """Check that the CSV output has one row per ROI and analysed frame pair."""
+    config = {
+        "rois": [(40, 200, 120, 100), (260, 200, 120, 100)],
+        "px2mm": 10.0,
+        "degree": -90.0,
+        "algorithm": "Farneback",
+        "params": {},
+        "analysis_scale": 0.5,
+    }
+
+    output_path, frames, _ = analyze_file(
+        VIDEO, config, str(tmp_path), "csv", max_frames=30
+    )
+
+    assert frames == 30
+    with open(output_path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 2 * 29
+    assert rows[0]["Timestamp"] == "00:00:00.040"
+    assert rows[-1]["Timestamp"] == "00:00:01.160"
+    assert "calibrated_delta(px/frame)" in rows[0]
@@ -0,0 +1,89 @@
+"""Tests for the per-source camera pipeline."""
+
+import math
+
+import numpy as np
+import pytest
+
+from froth_monitor.pipeline import CameraPipeline, DisplayScheduler, FrameRateMeter
+
+
+class RecordingView:
+    def __init__(self):
+        self.frames = []
+
+    def show_frame(self, pipeline, frame, timestamp):
+        self.frames.append((pipeline.name, timestamp))
+
+
+def test_frame_rate_meter_measures_over_full_intervals():
+    """Check the rate of a counter and that a reset counter starts over."""
+    meter = FrameRateMeter(interval=1.0)
+    assert meter.update(0, now=10.0) == 0.0
+    assert meter.update(10, now=10.5) == 0.0  # Interval not complete yet
+    assert meter.update(25, now=11.0) == 25.0
+    assert meter.update(0, now=11.5) == 25.0  # Counter reset; keep the last rate
+    assert meter.update(30, now=12.5) == 30.0
+
+
+def test_display_scheduler_limits_the_shown_frames_to_its_rate():
+    """Check that 120 fps input is shown at 25 fps, and all of it without a limit."""
+    scheduler = DisplayScheduler(max_fps=25.0)
+    shown = [i for i in range(240) if scheduler.due(now=i / 120.0)]
+    assert len(shown) == 50  # 2 s of frames
+    assert scheduler.skipped == 190
+
+    # After a gap the rate starts over instead of catching up
+    assert scheduler.due(now=10.0)
+    assert not scheduler.due(now=10.01)
+
+    scheduler.set_max_fps(math.inf)
+    assert all(scheduler.due(now=i / 120.0) for i in range(10))
+    with pytest.raises(ValueError):
+        scheduler.set_max_fps(0)
+
+
+def test_pipelines_analyse_their_frames_and_only_the_viewed_one_is_shown():
+    """Check that each pipeline feeds its own worker and only its view."""
+    first, second = CameraPipeline("Camera 0"), CameraPipeline("Camera 1")
+    view = RecordingView()
+    first.view = view
+    try:
+        for pipeline in (first, second):
+            pipeline.playing = True
+            pipeline.handle_frame(np.zeros((4, 4, 3), np.uint8), 0.04)
+
+        assert view.frames == [("Camera 0", 0.04)]
+        assert first.analysis_worker.frames_submitted == 1
+        assert second.analysis_worker.frames_submitted == 1
+        assert first.frame_model is not second.frame_model
+        assert first.frame_counts()["Frames submitted for analysis"] == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_delivered_frames_return_to_the_pool_unless_retained():
+    """Check that a frame is released at once, and kept by a slot that retains it."""
+    pipeline = CameraPipeline("Camera 0")
+    pool = pipeline.camera_thread.frame_pool
+    kept = []
+
+    def keep(frame, timestamp):
+        pool.retain(frame)
+        kept.append(frame)
+
+    try:
+        first, second = np.zeros((4, 4, 3), np.uint8), np.ones((4, 4, 3), np.uint8)
+        for frame in (first, second):
+            pool.replace(None, frame)  # Held once, as a captured frame is
+
+        pipeline.handle_frame(first, 0.04)
+        assert pool.refcount(first) == 0
+
+        pipeline.frame_delivered.connect(keep)
+        pipeline.handle_frame(second, 0.08)
+        assert kept == [second]
+        assert pool.refcount(second) == 1
+    finally:
+        pipeline.close()
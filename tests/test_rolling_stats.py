@@ -0,0 +1,44 @@
+"""Tests for the rolling statistics."""
+
+import math
+
+import numpy as np
+
+from froth_monitor.rolling_stats import RollingStats, RollingWindow, format_duration
+
+
+def test_window_matches_brute_force_over_a_long_series():
+    """Check the running statistics against a recomputation at every sample."""
+    rng = np.random.default_rng(3)
+    timestamps = np.cumsum(rng.uniform(0.2, 1.8, size=2000))
+    values = rng.normal(50.0, 10.0, size=2000)
+
+    window = RollingWindow(30.0)
+    for i, (timestamp, value) in enumerate(zip(timestamps, values)):
+        window.add(float(timestamp), float(value))
+        kept = values[: i + 1][timestamps[: i + 1] > timestamp - 30.0]
+
+        assert window.count == len(kept)
+        assert math.isclose(window.mean, kept.mean(), rel_tol=1e-9)
+        assert window.min == kept.min() and window.max == kept.max()
+        if len(kept) > 1:
+            assert math.isclose(window.std, kept.std(ddof=1), rel_tol=1e-6)
+
+
+def test_window_restarts_when_the_clock_goes_back():
+    """Check that a replayed video does not mix its samples with the old ones."""
+    window = RollingWindow(10.0)
+    window.add(100.0, 1.0)
+    window.add(101.0, 3.0)
+    window.add(0.0, 7.0)
+
+    assert window.count == 1
+    assert window.mean == 7.0
+    assert math.isnan(window.std)
+
+
+def test_stats_keep_windows_shortest_first_and_format_them():
+    """Check that the window lengths are ordered and formatted for display."""
+    stats = RollingStats((3600.0, 10.0, 300.0))
+    assert list(stats.windows) == [10.0, 300.0, 3600.0]
+    assert [format_duration(d) for d in stats.windows] == ["10 s", "5 min", "1 h"]
@@ -0,0 +1,68 @@
+"""Tests for the multi-resolution rollup store."""
+
+import numpy as np
+
+from froth_monitor.rollup import RollupStore
+
+
+def _fill(store: RollupStore, seconds: int, rate: int = 2) -> None:
+    """Add `rate` samples per second whose value is the minute they fall in."""
+    for i in range(seconds * rate):
+        timestamp = i / rate
+        store.add(timestamp, float(timestamp // 60))
+
+
+def test_raw_samples_are_kept_for_the_raw_span_only():
+    """Check that old raw samples are dropped while the rollups keep summarising."""
+    store = RollupStore(raw_span=60.0, tiers=((1.0, 100), (60.0, 100)))
+    _fill(store, 600)
+
+    timestamps = store.raw["timestamp"]
+    assert timestamps[0] > store.latest - 60.0
+    assert len(store.tiers[0].history) == 100
+    assert store.tiers[0].history.dropped == 599 - 100
+
+
+def test_buckets_summarise_their_samples():
+    """Check the mean, min, max and count of closed buckets."""
+    store = RollupStore(tiers=((60.0, 10),))
+    for i in range(240):
+        store.add(float(i), float(i % 60))
+
+    buckets = store.tiers[0].history
+    assert np.array_equal(buckets["start"], [0.0, 60.0, 120.0])
+    assert np.allclose(buckets["mean"], 29.5)
+    assert np.array_equal(buckets["min"], [0, 0, 0]) and np.array_equal(
+        buckets["max"], [59, 59, 59]
+    )
+    assert np.array_equal(buckets["count"], [60, 60, 60])
+
+
+def test_query_picks_the_tier_that_fits_the_span():
+    """Check that short spans read raw samples and long spans read rollups."""
+    store = RollupStore(raw_span=600.0, tiers=((1.0, 7200), (60.0, 1440)))
+    _fill(store, 7200)
+
+    recent = store.query(span=60.0)
+    assert recent["resolution"] == 0.0
+    assert len(recent["mean"]) == 120
+
+    seconds = store.query(span=900.0)
+    assert seconds["resolution"] == 1.0
+    assert len(seconds["mean"]) == 901  # Including the partly covered first bucket
+
+    minutes = store.query(span=7200.0)
+    assert minutes["resolution"] == 60.0
+    assert len(minutes["mean"]) == 120
+    assert np.array_equal(minutes["mean"], np.arange(120))
+    assert minutes["timestamp"][0] == 30.0
+
+
+def test_store_restarts_when_the_clock_goes_back():
+    """Check that a replayed video does not mix its samples with the old ones."""
+    store = RollupStore()
+    _fill(store, 120)
+    store.add(0.0, 5.0)
+
+    assert len(store) == 1
+    assert store.query(span=30.0)["mean"].tolist() == [5.0]